@@ -0,0 +1,150 @@
+"""
+Бенчмарк обмена сообщениями Celery через Redis: команды Redis на задачу.
+
+Для каждого профиля ставит N пустых задач в отдельную очередь, выполняет
+их встроенным воркером в этом же процессе и печатает пропускную
+способность, размер тела сообщения и число команд Redis на задачу по
+INFO commandstats.
+
+Профили:
+- baseline: прежние настройки, то есть json, хранение результатов
+  и подтверждение до выполнения;
+- tuned: MESSAGING_PROFILE из bot.tasks.celery_app.
+
+    REDIS_URL=redis://localhost:6379/15 python -m benchmarks.celery_broker --tasks 5000
+
+Счётчики commandstats общие для всего сервера, поэтому запускать следует
+на Redis без другой нагрузки. В счёт входит и опрос очереди воркером,
+одинаковый для обоих профилей.
+"""
+
+import argparse
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+import redis
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from kombu.serialization import dumps
+
+from bot.core.config import settings
+from bot.tasks.celery_app import MESSAGING_PROFILE
+
+BASELINE_PROFILE = {
+    "task_serializer": "json",
+    "accept_content": ["json"],
+    "result_serializer": "json",
+    "task_ignore_result": False,
+    "result_expires": 3600,
+    "task_acks_late": False,
+    "worker_prefetch_multiplier": 4,
+}
+PROFILES = {"baseline": BASELINE_PROFILE, "tuned": MESSAGING_PROFILE}
+
+# Аргументы как у задачи уведомления бармену
+PAYLOAD = (123456,)
+# Тело сообщения протокола Celery 2: (args, kwargs, embed)
+MESSAGE_BODY = (
+    list(PAYLOAD),
+    {},
+    {"callbacks": None, "errbacks": None, "chain": None, "chord": None},
+)
+
+
+def command_calls(client: redis.Redis) -> Counter:
+    stats = client.info("commandstats")
+    return Counter(
+        {
+            name.removeprefix("cmdstat_"): value["calls"]
+            for name, value in stats.items()
+            if name != "cmdstat_info"
+        }
+    )
+
+
+def run_profile(
+    name: str, profile: Dict[str, Any], tasks: int, settle: float
+) -> Dict[str, Any]:
+    app = Celery(
+        f"bench-{name}",
+        broker=settings.redis_url,
+        backend=settings.redis_url,
+        set_as_current=False,
+    )
+    app.conf.update(profile, task_default_queue=f"bench.{name}")
+    done = threading.Semaphore(0)
+
+    @app.task(name="bench.noop")
+    def noop(event_id: int) -> None:
+        done.release()
+
+    client = redis.Redis.from_url(settings.redis_url)
+    task_ids: List[str] = []
+    try:
+        with start_worker(app, pool="solo", perform_ping_check=False):
+            before = command_calls(client)
+            started = time.perf_counter()
+            for _ in range(tasks):
+                task_ids.append(noop.delay(*PAYLOAD).id)
+            for _ in range(tasks):
+                if not done.acquire(timeout=60):
+                    raise RuntimeError(f"{name}: worker stalled")
+            elapsed = time.perf_counter() - started
+            # Даём воркеру подтвердить сообщения и записать результаты
+            time.sleep(settle)
+            after = command_calls(client)
+    finally:
+        client.delete(f"bench.{name}")
+        for start in range(0, len(task_ids), 1000):
+            client.delete(
+                *(f"celery-task-meta-{i}" for i in task_ids[start : start + 1000])
+            )
+        client.close()
+
+    commands = after - before
+    _, _, body = dumps(MESSAGE_BODY, serializer=profile["task_serializer"])
+    return {
+        "tasks_per_second": tasks / elapsed,
+        "body_bytes": len(body),
+        "ops_per_task": sum(commands.values()) / tasks,
+        "commands": commands,
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    results = {
+        name: run_profile(name, PROFILES[name], args.tasks, args.settle)
+        for name in args.profiles
+    }
+    print(f"\n{'profile':<10} {'tasks/s':>10} {'body, B':>8} {'redis ops/task':>15}")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['tasks_per_second']:>10.0f} "
+            f"{result['body_bytes']:>8} {result['ops_per_task']:>15.2f}"
+        )
+    for name, result in results.items():
+        print(f"\n{name}: commands per task")
+        for command, calls in result["commands"].most_common(args.top):
+            print(f"  {command:<20} {calls / args.tasks:>8.2f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES)
+    )
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=0.5,
+        help="seconds to wait for acks and results after the last task",
+    )
+    parser.add_argument("--top", type=int, default=10)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,52 @@
+from typing import Any, List, Union
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+BENCH_BOT_TOKEN = "123456:benchmark-token"
+# Диапазоны идентификаторов, в которых бенчмарки создают и удаляют свои данные
+BASE_TELEGRAM_ID = 9_000_000_000
+BASE_CHAT_ID = -9_000_000_000_000
+BENCH_CREATED_BY = 9_999_999_999
+
+
+class QueryCounter:
+    """Считает SQL-запросы, выполненные через движок."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.sync_engine
+        self.count = 0
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+async def cleanup_bench_data() -> None:
+    from sqlalchemy import delete
+    from bot.core.database import async_session_maker
+    from bot.core.models import Event, Group, User
+
+    async with async_session_maker() as session:
+        await session.execute(delete(Event).where(Event.created_by == BENCH_CREATED_BY))
+        await session.execute(delete(User).where(User.telegram_id >= BASE_TELEGRAM_ID))
+        await session.execute(delete(Group).where(Group.chat_id <= BASE_CHAT_ID))
+        await session.commit()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def format_ms(seconds: Union[int, float]) -> str:
+    return f"{seconds * 1000:.2f} ms"
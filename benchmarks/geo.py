@@ -0,0 +1,117 @@
+"""
+Микробенчмарк поиска ближайшего события по геопозиции.
+
+Сравнивает поштучный haversine_distance в цикле Python, векторный
+nearby_events (NumPy, грубый отбор по ограничивающему прямоугольнику)
+и сеточный VenueIndex. База данных не нужна.
+
+    python -m benchmarks.geo --sizes 1 10 100 1000 10000
+"""
+
+import argparse
+import random
+import time
+import timeit
+from datetime import date
+from types import SimpleNamespace
+from typing import List
+
+from bot.utils.geo import (
+    LOCATION_RADIUS_M,
+    Venue,
+    VenueIndex,
+    haversine_distance,
+    nearby_events,
+)
+
+CENTER_LAT, CENTER_LON = 55.7558, 37.6173
+
+
+def make_events(n: int, spread: float) -> List[SimpleNamespace]:
+    rng = random.Random(n)
+    return [
+        SimpleNamespace(
+            id=i,
+            latitude=CENTER_LAT + rng.uniform(-spread, spread),
+            longitude=CENTER_LON + rng.uniform(-spread, spread),
+        )
+        for i in range(n)
+    ]
+
+
+def scalar_nearby(latitude: float, longitude: float, events: List[SimpleNamespace]):
+    found = []
+    for event in events:
+        distance = haversine_distance(
+            latitude, longitude, event.latitude, event.longitude
+        )
+        if distance <= LOCATION_RADIUS_M:
+            found.append((event, distance))
+    found.sort(key=lambda item: item[1])
+    return found
+
+
+def best_time(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main(args: argparse.Namespace) -> None:
+    print(
+        f"{'events':>8} {'scalar':>12} {'vectorized':>12} {'index':>12} "
+        f"{'index build':>12}"
+    )
+    for n in args.sizes:
+        events = make_events(n, args.spread)
+        scalar = scalar_nearby(CENTER_LAT, CENTER_LON, events)
+        vectorized = nearby_events(CENTER_LAT, CENTER_LON, events)
+        assert [e.id for e, _ in scalar] == [e.id for e, _ in vectorized]
+
+        venues = [
+            Venue(e.id, e.latitude, e.longitude, date.today(), None) for e in events
+        ]
+        start = time.perf_counter()
+        index = VenueIndex(date.today(), venues)
+        build_time = time.perf_counter() - start
+        nearest = index.nearest(CENTER_LAT, CENTER_LON)
+        assert (nearest[0].event_id if nearest else None) == (
+            scalar[0][0].id if scalar else None
+        )
+
+        number = max(1, args.repeat // max(n, 1))
+        scalar_time = best_time(
+            lambda: scalar_nearby(CENTER_LAT, CENTER_LON, events), number
+        )
+        vectorized_time = best_time(
+            lambda: nearby_events(CENTER_LAT, CENTER_LON, events), number
+        )
+        index_time = best_time(
+            lambda: index.nearest(CENTER_LAT, CENTER_LON), args.index_repeat
+        )
+        print(
+            f"{n:>8} {scalar_time * 1e6:>9.1f} us {vectorized_time * 1e6:>9.1f} us "
+            f"{index_time * 1e6:>9.1f} us {build_time * 1e3:>9.2f} ms"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000]
+    )
+    parser.add_argument(
+        "--spread",
+        type=float,
+        default=0.5,
+        help="half-width of the venue area around the center, degrees",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=100000, help="total events checked per timing"
+    )
+    parser.add_argument(
+        "--index-repeat", type=int, default=10000, help="index lookups per timing"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,130 @@
+"""
+Загрузка строк ORM-объектами и лёгкими моделями для чтения.
+
+Заполняет SQLite в памяти выборами пива и загружает --rows строк двумя
+способами: прежним select(BeerChoice) с полными ORM-объектами и текущим
+BeerRepository.get_choices_for_event, который выбирает две колонки в
+ChoiceRow. Печатает время загрузки, пик выделенной памяти (tracemalloc)
+и размер identity map. Postgres не нужен:
+
+    python -m benchmarks.read_models --rows 100000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import date, datetime, time as dtime
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import and_, create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from tests.support import SyncSessionAdapter
+from bot.core.database import Base
+from bot.core.models import BeerChoice, Event, User
+from bot.repositories.beer_repo import BeerRepository
+
+EVENT_ID = 1
+WINDOW_START = datetime(2025, 1, 1, 18, 30)
+WINDOW_END = datetime(2025, 1, 1, 19, 0)
+
+
+def seed(session: Session, rows: int) -> None:
+    session.execute(
+        insert(User),
+        [
+            {
+                "id": i,
+                "telegram_id": 1000 + i,
+                "name": f"user{i}",
+                "birth_date": date(1990, 1, 1),
+            }
+            for i in range(1, rows + 1)
+        ],
+    )
+    session.execute(
+        insert(Event).values(
+            id=EVENT_ID,
+            name="event",
+            event_date=WINDOW_START.date(),
+            event_time=dtime(19, 0),
+            created_by=1,
+        )
+    )
+    step = (WINDOW_END - WINDOW_START) / rows
+    session.execute(
+        insert(BeerChoice),
+        [
+            {
+                "user_id": i,
+                "event_id": EVENT_ID,
+                "beer_choice": "Лагер" if i % 2 else "Тёмное",
+                "selected_at": WINDOW_START + step * i,
+            }
+            for i in range(1, rows + 1)
+        ],
+    )
+    session.commit()
+
+
+async def legacy_choices(session: SyncSessionAdapter):
+    # Прежняя реализация: полные ORM-объекты в identity map
+    stmt = select(BeerChoice).where(
+        and_(
+            BeerChoice.event_id == EVENT_ID,
+            BeerChoice.selected_at >= WINDOW_START,
+            BeerChoice.selected_at <= WINDOW_END,
+        )
+    )
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def current_choices(session: SyncSessionAdapter):
+    return await BeerRepository.get_choices_for_event(
+        session, Event(id=EVENT_ID), WINDOW_START, WINDOW_END
+    )
+
+
+async def measure(engine, load: Callable[[SyncSessionAdapter], Awaitable[Any]]) -> None:
+    with Session(engine) as session:
+        start = time.perf_counter()
+        await load(SyncSessionAdapter(session))
+        elapsed = time.perf_counter() - start
+    # Память меряется отдельным прогоном: tracemalloc замедляет загрузку
+    with Session(engine) as session:
+        tracemalloc.start()
+        rows = await load(SyncSessionAdapter(session))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{load.__name__:<16} {len(rows):>8} {elapsed * 1000:>10.0f} "
+            f"{peak / 2**20:>10.1f} {len(session.identity_map):>13}"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.rows)
+    print(
+        f"{'loader':<16} {'rows':>8} {'time, ms':>10} {'peak, MiB':>10} "
+        f"{'identity map':>13}"
+    )
+    for load in (legacy_choices, current_choices):
+        # Первый прогон прогревает кэш компиляции
+        with Session(engine) as session:
+            await load(SyncSessionAdapter(session))
+        await measure(engine, load)
+    engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
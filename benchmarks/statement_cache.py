@@ -0,0 +1,178 @@
+"""
+Накладные расходы Python на частые запросы и попадания в кэш компиляции.
+
+Выполняет горячие методы репозиториев на SQLite в памяти через
+синхронную сессию и сравнивает их с прежним вариантом, который строил
+select(...) на каждый вызов. Печатает время на вызов и число ключей
+кэша компиляции, которые SQLAlchemy вычислила на вызов. Попадание в кэш
+есть у обоих вариантов, но заново построенное выражение каждый раз
+обходится целиком ради ключа, а у заранее построенного ключ запомнен.
+Postgres не нужен, поэтому проверку можно запускать в CI:
+
+    python -m benchmarks.statement_cache --calls 5000
+
+Завершается с кодом 1, если текущие методы вычисляют больше
+--max-cache-keys ключей на вызов.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from datetime import date, time as dtime
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.cache_key import HasCacheKey
+
+from tests.support import SyncSessionAdapter
+from bot.core.database import Base
+from bot.core.models import BeerChoice, Event, Group, User
+from bot.repositories.beer_repo import BeerRepository
+from bot.repositories.event_repo import EventRepository
+from bot.repositories.group_user_repo import GroupUserRepository
+from bot.repositories.user_repo import UserRepository
+
+ROWS = 100
+
+cache_keys: Counter = Counter()
+_generate_cache_key = HasCacheKey._generate_cache_key
+
+
+def count_cache_keys(element: HasCacheKey):
+    # Запомненный ключ выражения сюда не доходит: считаются только обходы
+    cache_keys["generated"] += 1
+    return _generate_cache_key(element)
+
+
+def seed(session: Session) -> None:
+    for i in range(1, ROWS + 1):
+        session.add(
+            User(
+                id=i, telegram_id=1000 + i, name=f"user{i}", birth_date=date(1990, 1, 1)
+            )
+        )
+        session.add(Group(id=i, chat_id=-1000 - i, name=f"group{i}"))
+        session.add(
+            Event(
+                id=i,
+                name=f"event{i}",
+                event_date=date(2025, 1, 1),
+                event_time=dtime(19, 0),
+                created_by=1000 + i,
+            )
+        )
+    session.flush()
+    session.add(BeerChoice(user_id=1, event_id=1, beer_choice="Лагер"))
+    session.commit()
+
+
+# Прежние реализации: выражение строится заново на каждый вызов
+async def legacy_user_by_telegram_id(session, i):
+    stmt = select(User).where(User.telegram_id == 1000 + i)
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def legacy_event_by_id(session, i):
+    stmt = select(Event).where(Event.id == i)
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def legacy_group_by_chat_id(session, i):
+    stmt = select(Group).where(Group.chat_id == -1000 - i)
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def legacy_has_chosen(session, i):
+    stmt = (
+        select(BeerChoice)
+        .where(and_(BeerChoice.user_id == i, BeerChoice.event_id == 1))
+        .limit(1)
+    )
+    return (await session.execute(stmt)).scalar_one_or_none() is not None
+
+
+async def current_has_chosen(session, i):
+    return await BeerRepository.has_user_chosen_for_event(session, i, Event(id=1))
+
+
+Query = Callable[[Any, int], Awaitable[Any]]
+
+SCENARIOS: List[Tuple[str, Query, Query]] = [
+    (
+        "user by telegram_id",
+        legacy_user_by_telegram_id,
+        lambda s, i: UserRepository.get_user_by_telegram_id(s, 1000 + i),
+    ),
+    (
+        "event by id",
+        legacy_event_by_id,
+        lambda s, i: EventRepository.get_event_by_id(s, i),
+    ),
+    (
+        "group by chat_id",
+        legacy_group_by_chat_id,
+        lambda s, i: GroupUserRepository.get_group_by_chat_id(s, -1000 - i),
+    ),
+    ("has chosen", legacy_has_chosen, current_has_chosen),
+]
+
+
+async def measure(session, query: Query, calls: int) -> Tuple[float, float]:
+    """Микросекунды и вычисленные ключи кэша компиляции на вызов."""
+    await query(session, 1)
+    session.session.expunge_all()
+    cache_keys.clear()
+    start = time.perf_counter()
+    for n in range(calls):
+        await query(session, n % ROWS + 1)
+        # Без identity map объекты каждый раз загружаются заново, как в
+        # отдельных сессиях обработчиков
+        session.session.expunge_all()
+    elapsed = time.perf_counter() - start
+    return elapsed / calls * 1e6, cache_keys["generated"] / calls
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    HasCacheKey._generate_cache_key = count_cache_keys
+    failed = False
+    with Session(engine) as sync_session:
+        seed(sync_session)
+        session = SyncSessionAdapter(sync_session)
+        print(
+            f"{'query':<20} {'legacy, us':>11} {'current, us':>12} "
+            f"{'speedup':>8} {'keys/call':>10} {'legacy keys':>12}"
+        )
+        for name, legacy, current in SCENARIOS:
+            legacy_us, legacy_keys = await measure(session, legacy, args.calls)
+            current_us, current_keys = await measure(session, current, args.calls)
+            ok = current_keys <= args.max_cache_keys
+            failed |= not ok
+            print(
+                f"{name:<20} {legacy_us:>11.1f} {current_us:>12.1f} "
+                f"{legacy_us / current_us:>7.2f}x {current_keys:>10.2f} "
+                f"{legacy_keys:>12.2f}{'' if ok else '  FAIL'}"
+            )
+    HasCacheKey._generate_cache_key = _generate_cache_key
+    engine.dispose()
+    return 1 if failed else 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument(
+        "--max-cache-keys",
+        type=float,
+        default=0.0,
+        help="cache keys generated per call allowed for current methods",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,145 @@
+"""
+Проверка числа обращений к базе у операций записи репозиториев.
+
+Выполняет каждую запись на SQLite в памяти и считает выполненные
+выражения и фиксации транзакций. После перехода на INSERT/UPDATE ...
+RETURNING запись — это одно выражение и одна фиксация, без refresh и
+повторного SELECT. Событие с уведомлением бармену и удаление выборов
+пользователя вместе со свёрнутыми месяцами — два выражения в одной
+транзакции. Postgres не нужен:
+
+    python -m benchmarks.write_round_trips
+
+Завершается с кодом 1, если хоть одна запись отличается от ожидаемого.
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from datetime import date, time, timedelta
+
+import pendulum
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from tests.support import SyncSessionAdapter
+from bot.core.database import Base
+from bot.core.schemas import BeerChoiceCreate, EventCreate, UserCreate, UserUpdate
+from bot.repositories.beer_repo import BeerRepository
+from bot.repositories.event_participant_repo import EventParticipantRepository
+from bot.repositories.event_repo import EventRepository
+from bot.repositories.group_user_repo import GroupUserRepository
+from bot.repositories.scheduled_job_repo import ScheduledJobRepository
+from bot.repositories.user_repo import UserRepository
+
+TELEGRAM_ID = 1001
+
+round_trips: Counter = Counter()
+
+
+def new_event() -> EventCreate:
+    return EventCreate(
+        name="event",
+        event_date=date.today() + timedelta(days=1),
+        event_time=time(19, 0),
+        created_by=TELEGRAM_ID,
+    )
+
+
+def count_statement(*args) -> None:
+    round_trips["statements"] += 1
+
+
+def count_commit(conn) -> None:
+    round_trips["commits"] += 1
+
+
+async def main() -> int:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    event.listen(engine, "before_cursor_execute", count_statement)
+    event.listen(engine, "commit", count_commit)
+    event_start = pendulum.tomorrow("UTC").add(hours=19)
+    writes = [
+        (
+            "create_user",
+            lambda s: UserRepository.create_user(
+                s,
+                UserCreate(
+                    telegram_id=TELEGRAM_ID, name="user", birth_date=date(1990, 1, 1)
+                ),
+            ),
+            1,
+        ),
+        (
+            "update_user",
+            lambda s: UserRepository.update_user(
+                s, TELEGRAM_ID, UserUpdate(name="renamed")
+            ),
+            1,
+        ),
+        (
+            "create_event",
+            lambda s: EventRepository.create_event(s, new_event()),
+            1,
+        ),
+        (
+            "create_event+job",
+            lambda s: EventRepository.create_event(
+                s,
+                new_event(),
+                notify_task="bot.tasks.bartender_notification.process_event_notification",
+                notify_at=event_start,
+            ),
+            2,
+        ),
+        (
+            "create_choice",
+            lambda s: BeerRepository.create_choice(
+                s, BeerChoiceCreate(user_id=1, event_id=1, beer_choice="Лагер")
+            ),
+            1,
+        ),
+        (
+            "create_participant",
+            lambda s: EventParticipantRepository.create_participant_record(s, 1, 1),
+            1,
+        ),
+        (
+            "add_group",
+            lambda s: GroupUserRepository.add_group(s, -1001, "group"),
+            1,
+        ),
+        (
+            "schedule",
+            lambda s: ScheduledJobRepository.schedule(s, "noop", event_start),
+            1,
+        ),
+        (
+            "delete_user_choices",
+            lambda s: BeerRepository.delete_user_choices(s, 1),
+            2,
+        ),
+        ("delete_event", lambda s: EventRepository.delete_event(s, 2), 1),
+        ("delete_user", lambda s: UserRepository.delete_user(s, TELEGRAM_ID), 1),
+    ]
+    failed = False
+    print(f"{'write':<20} {'statements':>10} {'commits':>8} {'expected':>9}")
+    for name, write, statements in writes:
+        # Каждая запись в своей сессии, как в обработчиках
+        with Session(engine, expire_on_commit=False) as session:
+            round_trips.clear()
+            await write(SyncSessionAdapter(session))
+            ok = round_trips["statements"] == statements and round_trips["commits"] == 1
+            failed |= not ok
+            print(
+                f"{name:<20} {round_trips['statements']:>10} "
+                f"{round_trips['commits']:>8} {f'{statements} + 1':>9}"
+                f"{'' if ok else '  FAIL'}"
+            )
+    engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,103 @@
+from typing import Literal, Optional
+
+import pendulum
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Настройки бота и воркеров Celery.
+
+    Читаются один раз из переменных окружения и файла .env; имена
+    переменных совпадают с именами полей в верхнем регистре.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    # Telegram
+    bot_token: Optional[str] = None
+    for_logs: Optional[str] = None
+    admin_telegram_id: int = 0
+
+    # Хранилища
+    database_url: Optional[str] = None
+    # Реплика для чтения статистики и списков; без неё всё читается с основной базы
+    database_replica_url: Optional[str] = None
+    # Сколько секунд после записи пользователя его чтения идут в основную базу
+    replica_max_lag: float = Field(5, ge=0)
+    redis_url: str = "redis://redis:6379/0"
+
+    # Роль процесса выбирает профиль соединений с базой: у бота свой пул,
+    # воркеры Celery по умолчанию открывают соединение на каждую сессию
+    process_role: Literal["bot", "worker", "beat", "flower"] = "bot"
+    # База доступна через PgBouncer в режиме pool_mode=transaction
+    db_transaction_pooler: bool = False
+
+    # Пул соединений с базой
+    db_pool_size: int = Field(10, ge=1)
+    db_max_overflow: int = Field(5, ge=0)
+    db_pool_timeout: float = Field(30, gt=0)
+    # Пул для остальных ролей; 0 — без пула (NullPool)
+    worker_db_pool_size: int = Field(0, ge=0)
+    # Предупреждение в лог, если соединение занято дольше (миллисекунды)
+    db_connection_hold_warning_ms: int = Field(1000, ge=1)
+
+    # Время и расписание задач (HH:MM)
+    timezone: str = "Europe/Moscow"
+    hero_selection_time: str = "09:01"
+    birthday_check_time: str = "00:01"
+
+    # Ежедневные задачи: группы делятся на корзины, и каждая корзина
+    # запускается со своим смещением внутри окна (в минутах)
+    daily_job_buckets: int = Field(12, ge=1)
+    daily_job_window: int = Field(60, ge=0, lt=24 * 60)
+
+    # Планировщик отложенных задач
+    scheduler_poll_interval: float = Field(30, gt=0)  # секунды
+    scheduler_batch_size: int = Field(100, ge=1)
+
+    # Celery
+    celery_prefetch_multiplier: int = Field(8, ge=1)
+    celery_broker_pool_limit: int = Field(10, ge=1)
+
+    # Месячные секции beer_choices: сколько месяцев создавать заранее и
+    # сколько хранить; старые секции сворачиваются в beer_choice_monthly.
+    # Хранение 0 — без ограничения. Без удаления секции только отсоединяются.
+    beer_choices_partitions_ahead: int = Field(2, ge=1)
+    beer_choices_retention_months: int = Field(12, ge=0)
+    beer_choices_drop_expired: bool = True
+
+    # Ограничения рассылок
+    broadcast_rate_limit: float = Field(25, gt=0)  # сообщений в секунду
+    image_failure_limit: int = Field(3, ge=1)
+
+    # Кэши
+    hero_top_cache_ttl: int = Field(24 * 60 * 60, ge=1)
+    event_card_cache_size: int = Field(1024, ge=0)
+    event_keyboards_cache_size: int = Field(1024, ge=1)
+    event_list_keyboards_cache_size: int = Field(64, ge=1)
+
+    # Логи и метрики
+    log_level: str = "INFO"
+    log_file: str = "bot.log"
+    console_logging: bool = True
+    metrics_port: int = 9100
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: str) -> str:
+        try:
+            pendulum.timezone(value)
+        except Exception as e:
+            raise ValueError(f"Unknown timezone: {value}") from e
+        return value
+
+    @field_validator("log_level")
+    @classmethod
+    def normalize_log_level(cls, value: str) -> str:
+        return value.upper()
+
+
+settings = Settings()
@@ -1,29 +1,152 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import text
-import os
-from typing import AsyncGenerator
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy import Select, event, text
+from sqlalchemy.pool import NullPool
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import uuid4
+import pendulum
+import time
+from bot.core.config import settings
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import instrument_engine
 
 logger = setup_logger(__name__)
 Base = declarative_base()
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.database_url
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in environment variables")
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_size=10,
-    max_overflow=5,
-    pool_timeout=30,
-    pool_pre_ping=True,
+
+
+def engine_options() -> Dict[str, Any]:
+    """Параметры движка для роли процесса и режима подключения к базе."""
+    options: Dict[str, Any] = {"echo": False, "pool_pre_ping": True}
+    if settings.process_role == "bot":
+        pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    else:
+        pool_size, max_overflow = settings.worker_db_pool_size, 0
+    if pool_size:
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    else:
+        options["poolclass"] = NullPool
+    if settings.db_transaction_pooler:
+        # PgBouncer отдаёт каждую транзакцию любому серверному соединению:
+        # подготовленные выражения не кэшируются, а их имена не повторяются
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options())
+instrument_engine(engine)
+replica_engine = (
+    create_async_engine(settings.database_replica_url, **engine_options())
+    if settings.database_replica_url
+    else None
 )
+if replica_engine is not None:
+    instrument_engine(replica_engine)
+
+# Пользователь, от имени которого обрабатывается апдейт
+current_actor: ContextVar[Optional[int]] = ContextVar("current_actor", default=None)
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+# Время последней записи по пользователям, самые старые вытесняются
+_recent_writers: "OrderedDict[int, float]" = OrderedDict()
+_RECENT_WRITERS_LIMIT = 10_000
+
+
+def replica_read(func):
+    """Разрешает запросам метода репозитория читать с реплики."""
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    return wrapper
+
+
+def _note_write(session: Session) -> None:
+    session.info["wrote"] = True
+    actor = current_actor.get()
+    if actor is not None:
+        _recent_writers[actor] = time.monotonic()
+        _recent_writers.move_to_end(actor)
+        if len(_recent_writers) > _RECENT_WRITERS_LIMIT:
+            _recent_writers.popitem(last=False)
+
+
+def _wrote_recently(actor: Optional[int]) -> bool:
+    written_at = _recent_writers.get(actor) if actor is not None else None
+    return (
+        written_at is not None
+        and time.monotonic() - written_at < settings.replica_max_lag
+    )
+
+
+class RoutingSession(Session):
+    """Сессия, отправляющая разрешённые чтения на реплику.
+
+    На основную базу идут все записи, чтения после записи в той же сессии
+    и чтения пользователя, писавшего меньше replica_max_lag секунд назад,
+    чтобы он видел свои изменения независимо от отставания реплики.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            _replica_reads.get()
+            and isinstance(clause, Select)
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not _wrote_recently(current_actor.get())
+        ):
+            return replica_engine.sync_engine
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    _note_write(session)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        _note_write(orm_execute_state.session)
+
+
 async_session_maker = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession if replica_engine is not None else Session,
 )
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Сессия на время блока async with.
+
+    Соединение возвращается в пул сразу при выходе из блока, в том числе
+    через return или исключение, а не при сборке мусора генератора.
+    """
     async with async_session_maker() as session:
         try:
             yield session
@@ -31,8 +154,6 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             logger.error(f"Database session error: {e}")
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 async def init_db():
@@ -41,14 +162,51 @@ async def init_db():
             from bot.core.models import (
                 User,
                 BeerChoice,
+                BeerChoiceMonthly,
                 Event,
                 EventParticipant,
                 Group,
                 GroupUser,
                 HeroSelection,
+                HeroCount,
+                ScheduledJob,
             )
 
-            await conn.run_sync(Base.metadata.create_all)
+            from bot.core.partitions import ensure_partitioned_table, ensure_partitions
+
+            # beer_choices секционирована, её создаёт ensure_partitioned_table
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[
+                    table
+                    for table in Base.metadata.sorted_tables
+                    if table is not BeerChoice.__table__
+                ],
+            )
+            now = pendulum.now("UTC")
+            await ensure_partitioned_table(conn, now)
+            await ensure_partitions(conn, now, settings.beer_choices_partitions_ahead)
+            # create_all не добавляет новые колонки в существующие таблицы
+            await conn.execute(
+                text(
+                    "ALTER TABLE events ADD COLUMN IF NOT EXISTS image_file_size INTEGER"
+                )
+            )
+            await conn.execute(
+                text("ALTER TABLE groups ADD COLUMN IF NOT EXISTS hero_time TIME")
+            )
+            await conn.execute(
+                text("ALTER TABLE groups ADD COLUMN IF NOT EXISTS timezone VARCHAR(64)")
+            )
+            # Заполняем таблицу рейтинга героев из истории, если она только что создана
+            await conn.execute(
+                text(
+                    "INSERT INTO hero_counts (group_id, user_id, count) "
+                    "SELECT group_id, user_id, count(*) FROM hero_selections "
+                    "WHERE NOT EXISTS (SELECT 1 FROM hero_counts) "
+                    "GROUP BY group_id, user_id"
+                )
+            )
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
@@ -12,6 +12,7 @@ from sqlalchemy import (
     Time,
     Float,
     Index,
+    JSON,
 )
 from sqlalchemy.orm import relationship
 from bot.core.database import Base
@@ -48,7 +49,9 @@ class User(Base):
 
 class BeerChoice(Base):
     __tablename__ = "beer_choices"
-    id = Column(Integer, primary_key=True, index=True)
+    # В Postgres таблица секционирована по месяцам selected_at с первичным
+    # ключом (id, selected_at) и создаётся в bot/core/partitions.py
+    id = Column(Integer, primary_key=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -56,13 +59,13 @@ class BeerChoice(Base):
         Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False
     )
     beer_choice = Column(String(100), nullable=False)
-    selected_at = Column(DateTime(timezone=True), server_default=func.now())
+    selected_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     user = relationship("User", back_populates="choices")
     event = relationship("Event")
     __table_args__ = (
-        Index("idx_beer_choices_user_id", "user_id"),
         Index("idx_beer_choices_selected_at", "selected_at"),
-        Index("idx_beer_choices_beer_choice", "beer_choice"),
         Index("idx_beer_choices_user_id_selected_at", "user_id", "selected_at"),
         Index("idx_beer_choices_event_id", "event_id"),
     )
@@ -71,6 +74,21 @@ class BeerChoice(Base):
         return f"<BeerChoice(id={self.id}, user_id={self.user_id}, event_id={self.event_id}, beer_choice='{self.beer_choice}')>"
 
 
+class BeerChoiceMonthly(Base):
+    """Выборы пива из удалённых секций beer_choices, по месяцам."""
+
+    __tablename__ = "beer_choice_monthly"
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    month = Column(Date, primary_key=True)
+    beer = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<BeerChoiceMonthly(user_id={self.user_id}, month={self.month}, beer='{self.beer}', count={self.count})>"
+
+
 class Event(Base):
     __tablename__ = "events"
     id = Column(Integer, primary_key=True, index=True)
@@ -82,11 +100,13 @@ class Event(Base):
     location_name = Column(String(500), nullable=True)
     description = Column(String(1000))
     image_file_id = Column(String(200))
+    image_file_size = Column(Integer, nullable=True)
     has_beer_choice = Column(Boolean, default=False, nullable=False)
     beer_option_1 = Column(String(100), nullable=True)
     beer_option_2 = Column(String(100), nullable=True)
     created_by = Column(BigInteger, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Устарело: отложенные задачи хранятся в scheduled_jobs
     celery_task_id = Column(String(200), nullable=True)
     __table_args__ = (
         Index("idx_events_event_date", "event_date"),
@@ -97,6 +117,28 @@ class Event(Base):
         return f"<Event(id={self.id}, name='{self.name}', date={self.event_date}, time={self.event_time})>"
 
 
+class ScheduledJob(Base):
+    """Отложенная задача Celery, которая ставится в очередь в момент run_at."""
+
+    __tablename__ = "scheduled_jobs"
+    id = Column(Integer, primary_key=True)
+    task_name = Column(String(200), nullable=False)
+    args = Column(JSON, nullable=False, default=list)
+    # Задания события удаляются вместе с ним
+    event_id = Column(
+        Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True
+    )
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    __table_args__ = (
+        Index("idx_scheduled_jobs_run_at", "run_at"),
+        Index("idx_scheduled_jobs_event_id", "event_id"),
+    )
+
+    def __repr__(self):
+        return f"<ScheduledJob(id={self.id}, task_name='{self.task_name}', run_at={self.run_at})>"
+
+
 class EventParticipant(Base):
     __tablename__ = "event_participants"
     id = Column(Integer, primary_key=True, index=True)
@@ -116,6 +158,10 @@ class Group(Base):
     id = Column(Integer, primary_key=True, index=True)
     chat_id = Column(BigInteger, unique=True, nullable=False, index=True)
     name = Column(String(200), nullable=False)
+    # Своё время объявления героя дня и часовой пояс группы; если не заданы,
+    # используются общие настройки и смещение по корзине
+    hero_time = Column(Time, nullable=True)
+    timezone = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     group_users = relationship(
         "GroupUser", back_populates="group", cascade="all, delete-orphan"
@@ -178,3 +224,22 @@ class HeroSelection(Base):
 
     def __repr__(self):
         return f"<HeroSelection(id={self.id}, group_id={self.group_id}, user_id={self.user_id}, date={self.selection_date})>"
+
+
+class HeroCount(Base):
+    __tablename__ = "hero_counts"
+    id = Column(Integer, primary_key=True, index=True)
+    group_id = Column(
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    count = Column(Integer, nullable=False, default=0)
+    __table_args__ = (
+        Index("idx_hero_counts_group_id_user_id", "group_id", "user_id", unique=True),
+        Index("idx_hero_counts_group_id_count", "group_id", "count"),
+    )
+
+    def __repr__(self):
+        return f"<HeroCount(group_id={self.group_id}, user_id={self.user_id}, count={self.count})>"
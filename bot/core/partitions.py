@@ -0,0 +1,203 @@
+"""
+Месячные секции таблицы beer_choices.
+
+Таблица секционирована по диапазонам selected_at: по секции на месяц
+часового пояса бота. Секции создаются заранее, а устаревшие сворачиваются
+в beer_choice_monthly и отсоединяются или удаляются.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+import pendulum
+from pendulum import DateTime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from bot.core.config import settings
+from bot.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+PARENT = "beer_choices"
+# Несекционированная таблица прежних версий становится первой секцией
+LEGACY = "beer_choices_legacy"
+
+# Повторяет модель BeerChoice; первичный ключ включает ключ секционирования
+CREATE_PARENT = (
+    "CREATE SEQUENCE IF NOT EXISTS beer_choices_id_seq",
+    "CREATE TABLE beer_choices ("
+    "id INTEGER NOT NULL DEFAULT nextval('beer_choices_id_seq'), "
+    "user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE, "
+    "event_id INTEGER NOT NULL REFERENCES events (id) ON DELETE CASCADE, "
+    "beer_choice VARCHAR(100) NOT NULL, "
+    "selected_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+    "PRIMARY KEY (id, selected_at)"
+    ") PARTITION BY RANGE (selected_at)",
+    "ALTER SEQUENCE beer_choices_id_seq OWNED BY beer_choices.id",
+    "CREATE INDEX IF NOT EXISTS idx_beer_choices_selected_at "
+    "ON beer_choices (selected_at)",
+    "CREATE INDEX IF NOT EXISTS idx_beer_choices_user_id_selected_at "
+    "ON beer_choices (user_id, selected_at)",
+    "CREATE INDEX IF NOT EXISTS idx_beer_choices_event_id ON beer_choices (event_id)",
+)
+
+# Индексы прежней таблицы: лишние удаляются, остальные переименовываются,
+# чтобы освободить имена для секционированной таблицы
+PREPARE_LEGACY = (
+    f"ALTER TABLE {PARENT} RENAME TO {LEGACY}",
+    f"ALTER INDEX IF EXISTS beer_choices_pkey RENAME TO {LEGACY}_pkey",
+    "DROP INDEX IF EXISTS ix_beer_choices_id",
+    "DROP INDEX IF EXISTS idx_beer_choices_user_id",
+    "DROP INDEX IF EXISTS idx_beer_choices_beer_choice",
+    f"ALTER INDEX IF EXISTS idx_beer_choices_selected_at "
+    f"RENAME TO idx_{LEGACY}_selected_at",
+    f"ALTER INDEX IF EXISTS idx_beer_choices_user_id_selected_at "
+    f"RENAME TO idx_{LEGACY}_user_id_selected_at",
+    f"ALTER INDEX IF EXISTS idx_beer_choices_event_id "
+    f"RENAME TO idx_{LEGACY}_event_id",
+    f"UPDATE {LEGACY} SET selected_at = now() WHERE selected_at IS NULL",
+    f"ALTER TABLE {LEGACY} ALTER COLUMN selected_at SET NOT NULL",
+)
+
+ROLLUP = (
+    "INSERT INTO beer_choice_monthly (user_id, month, beer, count) "
+    "SELECT user_id, date_trunc('month', selected_at AT TIME ZONE :tz)::date, "
+    "beer_choice, count(*) FROM {partition} GROUP BY 1, 2, 3 "
+    "ON CONFLICT (user_id, month, beer) "
+    "DO UPDATE SET count = beer_choice_monthly.count + EXCLUDED.count"
+)
+
+UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+# Обслуживание секций из бота и воркеров не должно идти одновременно
+LOCK = text("SELECT pg_advisory_xact_lock(hashtext('beer_choices_partitions'))")
+
+
+class Partition(NamedTuple):
+    name: str
+    upper: Optional[DateTime]
+
+
+def month_start(moment: DateTime) -> DateTime:
+    return moment.in_timezone(settings.timezone).start_of("month")
+
+
+def partition_name(month: DateTime) -> str:
+    return f"{PARENT}_y{month.year}m{month.month:02d}"
+
+
+async def _relkind(conn: AsyncConnection, table: str) -> Optional[str]:
+    result = await conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    return result.scalar()
+
+
+async def list_partitions(conn: AsyncConnection) -> List[Partition]:
+    """Секции beer_choices с верхней границей, по возрастанию границы."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:parent)"
+        ),
+        {"parent": PARENT},
+    )
+    partitions = []
+    for name, bound in result.all():
+        match = UPPER_BOUND.search(bound or "")
+        upper = pendulum.parse(match.group(1)) if match else None
+        partitions.append(Partition(name, upper))
+    return sorted(partitions, key=lambda p: (p.upper is None, p.upper))
+
+
+async def ensure_partitioned_table(conn: AsyncConnection, now: DateTime) -> None:
+    """Создаёт секционированную beer_choices или переводит на неё прежнюю."""
+    await conn.execute(LOCK)
+    relkind = await _relkind(conn, PARENT)
+    if relkind == "p":
+        return
+    if relkind is None:
+        for statement in CREATE_PARENT:
+            await conn.execute(text(statement))
+        logger.info("Created partitioned beer_choices table")
+        return
+
+    for statement in PREPARE_LEGACY:
+        await conn.execute(text(statement))
+    for statement in CREATE_PARENT:
+        await conn.execute(text(statement))
+    # Прежние строки остаются на месте: таблица подключается секцией до
+    # конца текущего месяца, дальше идут месячные секции
+    latest = (
+        await conn.execute(text(f"SELECT max(selected_at) FROM {LEGACY}"))
+    ).scalar()
+    latest = max(now, pendulum.instance(latest)) if latest else now
+    bound = month_start(latest).add(months=1)
+    await conn.execute(
+        text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {LEGACY} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{bound.isoformat()}')"
+        )
+    )
+    logger.info(
+        f"Converted beer_choices to partitioned table, legacy rows up to {bound}"
+    )
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, now: DateTime, months_ahead: int
+) -> List[str]:
+    """Создаёт месячные секции до months_ahead месяцев вперёд."""
+    await conn.execute(LOCK)
+    partitions = await list_partitions(conn)
+    uppers = [p.upper for p in partitions if p.upper is not None]
+    start = max(uppers) if uppers else month_start(now)
+    start = start.in_timezone(settings.timezone)
+    last = month_start(now).add(months=months_ahead)
+    created = []
+    while start <= last:
+        end = start.add(months=1)
+        name = partition_name(start)
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        created.append(name)
+        start = end
+    if created:
+        logger.info(f"Created beer_choices partitions: {', '.join(created)}")
+    return created
+
+
+async def expire_partition(
+    conn: AsyncConnection, partition: Partition, drop: bool
+) -> bool:
+    """Сворачивает секцию в beer_choice_monthly и отсоединяет её.
+
+    Возвращает False, если секцию уже обработал другой процесс.
+    """
+    await conn.execute(LOCK)
+    attached = await conn.execute(
+        text(
+            "SELECT 1 FROM pg_inherits "
+            "WHERE inhrelid = to_regclass(:name) AND inhparent = to_regclass(:parent)"
+        ),
+        {"name": partition.name, "parent": PARENT},
+    )
+    if attached.scalar() is None:
+        return False
+    await conn.execute(
+        text(ROLLUP.format(partition=partition.name)), {"tz": settings.timezone}
+    )
+    await conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}"))
+    if drop:
+        await conn.execute(text(f"DROP TABLE {partition.name}"))
+    logger.info(
+        f"Rolled up beer_choices partition {partition.name} "
+        f"({'dropped' if drop else 'detached'})"
+    )
+    return True
@@ -0,0 +1,33 @@
+"""
+Лёгкие модели для чтения.
+
+Строятся из выборки отдельных колонок: в отличие от ORM-объектов не
+попадают в identity map сессии и не отслеживают изменения. Используются
+там, где данные только читаются.
+"""
+
+from datetime import date, time
+from typing import NamedTuple, Optional
+
+
+class EventSlot(NamedTuple):
+    id: int
+    name: str
+    event_date: date
+    event_time: time
+
+
+class GroupMember(NamedTuple):
+    group_id: int
+    user_id: int
+
+
+class UserContact(NamedTuple):
+    id: int
+    username: Optional[str]
+    name: str
+
+
+class ChoiceRow(NamedTuple):
+    user_id: int
+    beer_choice: str
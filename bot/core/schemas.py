@@ -3,6 +3,7 @@ from datetime import date, datetime, time
 from typing import Optional, List
 from pydantic import validator
 import pendulum
+from bot.core.config import settings
 
 
 class UserCreate(BaseModel):
@@ -15,7 +16,7 @@ class UserCreate(BaseModel):
 
     @validator("birth_date")
     def validate_birth_date(cls, value):
-        today = pendulum.now("Europe/Moscow").date()
+        today = pendulum.now(settings.timezone).date()
         age = (
             today.year
             - value.year
@@ -79,6 +80,9 @@ class EventCreate(BaseModel):
     image_file_id: Optional[str] = Field(
         None, max_length=200, description="Telegram file ID of event image"
     )
+    image_file_size: Optional[int] = Field(
+        None, ge=0, description="Size of the validated event image in bytes"
+    )
     has_beer_choice: bool = Field(
         default=False, description="Whether event has beer choice"
     )
@@ -92,7 +96,7 @@ class EventCreate(BaseModel):
 
     @validator("event_date")
     def validate_event_date(cls, value):
-        today = pendulum.now("Europe/Moscow").date()
+        today = pendulum.now(settings.timezone).date()
         if value < today:
             raise ValueError("Event date cannot be in the past")
         return value
@@ -109,6 +113,7 @@ class EventResponse(BaseModel):
     location_name: Optional[str]
     description: Optional[str]
     image_file_id: Optional[str]
+    image_file_size: Optional[int]
     has_beer_choice: bool
     beer_option_1: Optional[str]
     beer_option_2: Optional[str]
@@ -1,9 +1,20 @@
-from . import (
-    start,
-    beer_selection,
-    profile,
-    event_creation,
-    events_list,
-    delete_event,
-    hero_of_the_day,
+from importlib import import_module
+from typing import List
+
+from aiogram import Router
+
+# Порядок важен: Dispatcher проверяет роутеры в порядке подключения
+ROUTER_MODULES = (
+    "start",
+    "beer_selection",
+    "profile",
+    "event_creation",
+    "events_list",
+    "delete_event",
+    "hero_of_the_day",
 )
+
+
+def load_routers() -> List[Router]:
+    """Импортирует модули обработчиков и возвращает их роутеры."""
+    return [import_module(f"{__name__}.{name}").router for name in ROUTER_MODULES]
@@ -1,41 +1,67 @@
-from aiogram import Router, types, Bot
-from aiogram.filters import Command
+from aiogram import types, Bot
+from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.user_repo import UserRepository
 from bot.repositories.event_repo import EventRepository
 from bot.repositories.beer_repo import BeerRepository
 from bot.core.schemas import BeerChoiceCreate
+from bot.utils.callbacks import (
+    CallbackRouter,
+    BeerCallback,
+    BeerChoiceCallback,
+    CancelBeerSelectionCallback,
+    LEGACY_BEER_CHOICE,
+    ProfileCallback,
+    SelectEventCallback,
+    StartCallback,
+    legacy_event_id,
+)
 from bot.utils.decorators import private_chat_only
+from bot.utils.geo import haversine_distance, get_venue_index, LOCATION_RADIUS_M
+from bot.utils.keyboards import event_keyboards, event_list_keyboards, static_keyboard
 from bot.utils.logger import setup_logger
 import pendulum
 from datetime import datetime, time, timedelta
-from math import radians, sin, cos, sqrt, atan2
+from typing import Optional
 
 logger = setup_logger(__name__)
-router = Router()
+router = CallbackRouter()
+
+
+EVENT_SELECTION_TEXT = (
+    "📅 Выбери событие для выбора пива:\n\n"
+    "📍 Или просто отправь геопозицию — я сам найду событие рядом."
+)
 
 
 class BeerSelectionStates(StatesGroup):
     waiting_for_location = State()
 
 
+@static_keyboard
 def get_command_keyboard(event_id: int = 0):
     builder = InlineKeyboardBuilder()
     builder.add(
-        types.InlineKeyboardButton(text="👤 Профиль", callback_data="cmd_profile")
+        types.InlineKeyboardButton(
+            text="👤 Профиль", callback_data=ProfileCallback().pack()
+        )
     )
     builder.add(
-        types.InlineKeyboardButton(text="🏠 В начало", callback_data="cmd_start")
+        types.InlineKeyboardButton(
+            text="🏠 В начало", callback_data=StartCallback().pack()
+        )
     )
     builder.adjust(2)
     return builder.as_markup()
 
 
-def get_location_keyboard(event_id: int):
+@static_keyboard
+def get_location_keyboard(event_id: int = 0):
     keyboard = ReplyKeyboardMarkup(
         keyboard=[
             [KeyboardButton(text="📍 Отправить геопозицию", request_location=True)]
@@ -46,40 +72,38 @@ def get_location_keyboard(event_id: int):
     cancel_builder = InlineKeyboardBuilder()
     cancel_builder.add(
         types.InlineKeyboardButton(
-            text="❌ Отменить", callback_data="cancel_beer_selection"
+            text="❌ Отменить", callback_data=CancelBeerSelectionCallback().pack()
         )
     )
     return keyboard, cancel_builder.as_markup()
 
 
 def get_beer_choice_keyboard(event):
+    return event_keyboards.get_or_build(
+        event.id,
+        (event.has_beer_choice, event.beer_option_1, event.beer_option_2),
+        lambda: _build_beer_choice_keyboard(event),
+    )
+
+
+def _build_beer_choice_keyboard(event):
     builder = InlineKeyboardBuilder()
-    valid_options = []
     if event.has_beer_choice and event.beer_option_1 and event.beer_option_2:
-        valid_options = [event.beer_option_1, event.beer_option_2]
-        builder.add(
-            types.InlineKeyboardButton(
-                text=f"🍺 {event.beer_option_1}",
-                callback_data=f"beer_{event.id}_{event.beer_option_1}",
-            )
-        )
-        builder.add(
-            types.InlineKeyboardButton(
-                text=f"🍺 {event.beer_option_2}",
-                callback_data=f"beer_{event.id}_{event.beer_option_2}",
-            )
-        )
+        valid_options = (event.beer_option_1, event.beer_option_2)
     else:
-        valid_options = [event.beer_option_1 or "Лагер"]
+        valid_options = (event.beer_option_1 or "Лагер",)
+    for option, beer in enumerate(valid_options):
         builder.add(
             types.InlineKeyboardButton(
-                text=f"🍺 {valid_options[0]}",
-                callback_data=f"beer_{event.id}_{valid_options[0]}",
+                text=f"🍺 {beer}",
+                callback_data=BeerChoiceCallback(
+                    event_id=event.id, option=option
+                ).pack(),
             )
         )
     builder.add(
         types.InlineKeyboardButton(
-            text="❌ Отменить", callback_data="cancel_beer_selection"
+            text="❌ Отменить", callback_data=CancelBeerSelectionCallback().pack()
         )
     )
     builder.adjust(1 if not event.has_beer_choice else 2)
@@ -87,45 +111,33 @@ def get_beer_choice_keyboard(event):
 
 
 def get_event_selection_keyboard(events):
+    return event_list_keyboards.get_or_build(
+        ("selection", tuple(event.id for event in events)),
+        tuple((event.name, event.event_time) for event in events),
+        lambda: _build_event_selection_keyboard(events),
+    )
+
+
+def _build_event_selection_keyboard(events):
     builder = InlineKeyboardBuilder()
     for event in events:
         time_str = event.event_time.strftime("%H:%M")
         button_text = f"📅 {event.name} @ {time_str}"
         builder.add(
             types.InlineKeyboardButton(
-                text=button_text, callback_data=f"select_event_{event.id}"
+                text=button_text,
+                callback_data=SelectEventCallback(event_id=event.id).pack(),
             )
         )
     builder.add(
         types.InlineKeyboardButton(
-            text="❌ Отменить", callback_data="cancel_beer_selection"
+            text="❌ Отменить", callback_data=CancelBeerSelectionCallback().pack()
         )
     )
     builder.adjust(1)
     return builder.as_markup()
 
 
-EARTH_RADIUS_M = 6371000
-
-
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    if not all(isinstance(x, (int, float)) and -90 <= x <= 90 for x in (lat1, lat2)):
-        raise ValueError("Latitudes must be between -90 and 90 degrees")
-    if not all(isinstance(x, (int, float)) and -180 <= x <= 180 for x in (lon1, lon2)):
-        raise ValueError("Longitudes must be between -180 and 180 degrees")
-    if not all(
-        isinstance(x, (int, float)) and x == x for x in (lat1, lon1, lat2, lon2)
-    ):
-        raise ValueError("Coordinates must be finite numbers")
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    distance = EARTH_RADIUS_M * c
-    return distance
-
-
 def is_event_selection_available(event, today, current_time):
     """Проверяет, доступен ли выбор пива для события (30 минут до начала или раньше)"""
     if event.event_date != today:
@@ -149,7 +161,7 @@ async def get_all_upcoming_events(session, today):
 @private_chat_only(response_probability=0.5)
 async def beer_selection_handler(message: types.Message, bot: Bot, state: FSMContext):
     try:
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, message.from_user.id
             )
@@ -161,7 +173,7 @@ async def beer_selection_handler(message: types.Message, bot: Bot, state: FSMCon
                 )
                 return
 
-            today = pendulum.now("Europe/Moscow").date()
+            today = pendulum.now(settings.timezone).date()
             upcoming_events = await get_all_upcoming_events(session, today)
 
             if not upcoming_events:
@@ -176,7 +188,7 @@ async def beer_selection_handler(message: types.Message, bot: Bot, state: FSMCon
             keyboard = get_event_selection_keyboard(upcoming_events)
             await bot.send_message(
                 chat_id=message.chat.id,
-                text="📅 Выбери событие для выбора пива:",
+                text=EVENT_SELECTION_TEXT,
                 reply_markup=keyboard,
             )
 
@@ -189,16 +201,20 @@ async def beer_selection_handler(message: types.Message, bot: Bot, state: FSMCon
         )
 
 
-@router.callback_query(lambda c: c.data.startswith("select_event_"))
+@router.callback_query(SelectEventCallback.filter())
+@router.callback_query(legacy_event_id("select_event_", SelectEventCallback))
 @private_chat_only(response_probability=0.5)
 async def select_event_callback(
-    callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
+    callback_query: types.CallbackQuery,
+    callback_data: SelectEventCallback,
+    bot: Bot,
+    state: FSMContext,
 ):
     try:
         await callback_query.answer()
-        event_id = int(callback_query.data.split("_")[2])
+        event_id = callback_data.event_id
 
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, callback_query.from_user.id
             )
@@ -221,8 +237,8 @@ async def select_event_callback(
                 )
                 return
 
-            today = pendulum.now("Europe/Moscow").date()
-            current_time = pendulum.now("Europe/Moscow").time()
+            today = pendulum.now(settings.timezone).date()
+            current_time = pendulum.now(settings.timezone).time()
 
             # Проверяем, доступен ли выбор пива для этого события
             if not is_event_selection_available(event, today, current_time):
@@ -324,7 +340,7 @@ async def process_user_location(message: types.Message, bot: Bot, state: FSMCont
         data = await state.get_data()
         event_id = data.get("event_id")
 
-        async for session in get_async_session():
+        async with session_scope() as session:
             event = await EventRepository.get_event_by_id(session, event_id)
             if not event or event.latitude is None or event.longitude is None:
                 await bot.send_message(
@@ -339,10 +355,10 @@ async def process_user_location(message: types.Message, bot: Bot, state: FSMCont
                 user_lat, user_lon, event.latitude, event.longitude
             )
 
-            if distance > 500:
+            if distance > LOCATION_RADIUS_M:
                 await bot.send_message(
                     chat_id=message.chat.id,
-                    text=f"❌ Ты слишком далеко от места события ({int(distance)} м). Нужно быть в радиусе 500 м.",
+                    text=f"❌ Ты слишком далеко от места события ({int(distance)} м). Нужно быть в радиусе {LOCATION_RADIUS_M} м.",
                     reply_markup=get_command_keyboard(event_id),
                 )
                 await state.clear()
@@ -382,27 +398,94 @@ async def process_user_location(message: types.Message, bot: Bot, state: FSMCont
         await state.clear()
 
 
-@router.callback_query(lambda c: c.data.startswith("beer_"))
+# Геопозиция вне сценариев FSM: создание события ждёт её в своём состоянии
+@router.message(StateFilter(None), lambda m: m.location is not None)
 @private_chat_only(response_probability=0.5)
-async def beer_choice_callback(
-    callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
+async def process_location_without_event(
+    message: types.Message, bot: Bot, state: FSMContext
 ):
+    """Определяет ближайшее доступное событие по геопозиции без выбора события."""
     try:
-        await callback_query.answer()
-        parts = callback_query.data.split("_")
-        if len(parts) != 3:
-            await bot.edit_message_text(
-                text="❌ Неверный формат выбора пива.",
-                chat_id=callback_query.message.chat.id,
-                message_id=callback_query.message.message_id,
-                reply_markup=get_command_keyboard(),
+        async with session_scope() as session:
+            user = await UserRepository.get_user_by_telegram_id(
+                session, message.from_user.id
             )
-            return
+            if not user:
+                await bot.send_message(
+                    chat_id=message.chat.id,
+                    text="❌ Ты не зарегистрирован!\nИспользуй команду /start для регистрации.",
+                    reply_markup=get_command_keyboard(),
+                )
+                return
 
-        event_id = int(parts[1])
-        beer_choice = parts[2]
+            today = pendulum.now(settings.timezone).date()
+            current_time = pendulum.now(settings.timezone).time()
+            index = await get_venue_index(
+                today, lambda: EventRepository.get_venues_by_date(session, today)
+            )
+            nearest = index.nearest(
+                message.location.latitude,
+                message.location.longitude,
+                predicate=lambda venue: is_event_selection_available(
+                    venue, today, current_time
+                ),
+            )
+            event = (
+                await EventRepository.get_event_by_id(session, nearest[0].event_id)
+                if nearest
+                else None
+            )
+            if not event:
+                await bot.send_message(
+                    chat_id=message.chat.id,
+                    text=f"❌ В радиусе {LOCATION_RADIUS_M} м нет событий, для которых сейчас открыт выбор пива.",
+                    reply_markup=get_command_keyboard(),
+                )
+                return
+
+            distance = nearest[1]
+            has_chosen = await BeerRepository.has_user_chosen_for_event(
+                session, user.id, event
+            )
+            if has_chosen:
+                await bot.send_message(
+                    chat_id=message.chat.id,
+                    text=f"❌ Ты уже выбрал пиво для события '{event.name}'!",
+                    reply_markup=get_command_keyboard(event.id),
+                )
+                return
+
+            keyboard, _ = get_beer_choice_keyboard(event)
+            await bot.send_message(
+                chat_id=message.chat.id,
+                text=f"📍 Ты рядом с событием '{event.name}' ({int(distance)} м)!\nВыбери пиво:",
+                reply_markup=keyboard,
+            )
+
+    except Exception as e:
+        logger.error(f"Error processing location without event: {e}", exc_info=True)
+        await bot.send_message(
+            chat_id=message.chat.id,
+            text="Произошла ошибка. Попробуй позже.",
+            reply_markup=get_command_keyboard(),
+        )
+
+
+@router.callback_query(BeerChoiceCallback.filter())
+@router.callback_query(LEGACY_BEER_CHOICE)
+@private_chat_only(response_probability=0.5)
+async def beer_choice_callback(
+    callback_query: types.CallbackQuery,
+    callback_data: BeerChoiceCallback,
+    bot: Bot,
+    state: FSMContext,
+    legacy_beer: Optional[str] = None,
+):
+    try:
+        await callback_query.answer()
+        event_id = callback_data.event_id
 
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, callback_query.from_user.id
             )
@@ -425,8 +508,8 @@ async def beer_choice_callback(
                 )
                 return
 
-            today = pendulum.now("Europe/Moscow").date()
-            current_time = pendulum.now("Europe/Moscow").time()
+            today = pendulum.now(settings.timezone).date()
+            current_time = pendulum.now(settings.timezone).time()
 
             # Повторная проверка времени выбора
             if not is_event_selection_available(event, today, current_time):
@@ -439,7 +522,15 @@ async def beer_choice_callback(
                 return
 
             keyboard, valid_options = get_beer_choice_keyboard(event)
-            if beer_choice not in valid_options:
+            option = callback_data.option
+            if legacy_beer is not None:
+                # Кнопка старого формата с названием сорта
+                option = (
+                    valid_options.index(legacy_beer)
+                    if legacy_beer in valid_options
+                    else len(valid_options)
+                )
+            if option >= len(valid_options):
                 await bot.edit_message_text(
                     text="❌ Недопустимый выбор пива. Пожалуйста, выбери из предложенных вариантов.",
                     chat_id=callback_query.message.chat.id,
@@ -447,6 +538,7 @@ async def beer_choice_callback(
                     reply_markup=keyboard,
                 )
                 return
+            beer_choice = valid_options[option]
 
             has_chosen = await BeerRepository.has_user_chosen_for_event(
                 session, user.id, event
@@ -498,7 +590,7 @@ async def beer_choice_callback(
         )
 
 
-@router.callback_query(lambda c: c.data == "cancel_beer_selection")
+@router.callback_query(CancelBeerSelectionCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def cancel_beer_selection(
     callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
@@ -522,14 +614,14 @@ async def cancel_beer_selection(
         )
 
 
-@router.callback_query(lambda c: c.data == "cmd_beer")
+@router.callback_query(BeerCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def cmd_beer_callback(
     callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
 ):
     try:
         await callback_query.answer()
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, callback_query.from_user.id
             )
@@ -542,7 +634,7 @@ async def cmd_beer_callback(
                 )
                 return
 
-            today = pendulum.now("Europe/Moscow").date()
+            today = pendulum.now(settings.timezone).date()
             upcoming_events = await get_all_upcoming_events(session, today)
 
             if not upcoming_events:
@@ -559,7 +651,7 @@ async def cmd_beer_callback(
             await bot.edit_message_text(
                 chat_id=callback_query.message.chat.id,
                 message_id=callback_query.message.message_id,
-                text="📅 Выбери событие для выбора пива:",
+                text=EVENT_SELECTION_TEXT,
                 reply_markup=keyboard,
             )
 
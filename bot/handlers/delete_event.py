@@ -1,29 +1,22 @@
-from aiogram import Router, types, Bot
+from aiogram import types, Bot
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.event_repo import EventRepository
+from bot.repositories.scheduled_job_repo import ScheduledJobRepository
+from bot.utils.callbacks import (
+    CallbackRouter,
+    CancelEventDeletionCallback,
+)
 from bot.utils.decorators import private_chat_only
 from bot.utils.logger import setup_logger
 from bot.handlers.event_creation import get_cancel_keyboard
-from bot.tasks.celery_app import app as celery_app
-from celery.result import AsyncResult
-import os
 from sqlalchemy.exc import NoResultFound
-import redis
 
 logger = setup_logger(__name__)
-router = Router()
-ADMIN_TELEGRAM_ID = os.getenv("ADMIN_TELEGRAM_ID")
-if not ADMIN_TELEGRAM_ID:
-    raise ValueError("ADMIN_TELEGRAM_ID is not set in environment variables")
-ADMIN_TELEGRAM_ID = int(ADMIN_TELEGRAM_ID)
-
-# Initialize Redis client for manual cleanup
-redis_client = redis.Redis(
-    host="redis", port=6379, db=0, decode_responses=True, socket_timeout=5
-)
+router = CallbackRouter()
 
 
 class EventDeletionStates(StatesGroup):
@@ -40,7 +33,7 @@ async def delete_event_handler(message: types.Message, bot: Bot, state: FSMConte
                 text="❌ Команда доступна только в личных сообщениях.",
             )
             return
-        if message.from_user.id != ADMIN_TELEGRAM_ID:
+        if message.from_user.id != settings.admin_telegram_id:
             await bot.send_message(
                 chat_id=message.chat.id,
                 text="❌ У вас нет прав для удаления событий.",
@@ -75,41 +68,19 @@ async def process_event_id(message: types.Message, bot: Bot, state: FSMContext):
             )
             return
         event_id = int(event_id_str)
-        async for session in get_async_session():
+        async with session_scope() as session:
             try:
                 event = await EventRepository.get_event_by_id(session, event_id)
                 if not event:
                     raise NoResultFound
-                # Revoke and clear associated Celery task if exists
-                if event.celery_task_id:
-                    try:
-                        # Revoke task
-                        celery_app.control.revoke(event.celery_task_id, terminate=True)
-                        logger.info(
-                            f"Revoked Celery task {event.celery_task_id} for event {event_id}"
-                        )
-                        # Clear task result
-                        AsyncResult(event.celery_task_id, app=celery_app).forget()
-                        logger.info(
-                            f"Cleared Celery task result {event.celery_task_id} from backend"
-                        )
-                        # Manually delete Redis keys
-                        redis_keys = redis_client.keys(
-                            f"celery-task-meta-{event.celery_task_id}*"
-                        )
-                        if redis_keys:
-                            redis_client.delete(*redis_keys)
-                            logger.info(
-                                f"Deleted Redis keys {redis_keys} for task {event.celery_task_id}"
-                            )
-                    except Exception as revoke_error:
-                        logger.error(
-                            f"Failed to revoke or clear Celery task {event.celery_task_id}: {revoke_error}",
-                            exc_info=True,
-                        )
-                # Clear celery_task_id and delete event
-                event.celery_task_id = None
-                await session.commit()
+                # Отмена запланированного уведомления бармену — удаление строки
+                cancelled = await ScheduledJobRepository.cancel_event_jobs(
+                    session, event_id
+                )
+                if cancelled:
+                    logger.info(
+                        f"Cancelled {cancelled} scheduled jobs for event {event_id}"
+                    )
                 await EventRepository.delete_event(session, event_id)
                 await bot.send_message(
                     chat_id=message.chat.id,
@@ -140,7 +111,7 @@ async def process_event_id(message: types.Message, bot: Bot, state: FSMContext):
         await state.clear()
 
 
-@router.callback_query(lambda c: c.data == "cancel_event_deletion")
+@router.callback_query(CancelEventDeletionCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def cancel_event_deletion(
     callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
@@ -1,31 +1,38 @@
-from aiogram import Router, types, Bot
+from aiogram import types, Bot
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from bot.core.database import get_async_session
-from bot.core.models import Event
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.user_repo import UserRepository
 from bot.repositories.event_repo import EventRepository
 from bot.core.schemas import EventCreate
+from bot.utils.callbacks import (
+    CallbackRouter,
+    BeerCallback,
+    BeerChoiceModeCallback,
+    CancelEventCreationCallback,
+    StartCallback,
+)
 from bot.utils.decorators import private_chat_only
+from bot.utils.keyboards import static_keyboard
+from bot.utils.images import PhotoBroadcast, validate_image
 from bot.utils.logger import setup_logger
+from bot.utils.rendering import NOTIFICATION, SUMMARY, render_event
+import asyncio
 import pendulum
-import os
 import re
-from datetime import time, datetime
+from datetime import time
 from typing import Optional
 from sqlalchemy.exc import ProgrammingError, IntegrityError
 from aiogram.exceptions import TelegramAPIError
-from bot.tasks.celery_app import app as celery_app
-from sqlalchemy import update
 
 logger = setup_logger(__name__)
-router = Router()
-ADMIN_TELEGRAM_ID = os.getenv("ADMIN_TELEGRAM_ID")
-if not ADMIN_TELEGRAM_ID:
-    raise ValueError("ADMIN_TELEGRAM_ID is not set in environment variables")
-ADMIN_TELEGRAM_ID = int(ADMIN_TELEGRAM_ID)
+router = CallbackRouter()
+BARTENDER_NOTIFICATION_TASK = (
+    "bot.tasks.bartender_notification.process_event_notification"
+)
 
 
 class EventCreationStates(StatesGroup):
@@ -40,36 +47,53 @@ class EventCreationStates(StatesGroup):
     waiting_for_beer_options = State()
 
 
+@static_keyboard
 def get_cancel_keyboard():
     builder = InlineKeyboardBuilder()
     builder.add(
         types.InlineKeyboardButton(
-            text="❌ Отменить", callback_data="cancel_event_creation"
+            text="❌ Отменить", callback_data=CancelEventCreationCallback().pack()
         )
     )
     return builder.as_markup()
 
 
+@static_keyboard
 def get_beer_choice_keyboard():
     builder = InlineKeyboardBuilder()
-    builder.add(types.InlineKeyboardButton(text="✅ Да", callback_data="choice_yes"))
-    builder.add(types.InlineKeyboardButton(text="❌ Нет", callback_data="choice_no"))
     builder.add(
         types.InlineKeyboardButton(
-            text="🚫 Отменить", callback_data="cancel_event_creation"
+            text="✅ Да",
+            callback_data=BeerChoiceModeCallback(has_beer_choice=True).pack(),
+        )
+    )
+    builder.add(
+        types.InlineKeyboardButton(
+            text="❌ Нет",
+            callback_data=BeerChoiceModeCallback(has_beer_choice=False).pack(),
+        )
+    )
+    builder.add(
+        types.InlineKeyboardButton(
+            text="🚫 Отменить", callback_data=CancelEventCreationCallback().pack()
         )
     )
     builder.adjust(2, 1)
     return builder.as_markup()
 
 
+@static_keyboard
 def get_notification_keyboard():
     builder = InlineKeyboardBuilder()
     builder.add(
-        types.InlineKeyboardButton(text="🍺 Выбрать пиво", callback_data="cmd_beer")
+        types.InlineKeyboardButton(
+            text="🍺 Выбрать пиво", callback_data=BeerCallback().pack()
+        )
     )
     builder.add(
-        types.InlineKeyboardButton(text="🏠 В начало", callback_data="cmd_start")
+        types.InlineKeyboardButton(
+            text="🏠 В начало", callback_data=StartCallback().pack()
+        )
     )
     builder.adjust(2)
     return builder.as_markup()
@@ -85,7 +109,7 @@ async def create_event_handler(message: types.Message, bot: Bot, state: FSMConte
                 text="❌ Команда доступна только в личных сообщениях.",
             )
             return
-        if message.from_user.id != ADMIN_TELEGRAM_ID:
+        if message.from_user.id != settings.admin_telegram_id:
             await bot.send_message(
                 chat_id=message.chat.id, text="❌ У вас нет прав для создания событий."
             )
@@ -148,9 +172,9 @@ async def process_event_date(message: types.Message, bot: Bot, state: FSMContext
             )
             return
         event_date = pendulum.from_format(
-            date_str, "DD.MM.YYYY", tz="Europe/Moscow"
+            date_str, "DD.MM.YYYY", tz=settings.timezone
         ).date()
-        today = pendulum.now("Europe/Moscow").date()
+        today = pendulum.now(settings.timezone).date()
         if event_date < today:
             await bot.send_message(
                 chat_id=message.chat.id,
@@ -357,10 +381,19 @@ async def process_event_description(
 async def process_event_image(message: types.Message, bot: Bot, state: FSMContext):
     try:
         image_file_id = None
+        image_file_size = None
         if message.text and message.text.strip() == "-":
             pass
         elif message.photo:
-            image_file_id = message.photo[-1].file_id
+            asset = await validate_image(bot, message.photo[-1].file_id)
+            if not asset:
+                await bot.send_message(
+                    chat_id=message.chat.id,
+                    text='❌ Не удалось проверить изображение. Отправьте другое фото или введите "-" для пропуска.',
+                    reply_markup=get_cancel_keyboard(),
+                )
+                return
+            image_file_id, image_file_size = asset
         else:
             await bot.send_message(
                 chat_id=message.chat.id,
@@ -368,7 +401,9 @@ async def process_event_image(message: types.Message, bot: Bot, state: FSMContex
                 reply_markup=get_cancel_keyboard(),
             )
             return
-        await state.update_data(image_file_id=image_file_id)
+        await state.update_data(
+            image_file_id=image_file_id, image_file_size=image_file_size
+        )
         img_text = "Загружено" if image_file_id else "Не загружено"
         await bot.send_message(
             chat_id=message.chat.id,
@@ -386,14 +421,17 @@ async def process_event_image(message: types.Message, bot: Bot, state: FSMContex
         await state.clear()
 
 
-@router.callback_query(lambda c: c.data in ["choice_yes", "choice_no"])
+@router.callback_query(BeerChoiceModeCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def process_beer_choice(
-    callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
+    callback_query: types.CallbackQuery,
+    callback_data: BeerChoiceModeCallback,
+    bot: Bot,
+    state: FSMContext,
 ):
     try:
         await callback_query.answer()
-        has_beer_choice = callback_query.data == "choice_yes"
+        has_beer_choice = callback_data.has_beer_choice
         await state.update_data(has_beer_choice=has_beer_choice)
         if has_beer_choice:
             await bot.edit_message_text(
@@ -483,112 +521,34 @@ async def finalize_event_creation(
             location_name=data.get("location_name"),
             description=data.get("description"),
             image_file_id=data.get("image_file_id"),
+            image_file_size=data.get("image_file_size"),
             has_beer_choice=has_beer_choice,
             beer_option_1=beer_option_1,
             beer_option_2=beer_option_2,
             created_by=int(message.from_user.id),
         )
-        async for session in get_async_session():
+        # Уведомление бармену ставится в очередь Celery диспетчером
+        # scheduled_jobs в момент начала события
+        event_start = pendulum.datetime(
+            year=event_data.event_date.year,
+            month=event_data.event_date.month,
+            day=event_data.event_date.day,
+            hour=event_data.event_time.hour,
+            minute=event_data.event_time.minute,
+            tz=settings.timezone,
+        )
+        async with session_scope() as session:
             try:
-                event = await EventRepository.create_event(session, event_data)
-                # Schedule one-time Celery task
-                event_start = pendulum.datetime(
-                    year=event.event_date.year,
-                    month=event.event_date.month,
-                    day=event.event_date.day,
-                    hour=event.event_time.hour,
-                    minute=event.event_time.minute,
-                    tz="Europe/Moscow",
-                )
-                logger.debug(
-                    f"event_start type: {type(event_start)}, value: {event_start}"
-                )
-                if not isinstance(event_start, pendulum.DateTime):
-                    raise ValueError(
-                        f"event_start is not a pendulum.DateTime: {type(event_start)}"
-                    )
-                task_id = None
-                try:
-                    # Primary method: manual datetime construction
-                    eta = datetime(
-                        year=event_start.year,
-                        month=event_start.month,
-                        day=event_start.day,
-                        hour=event_start.hour,
-                        minute=event_start.minute,
-                        tzinfo=event_start.tzinfo,
-                    )
-                    if not isinstance(eta, datetime):
-                        raise ValueError(f"eta is not a datetime object: {type(eta)}")
-                    task = celery_app.send_task(
-                        "bot.tasks.bartender_notification.process_event_notification",
-                        args=(event.id,),
-                        eta=eta,
-                    )
-                    task_id = task.id
-                    logger.info(
-                        f"Scheduled Celery task {task_id} for event {event.id} at {eta}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to schedule task (primary) for event {event.id}: {e}",
-                        exc_info=True,
-                    )
-                    # Fallback: try to_pydatetime()
-                    try:
-                        eta = event_start.to_pydatetime()
-                        task = celery_app.send_task(
-                            "bot.tasks.bartender_notification.process_event_notification",
-                            args=(event.id,),
-                            eta=eta,
-                        )
-                        task_id = task.id
-                        logger.info(
-                            f"Scheduled Celery task (to_pydatetime fallback) {task_id} for event {event.id} at {eta}"
-                        )
-                    except Exception as e2:
-                        logger.error(
-                            f"Fallback scheduling (to_pydatetime) failed for event {event.id}: {e2}",
-                            exc_info=True,
-                        )
-                        await bot.send_message(
-                            chat_id=message.chat.id,
-                            text="⚠️ Событие создано, но уведомление бармену не запланировано. Свяжитесь с администратором.",
-                        )
-                        await state.clear()
-                        return
-                # Save task_id to event
-                if task_id:
-                    stmt = (
-                        update(Event)
-                        .where(Event.id == event.id)
-                        .values(celery_task_id=task_id)
-                    )
-                    await session.execute(stmt)
-                    await session.commit()
-                    logger.info(f"Saved Celery task ID {task_id} for event {event.id}")
-                summary = f"🎉 Событие создано!\n\n"
-                summary += f"📝 Название: {event.name}\n"
-                summary += f"📅 Дата: {event.event_date.strftime('%d.%m.%Y')}\n"
-                summary += f"🕐 Время: {event.event_time.strftime('%H:%M')}\n"
-                summary += f"📍 Место: {event.location_name or 'Не указано'}\n"
-                summary += f"📖 Описание: {event.description or 'Не указано'}\n"
-                summary += (
-                    f"🖼️ Изображение: {'Есть' if event.image_file_id else 'Нет'}\n"
+                event = await EventRepository.create_event(
+                    session,
+                    event_data,
+                    notify_task=BARTENDER_NOTIFICATION_TASK,
+                    notify_at=event_start,
                 )
-                summary += (
-                    f"🍺 Выбор пива: {'Да' if event.has_beer_choice else 'Нет'}\n"
+                logger.info(
+                    f"Scheduled bartender notification for event {event.id} at {event_start}"
                 )
-                if (
-                    event.has_beer_choice
-                    and event.beer_option_1
-                    and event.beer_option_2
-                ):
-                    summary += (
-                        f"🍻 Варианты: {event.beer_option_1}, {event.beer_option_2}\n"
-                    )
-                elif not event.has_beer_choice:
-                    summary += f"🍺 Пиво: Лагер\n"
+                summary = render_event(event, SUMMARY)
                 await bot.send_message(chat_id=message.chat.id, text=summary)
                 await send_event_notifications(bot, event)
                 logger.info(f"Event created: {event.id} by {message.from_user.id}")
@@ -627,59 +587,41 @@ async def finalize_event_creation(
 
 async def send_event_notifications(bot: Bot, event):
     try:
-        async for session in get_async_session():
+        # Соединение возвращается в пул до рассылки, а не держится всё её время
+        async with session_scope() as session:
             users = await UserRepository.get_all_users(session, limit=1000)
-            notification_text = f"🎉 Новое событие!\n\n"
-            notification_text += f"📝 {event.name}\n"
-            notification_text += f"📅 {event.event_date.strftime('%d.%m.%Y')}\n"
-            notification_text += f"🕐 {event.event_time.strftime('%H:%M')}\n"
-            if event.location_name:
-                notification_text += f"📍 {event.location_name}\n"
-            if event.description:
-                notification_text += f"📖 {event.description}\n"
-            if event.has_beer_choice:
-                notification_text += (
-                    f"🍻 Варианты пива: {event.beer_option_1}, {event.beer_option_2}\n"
+        broadcast = PhotoBroadcast(
+            event.image_file_id, render_event(event, NOTIFICATION)
+        )
+        successful_sends = 0
+        failed_sends = 0
+        # Не превышаем лимит Telegram на массовую отправку сообщений
+        send_interval = 1 / settings.broadcast_rate_limit
+        for user in users:
+            try:
+                await broadcast.send(
+                    bot, user.telegram_id, reply_markup=get_notification_keyboard()
                 )
-            else:
-                notification_text += f"🍺 Пиво: Лагер\n"
-            notification_text += "\nУвидимся на событии! 🎊"
-            successful_sends = 0
-            failed_sends = 0
-            for user in users:
-                try:
-                    if event.image_file_id:
-                        await bot.send_photo(
-                            chat_id=user.telegram_id,
-                            photo=event.image_file_id,
-                            caption=notification_text,
-                            reply_markup=get_notification_keyboard(),
-                        )
-                    else:
-                        await bot.send_message(
-                            chat_id=user.telegram_id,
-                            text=notification_text,
-                            reply_markup=get_notification_keyboard(),
-                        )
-                    successful_sends += 1
-                except TelegramAPIError as e:
-                    logger.warning(
-                        f"Failed to send notification to user {user.telegram_id}: {e}"
-                    )
-                    failed_sends += 1
-                except Exception as e:
-                    logger.error(
-                        f"Unexpected error sending notification to user {user.telegram_id}: {e}"
-                    )
-                    failed_sends += 1
-            logger.info(
-                f"Event notifications sent: {successful_sends} successful, {failed_sends} failed"
-            )
+                successful_sends += 1
+            except TelegramAPIError as e:
+                logger.warning(
+                    f"Failed to send notification to user {user.telegram_id}: {e}"
+                )
+                failed_sends += 1
+            except Exception as e:
+                logger.error(
+                    f"Unexpected error sending notification to user {user.telegram_id}: {e}"
+                )
+                failed_sends += 1
+            await asyncio.sleep(send_interval)
+        logger.info(
+            f"Event notifications sent: {successful_sends} successful, {failed_sends} failed"
+        )
     except Exception as e:
         logger.error(f"Error sending event notifications: {e}", exc_info=True)
 
 
-@router.callback_query(lambda c: c.data == "cancel_event_creation")
+@router.callback_query(CancelEventCreationCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def cancel_event_creation(
     callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
@@ -1,22 +1,28 @@
-from aiogram import Router, types, Bot
+from aiogram import types, Bot
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.event_repo import EventRepository
+from bot.utils.callbacks import (
+    CallbackRouter,
+    DeleteEventCallback,
+    EventsPageCallback,
+    LEGACY_NEXT_PAGE,
+    LEGACY_PREV_PAGE,
+    legacy_event_id,
+)
 from bot.utils.decorators import private_chat_only
+from bot.utils.keyboards import event_list_keyboards
 from bot.utils.logger import setup_logger
+from bot.utils.rendering import render_events_page
 from bot.handlers.event_creation import get_cancel_keyboard
 import pendulum
-import os
 
 logger = setup_logger(__name__)
-router = Router()
-ADMIN_TELEGRAM_ID = os.getenv("ADMIN_TELEGRAM_ID")
-if not ADMIN_TELEGRAM_ID:
-    raise ValueError("ADMIN_TELEGRAM_ID is not set in environment variables")
-ADMIN_TELEGRAM_ID = int(ADMIN_TELEGRAM_ID)
+router = CallbackRouter()
 EVENTS_PER_PAGE = 5
 
 
@@ -25,12 +31,25 @@ class EventListStates(StatesGroup):
 
 
 def get_events_keyboard(events, current_page, total_events):
+    return event_list_keyboards.get_or_build(
+        (
+            "events",
+            current_page,
+            total_events,
+            tuple(event.id for event in events),
+        ),
+        None,
+        lambda: _build_events_keyboard(events, current_page, total_events),
+    )
+
+
+def _build_events_keyboard(events, current_page, total_events):
     builder = InlineKeyboardBuilder()
     for event in events:
         builder.add(
             types.InlineKeyboardButton(
                 text=f"🗑️ Удалить ID {event.id}",
-                callback_data=f"delete_event_{event.id}",
+                callback_data=DeleteEventCallback(event_id=event.id).pack(),
             )
         )
     total_pages = (total_events + EVENTS_PER_PAGE - 1) // EVENTS_PER_PAGE
@@ -38,13 +57,15 @@ def get_events_keyboard(events, current_page, total_events):
         if current_page > 0:
             builder.add(
                 types.InlineKeyboardButton(
-                    text="⬅️ Назад", callback_data=f"prev_page_{current_page}"
+                    text="⬅️ Назад",
+                    callback_data=EventsPageCallback(page=current_page - 1).pack(),
                 )
             )
         if current_page < total_pages - 1:
             builder.add(
                 types.InlineKeyboardButton(
-                    text="➡️ Вперед", callback_data=f"next_page_{current_page}"
+                    text="➡️ Вперед",
+                    callback_data=EventsPageCallback(page=current_page + 1).pack(),
                 )
             )
     # builder.adjust(1, 2 if total_pages > 1 else 1)
@@ -55,8 +76,8 @@ def get_events_keyboard(events, current_page, total_events):
 async def send_events_list(
     message: types.Message, bot: Bot, state: FSMContext, page: int = 0
 ):
-    async for session in get_async_session():
-        today = pendulum.now("Europe/Moscow").date()
+    async with session_scope() as session:
+        today = pendulum.now(settings.timezone).date()
         offset = page * EVENTS_PER_PAGE
         events = await EventRepository.get_all_events(
             session,
@@ -77,23 +98,9 @@ async def send_events_list(
             )
             await state.clear()
             return
-        response = f"📅 Список предстоящих событий (страница {page + 1} из {(total_events + EVENTS_PER_PAGE - 1) // EVENTS_PER_PAGE}):\n\n"
-        for event in events:
-            response += f"🆔 ID: {event.id}\n"
-            response += f"📝 Название: {event.name}\n"
-            response += f"📅 Дата: {event.event_date.strftime('%d.%m.%Y')}\n"
-            response += f"🕐 Время: {event.event_time.strftime('%H:%M')}\n"
-            response += f"📍 Место: {event.location_name or 'Не указано'}\n"
-            response += f"📖 Описание: {event.description or 'Не указано'}\n"
-            response += f"🖼️ Изображение: {'Есть' if event.image_file_id else 'Нет'}\n"
-            response += f"🍺 Выбор пива: {'Да' if event.has_beer_choice else 'Нет'}\n"
-            if event.has_beer_choice and event.beer_option_1 and event.beer_option_2:
-                response += (
-                    f"🍻 Варианты: {event.beer_option_1}, {event.beer_option_2}\n"
-                )
-            elif not event.has_beer_choice:
-                response += f"🍺 Пиво: Лагер\n"
-            response += "─" * 30 + "\n"
+        response = render_events_page(
+            events, page, (total_events + EVENTS_PER_PAGE - 1) // EVENTS_PER_PAGE
+        )
         keyboard = get_events_keyboard(events, page, total_events)
         await bot.send_message(
             chat_id=message.chat.id,
@@ -115,7 +122,7 @@ async def events_list_handler(message: types.Message, bot: Bot, state: FSMContex
                 text="❌ Команда доступна только в личных сообщениях.",
             )
             return
-        if message.from_user.id != ADMIN_TELEGRAM_ID:
+        if message.from_user.id != settings.admin_telegram_id:
             await bot.send_message(
                 chat_id=message.chat.id,
                 text="❌ У вас нет прав для просмотра списка событий.",
@@ -131,24 +138,21 @@ async def events_list_handler(message: types.Message, bot: Bot, state: FSMContex
         await state.clear()
 
 
-@router.callback_query(
-    lambda c: c.data.startswith("next_page_") or c.data.startswith("prev_page_")
-)
+@router.callback_query(EventsPageCallback.filter())
+@router.callback_query(LEGACY_NEXT_PAGE)
+@router.callback_query(LEGACY_PREV_PAGE)
 @private_chat_only(response_probability=0.5)
 async def handle_pagination(
-    callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
+    callback_query: types.CallbackQuery,
+    callback_data: EventsPageCallback,
+    bot: Bot,
+    state: FSMContext,
 ):
     try:
         await callback_query.answer()
-        data = await state.get_data()
-        current_page = data.get("current_page", 0)
-        action, page_str, page = callback_query.data.split("_")
-        page = int(page)
-        new_page = page + 1 if action == "next" else page - 1
-        if new_page < 0:
-            return
-        async for session in get_async_session():
-            today = pendulum.now("Europe/Moscow").date()
+        new_page = callback_data.page
+        async with session_scope() as session:
+            today = pendulum.now(settings.timezone).date()
             total_events = len(
                 await EventRepository.get_all_events(
                     session, upcoming_only=True, date_from=today
@@ -165,31 +169,7 @@ async def handle_pagination(
                 upcoming_only=True,
                 date_from=today,
             )
-            response = f"📅 Список предстоящих событий (страница {new_page + 1} из {total_pages}):\n\n"
-            for event in events:
-                response += f"🆔 ID: {event.id}\n"
-                response += f"📝 Название: {event.name}\n"
-                response += f"📅 Дата: {event.event_date.strftime('%d.%m.%Y')}\n"
-                response += f"🕐 Время: {event.event_time.strftime('%H:%M')}\n"
-                response += f"📍 Место: {event.location_name or 'Не указано'}\n"
-                response += f"📖 Описание: {event.description or 'Не указано'}\n"
-                response += (
-                    f"🖼️ Изображение: {'Есть' if event.image_file_id else 'Нет'}\n"
-                )
-                response += (
-                    f"🍺 Выбор пива: {'Да' if event.has_beer_choice else 'Нет'}\n"
-                )
-                if (
-                    event.has_beer_choice
-                    and event.beer_option_1
-                    and event.beer_option_2
-                ):
-                    response += (
-                        f"🍻 Варианты: {event.beer_option_1}, {event.beer_option_2}\n"
-                    )
-                elif not event.has_beer_choice:
-                    response += f"🍺 Пиво: Лагер\n"
-                response += "─" * 30 + "\n"
+            response = render_events_page(events, new_page, total_pages)
             keyboard = get_events_keyboard(events, new_page, total_events)
             await bot.edit_message_text(
                 chat_id=callback_query.message.chat.id,
@@ -211,22 +191,26 @@ async def handle_pagination(
         await state.clear()
 
 
-@router.callback_query(lambda c: c.data.startswith("delete_event_"))
+@router.callback_query(DeleteEventCallback.filter())
+@router.callback_query(legacy_event_id("delete_event_", DeleteEventCallback))
 @private_chat_only(response_probability=0.5)
 async def initiate_delete_event(
-    callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
+    callback_query: types.CallbackQuery,
+    callback_data: DeleteEventCallback,
+    bot: Bot,
+    state: FSMContext,
 ):
     try:
         await callback_query.answer()
-        event_id = int(callback_query.data.split("_")[2])
-        if callback_query.from_user.id != ADMIN_TELEGRAM_ID:
+        event_id = callback_data.event_id
+        if callback_query.from_user.id != settings.admin_telegram_id:
             await bot.edit_message_text(
                 chat_id=callback_query.message.chat.id,
                 message_id=callback_query.message.message_id,
                 text="❌ У вас нет прав для удаления событий.",
             )
             return
-        async for session in get_async_session():
+        async with session_scope() as session:
             event = await EventRepository.get_event_by_id(session, event_id)
             if not event:
                 await bot.edit_message_text(
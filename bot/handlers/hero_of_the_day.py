@@ -1,7 +1,18 @@
 from aiogram import Router, types, Bot
-from aiogram.filters import Command
-from bot.core.database import get_async_session
+from aiogram.filters import Command, CommandObject
+from bot.core.config import settings
+from bot.core.database import session_scope
+from bot.core.models import User
 from bot.repositories.group_user_repo import GroupUserRepository
+from bot.utils.cache import (
+    cache_get,
+    cache_set,
+    seconds_until_midnight,
+    HERO_TODAY_CACHE_KEY,
+    HERO_TOP_CACHE_KEY,
+    HERO_TOP_CACHE_TTL,
+)
+from bot.utils.daily_schedule import resolve_timezone
 from bot.utils.decorators import group_chat_only
 from bot.utils.logger import setup_logger
 from bot.utils.messages import (
@@ -21,9 +32,23 @@ from bot.utils.messages import (
     HERO_TOP_MESSAGE,
     HERO_TOP_NO_HEROES_MESSAGE,
     HERO_TOP_ERROR_MESSAGE,
+    ENROLL_HEROES_NOT_ADMIN_MESSAGE,
+    ENROLL_HEROES_NOBODY_MESSAGE,
+    ENROLL_HEROES_RESULT_MESSAGE,
+    ENROLL_HEROES_INCOMPLETE_MESSAGE,
+    ENROLL_HEROES_UNRESOLVED_MESSAGE,
+    ENROLL_HEROES_ERROR_MESSAGE,
+    HERO_SCHEDULE_NOT_ADMIN_MESSAGE,
+    HERO_SCHEDULE_USAGE_MESSAGE,
+    HERO_SCHEDULE_UPDATED_MESSAGE,
+    HERO_SCHEDULE_DEFAULT,
+    HERO_SCHEDULE_ERROR_MESSAGE,
 )
 import pendulum
 import asyncio
+import re
+from datetime import datetime, time
+from typing import List, Optional, Tuple
 
 logger = setup_logger(__name__)
 router = Router()
@@ -37,7 +62,7 @@ async def hero_command_handler(message: types.Message, bot: Bot):
         chat_title = message.chat.title or f"Group {chat_id}"
 
         # Регистрируем группу
-        async for session in get_async_session():
+        async with session_scope() as session:
             group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
             if not group:
                 logger.info(
@@ -68,19 +93,37 @@ async def hero_command_handler(message: types.Message, bot: Bot):
 async def hero_today_handler(message: types.Message, bot: Bot):
     try:
         chat_id = message.chat.id
+        async with session_scope() as session:
+            group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
+            if not group:
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=BECOME_HERO_GROUP_NOT_REGISTERED,
+                )
+                return
 
-        async for session in get_async_session():
-            today = pendulum.now("Europe/Moscow").date()
-            hero = await GroupUserRepository.get_hero_of_the_day(
+            # Дата и срок жизни кэша — по часовому поясу группы, как у выбора героя
+            tz = resolve_timezone(group.timezone, settings.timezone)
+            today = pendulum.now(tz).date()
+            cache_key = HERO_TODAY_CACHE_KEY.format(chat_id=chat_id, date=today)
+            hero_name = await cache_get(cache_key)
+            if hero_name:
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=HERO_COMMAND_SUCCESS_MESSAGE.format(username=hero_name),
+                )
+                return
+
+            hero_with_user = await GroupUserRepository.get_hero_of_the_day_with_user(
                 session, chat_id, today
             )
-            if hero:
-                user = await GroupUserRepository.get_user_by_id(session, hero.user_id)
+            if hero_with_user:
+                _, user = hero_with_user
+                hero_name = user.username or user.name
+                await cache_set(cache_key, hero_name, seconds_until_midnight(tz))
                 await bot.send_message(
                     chat_id=chat_id,
-                    text=HERO_COMMAND_SUCCESS_MESSAGE.format(
-                        username=user.username or user.name
-                    ),
+                    text=HERO_COMMAND_SUCCESS_MESSAGE.format(username=hero_name),
                 )
             else:
                 await bot.send_message(
@@ -104,21 +147,12 @@ async def become_hero_handler(message: types.Message, bot: Bot):
         username = message.from_user.username
         name = message.from_user.first_name or f"User {telegram_id}"
 
-        async for session in get_async_session():
-            # Проверяем группу
-            group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
-            if not group:
-                await bot.send_message(
-                    chat_id=chat_id,
-                    text=BECOME_HERO_GROUP_NOT_REGISTERED,
-                )
-                return
-
+        async with session_scope() as session:
             # Проверяем, есть ли пользователь в users и завершена ли регистрация
             user = await GroupUserRepository.get_user_by_telegram_id(
                 session, telegram_id
             )
-            if not user or not user.name or not user.birth_date:
+            if not user or not is_registration_complete(user):
                 bot_info = await bot.get_me()
                 bot_username = f"@{bot_info.username}"
                 deep_link = f"t.me/{bot_username}?start=group_{chat_id}"
@@ -140,10 +174,16 @@ async def become_hero_handler(message: types.Message, bot: Bot):
                 )
                 return
 
-            # Регистрируем пользователя как кандидата
+            # Регистрируем пользователя как кандидата, если группа зарегистрирована
             is_new = await GroupUserRepository.register_candidate(
-                session, chat_id, user.id, telegram_id, username
+                session, chat_id, user.id
             )
+            if is_new is None:
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=BECOME_HERO_GROUP_NOT_REGISTERED,
+                )
+                return
             if is_new:
                 await bot.send_message(
                     chat_id=chat_id,
@@ -170,7 +210,13 @@ async def become_hero_handler(message: types.Message, bot: Bot):
 async def hero_top_handler(message: types.Message, bot: Bot):
     try:
         chat_id = message.chat.id
-        async for session in get_async_session():
+        cache_key = HERO_TOP_CACHE_KEY.format(chat_id=chat_id)
+        cached_text = await cache_get(cache_key)
+        if cached_text:
+            await bot.send_message(chat_id=chat_id, text=cached_text)
+            logger.debug(f"Displayed cached top-10 heroes for group {chat_id}")
+            return
+        async with session_scope() as session:
             group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
             if not group:
                 await bot.send_message(
@@ -189,9 +235,12 @@ async def hero_top_handler(message: types.Message, bot: Bot):
                 f"{i+1}. @{row['username'] or row['name']} - {row['hero_count']} раз(а)"
                 for i, row in enumerate(top_heroes)
             )
+            top_text = HERO_TOP_MESSAGE.format(top_list=top_list)
+            # Рейтинг меняется только при выборе героя, который сбрасывает кэш
+            await cache_set(cache_key, top_text, HERO_TOP_CACHE_TTL)
             await bot.send_message(
                 chat_id=chat_id,
-                text=HERO_TOP_MESSAGE.format(top_list=top_list),
+                text=top_text,
             )
             logger.info(f"Displayed top-10 heroes for group {chat_id}")
     except Exception as e:
@@ -200,3 +249,184 @@ async def hero_top_handler(message: types.Message, bot: Bot):
             chat_id=chat_id,
             text=HERO_TOP_ERROR_MESSAGE,
         )
+
+
+def parse_enroll_arguments(text: str) -> Tuple[List[int], List[str]]:
+    """Разбирает аргументы команды на Telegram ID и username без повторов."""
+    telegram_ids, usernames = {}, {}
+    for token in re.split(r"[\s,]+", text.strip()):
+        token = token.lstrip("@")
+        if not token:
+            continue
+        if token.isdigit():
+            telegram_ids.setdefault(int(token))
+        else:
+            # Username в Telegram не зависит от регистра
+            usernames.setdefault(token.lower(), token)
+    return list(telegram_ids), list(usernames.values())
+
+
+def is_registration_complete(user: User) -> bool:
+    """Кандидатом может стать только пользователь, указавший имя и дату рождения."""
+    return bool(user.name and user.birth_date)
+
+
+def unresolved_identifiers(
+    telegram_ids: List[int], usernames: List[str], users: List[User]
+) -> List[str]:
+    """Идентификаторы из списка, которым не нашёлся пользователь."""
+    known_ids = {user.telegram_id for user in users}
+    known_usernames = {user.username.lower() for user in users if user.username}
+    return [str(i) for i in telegram_ids if i not in known_ids] + [
+        f"@{name}" for name in usernames if name.lower() not in known_usernames
+    ]
+
+
+@router.message(Command("enroll_heroes"))
+@group_chat_only(response_probability=1.0)
+async def enroll_heroes_handler(
+    message: types.Message, bot: Bot, command: CommandObject
+):
+    try:
+        chat_id = message.chat.id
+        member = await bot.get_chat_member(chat_id, message.from_user.id)
+        if member.status not in ("creator", "administrator"):
+            await bot.send_message(
+                chat_id=chat_id,
+                text=ENROLL_HEROES_NOT_ADMIN_MESSAGE,
+            )
+            return
+
+        if command.args:
+            telegram_ids, usernames = parse_enroll_arguments(command.args)
+        else:
+            admins = await bot.get_chat_administrators(chat_id)
+            telegram_ids = [admin.user.id for admin in admins if not admin.user.is_bot]
+            usernames = []
+        requested = len(telegram_ids) + len(usernames)
+        if not requested:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=ENROLL_HEROES_NOBODY_MESSAGE,
+            )
+            return
+
+        async with session_scope() as session:
+            group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
+            if not group:
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=BECOME_HERO_GROUP_NOT_REGISTERED,
+                )
+                return
+            users = await GroupUserRepository.get_users_by_identifiers(
+                session, telegram_ids, usernames
+            )
+            # ID и username одного человека дают одного пользователя
+            users = list({user.id: user for user in users}.values())
+            incomplete = [user for user in users if not is_registration_complete(user)]
+            user_ids = [user.id for user in users if is_registration_complete(user)]
+            added = await GroupUserRepository.add_candidates(
+                session, group.id, user_ids
+            )
+            unresolved = unresolved_identifiers(telegram_ids, usernames, users)
+            text = ENROLL_HEROES_RESULT_MESSAGE.format(
+                requested=requested,
+                added=added,
+                existing=len(user_ids) - added,
+                incomplete=len(incomplete),
+                missing=len(unresolved),
+            )
+            if incomplete:
+                text += ENROLL_HEROES_INCOMPLETE_MESSAGE.format(
+                    users=", ".join(
+                        f"@{user.username}" if user.username else str(user.telegram_id)
+                        for user in incomplete
+                    )
+                )
+            if unresolved:
+                text += ENROLL_HEROES_UNRESOLVED_MESSAGE.format(
+                    identifiers=", ".join(unresolved)
+                )
+            await bot.send_message(chat_id=chat_id, text=text)
+            logger.info(
+                f"Bulk enrolment in group {chat_id}: {added} added of {requested} requested"
+            )
+    except Exception as e:
+        logger.error(f"Error in enroll_heroes handler: {e}", exc_info=True)
+        await bot.send_message(
+            chat_id=chat_id,
+            text=ENROLL_HEROES_ERROR_MESSAGE,
+        )
+
+
+def parse_hero_schedule(text: str) -> Tuple[Optional[time], Optional[str]]:
+    """Разбирает «ЧЧ:ММ [часовой пояс]»; «-» означает значение по умолчанию.
+
+    Бросает ValueError при неверном времени или неизвестном часовом поясе.
+    """
+    tokens = text.split()
+    if not 1 <= len(tokens) <= 2:
+        raise ValueError("Expected time and optional timezone")
+    hero_time = None
+    if tokens[0] != "-":
+        hero_time = datetime.strptime(tokens[0], "%H:%M").time()
+    timezone = tokens[1] if len(tokens) == 2 and tokens[1] != "-" else None
+    if timezone is not None:
+        try:
+            pendulum.timezone(timezone)
+        except Exception:
+            raise ValueError(f"Unknown timezone {timezone!r}")
+    return hero_time, timezone
+
+
+@router.message(Command("hero_schedule"))
+@group_chat_only(response_probability=1.0)
+async def hero_schedule_handler(
+    message: types.Message, bot: Bot, command: CommandObject
+):
+    try:
+        chat_id = message.chat.id
+        member = await bot.get_chat_member(chat_id, message.from_user.id)
+        if member.status not in ("creator", "administrator"):
+            await bot.send_message(
+                chat_id=chat_id,
+                text=HERO_SCHEDULE_NOT_ADMIN_MESSAGE,
+            )
+            return
+
+        try:
+            hero_time, timezone = parse_hero_schedule(command.args or "")
+        except ValueError:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=HERO_SCHEDULE_USAGE_MESSAGE,
+            )
+            return
+
+        async with session_scope() as session:
+            updated = await GroupUserRepository.update_group_schedule(
+                session, chat_id, hero_time, timezone
+            )
+        if not updated:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=BECOME_HERO_GROUP_NOT_REGISTERED,
+            )
+            return
+        await bot.send_message(
+            chat_id=chat_id,
+            text=HERO_SCHEDULE_UPDATED_MESSAGE.format(
+                hero_time=(
+                    hero_time.strftime("%H:%M") if hero_time else HERO_SCHEDULE_DEFAULT
+                ),
+                timezone=timezone or settings.timezone,
+            ),
+        )
+        logger.info(f"Hero schedule of group {chat_id} set to {hero_time} {timezone}")
+    except Exception as e:
+        logger.error(f"Error in hero_schedule handler: {e}", exc_info=True)
+        await bot.send_message(
+            chat_id=chat_id,
+            text=HERO_SCHEDULE_ERROR_MESSAGE,
+        )
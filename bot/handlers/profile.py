@@ -1,24 +1,37 @@
-from aiogram import Router, types, Bot
+from aiogram import types, Bot
 from aiogram.filters import Command
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.user_repo import UserRepository
 from bot.repositories.beer_repo import BeerRepository
+from bot.utils.callbacks import (
+    CallbackRouter,
+    BeerCallback,
+    ProfileCallback,
+    StartCallback,
+)
 from bot.utils.decorators import private_chat_only
+from bot.utils.keyboards import static_keyboard
 from bot.utils.logger import setup_logger
 import pendulum
 
 logger = setup_logger(__name__)
-router = Router()
+router = CallbackRouter()
 
 
+@static_keyboard
 def get_command_keyboard():
     builder = InlineKeyboardBuilder()
     builder.add(
-        types.InlineKeyboardButton(text="🍺 Выбрать пиво", callback_data="cmd_beer")
+        types.InlineKeyboardButton(
+            text="🍺 Выбрать пиво", callback_data=BeerCallback().pack()
+        )
     )
     builder.add(
-        types.InlineKeyboardButton(text="🏠 В начало", callback_data="cmd_start")
+        types.InlineKeyboardButton(
+            text="🏠 В начало", callback_data=StartCallback().pack()
+        )
     )
     builder.adjust(2)
     return builder.as_markup()
@@ -28,7 +41,7 @@ def get_command_keyboard():
 @private_chat_only(response_probability=0.5)
 async def profile_handler(message: types.Message, bot: Bot):
     try:
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, message.from_user.id
             )
@@ -39,7 +52,7 @@ async def profile_handler(message: types.Message, bot: Bot):
                     reply_markup=get_command_keyboard(),
                 )
                 return
-            today = pendulum.now("Europe/Moscow").date()
+            today = pendulum.now(settings.timezone).date()
             age = (
                 today.year
                 - user.birth_date.year
@@ -62,7 +75,7 @@ async def profile_handler(message: types.Message, bot: Bot):
             profile_text += (
                 f"📪 Username: @{user.username if user.username else 'не указан'}\n"
             )
-            profile_text += f"📅 Дата регистрации: {pendulum.instance(user.created_at).in_timezone('Europe/Moscow').strftime('%d.%m.%Y %H:%M')}\n\n"
+            profile_text += f"📅 Дата регистрации: {pendulum.instance(user.created_at).in_timezone(settings.timezone).strftime('%d.%m.%Y %H:%M')}\n\n"
             profile_text += "🍺 **Твои выборы пива**:\n"
             if user_stats:
                 for beer_choice, count in user_stats.items():
@@ -71,7 +84,7 @@ async def profile_handler(message: types.Message, bot: Bot):
                 profile_text += "Ты еще не выбирал пиво!\n"
             if latest_choice:
                 profile_text += f"\n⏰ Последний выбор: 🍺 {latest_choice.beer_choice} "
-                profile_text += f"({pendulum.instance(latest_choice.selected_at).in_timezone('Europe/Moscow').strftime('%d.%m.%Y %H:%M')})\n"
+                profile_text += f"({pendulum.instance(latest_choice.selected_at).in_timezone(settings.timezone).strftime('%d.%m.%Y %H:%M')})\n"
             profile_text += "\nВыбери действие:"
             logger.info(
                 f"Profile handler fetched stats for user {user.telegram_id}: {user_stats}, latest choice: {latest_choice}"
@@ -91,12 +104,12 @@ async def profile_handler(message: types.Message, bot: Bot):
         )
 
 
-@router.callback_query(lambda c: c.data == "cmd_profile")
+@router.callback_query(ProfileCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def cmd_profile_callback(callback_query: types.CallbackQuery, bot: Bot):
     try:
         await callback_query.answer()
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, callback_query.from_user.id
             )
@@ -108,7 +121,7 @@ async def cmd_profile_callback(callback_query: types.CallbackQuery, bot: Bot):
                     reply_markup=get_command_keyboard(),
                 )
                 return
-            today = pendulum.now("Europe/Moscow").date()
+            today = pendulum.now(settings.timezone).date()
             age = (
                 today.year
                 - user.birth_date.year
@@ -131,7 +144,7 @@ async def cmd_profile_callback(callback_query: types.CallbackQuery, bot: Bot):
             profile_text += (
                 f"📪 Username: @{user.username if user.username else 'не указан'}\n"
             )
-            profile_text += f"📅 Дата регистрации: {pendulum.instance(user.created_at).in_timezone('Europe/Moscow').strftime('%d.%m.%Y %H:%M')}\n\n"
+            profile_text += f"📅 Дата регистрации: {pendulum.instance(user.created_at).in_timezone(settings.timezone).strftime('%d.%m.%Y %H:%M')}\n\n"
             profile_text += "🍺 **Твои выборы пива**:\n"
             if user_stats:
                 for beer_choice, count in user_stats.items():
@@ -140,7 +153,7 @@ async def cmd_profile_callback(callback_query: types.CallbackQuery, bot: Bot):
                 profile_text += "Ты еще не выбирал пиво!\n"
             if latest_choice:
                 profile_text += f"\n⏰ Последний выбор: 🍺 {latest_choice.beer_choice} "
-                profile_text += f"({pendulum.instance(latest_choice.selected_at).in_timezone('Europe/Moscow').strftime('%d.%m.%Y %H:%M')})\n"
+                profile_text += f"({pendulum.instance(latest_choice.selected_at).in_timezone(settings.timezone).strftime('%d.%m.%Y %H:%M')})\n"
             profile_text += "\nВыбери действие:"
             logger.info(
                 f"Profile callback fetched stats for user {user.telegram_id}: {user_stats}, latest choice: {latest_choice}"
@@ -1,20 +1,28 @@
-from aiogram import Router, types, Bot
+from aiogram import types, Bot
 from aiogram.filters import CommandStart, Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.beer_repo import BeerRepository
 from bot.repositories.user_repo import UserRepository
 from bot.repositories.group_user_repo import GroupUserRepository
 from bot.core.schemas import UserCreate
+from bot.utils.callbacks import (
+    CallbackRouter,
+    BeerCallback,
+    ProfileCallback,
+    StartCallback,
+)
 from bot.utils.decorators import private_chat_only
+from bot.utils.keyboards import static_keyboard
 from bot.utils.logger import setup_logger
 import pendulum
 import re
 
 logger = setup_logger(__name__)
-router = Router()
+router = CallbackRouter()
 
 
 class RegistrationStates(StatesGroup):
@@ -22,13 +30,18 @@ class RegistrationStates(StatesGroup):
     waiting_for_birth_date = State()
 
 
+@static_keyboard
 def get_command_keyboard():
     builder = InlineKeyboardBuilder()
     builder.add(
-        types.InlineKeyboardButton(text="🍺 Выбрать пиво", callback_data="cmd_beer")
+        types.InlineKeyboardButton(
+            text="🍺 Выбрать пиво", callback_data=BeerCallback().pack()
+        )
     )
     builder.add(
-        types.InlineKeyboardButton(text="👤 Профиль", callback_data="cmd_profile")
+        types.InlineKeyboardButton(
+            text="👤 Профиль", callback_data=ProfileCallback().pack()
+        )
     )
     builder.adjust(2)
     return builder.as_markup()
@@ -50,28 +63,23 @@ async def start_handler(message: types.Message, bot: Bot, state: FSMContext):
             chat_id = int(deep_link_param.replace("group_", ""))
             await state.update_data(group_chat_id=chat_id)
 
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(session, telegram_id)
             if (
                 user and user.name and user.birth_date
             ):  # Пользователь полностью зарегистрирован
                 if chat_id:
-                    # Проверяем группу
-                    group = await GroupUserRepository.get_group_by_chat_id(
-                        session, chat_id
+                    # Регистрируем как кандидата, если группа зарегистрирована
+                    is_new_candidate = await GroupUserRepository.register_candidate(
+                        session, chat_id, user.id
                     )
-                    if not group:
+                    if is_new_candidate is None:
                         await bot.send_message(
                             chat_id=telegram_id,
                             text="❌ Группа не найдена. Попросите администратора зарегистрировать группу с помощью /hero.",
                             reply_markup=get_command_keyboard(),
                         )
                         return
-
-                    # Регистрируем как кандидата
-                    is_new_candidate = await GroupUserRepository.register_candidate(
-                        session, telegram_id, chat_id, user.name, username
-                    )
                     if is_new_candidate:
                         await bot.send_message(
                             chat_id=telegram_id,
@@ -118,7 +126,7 @@ async def start_handler(message: types.Message, bot: Bot, state: FSMContext):
         )
 
 
-@router.callback_query(lambda c: c.data == "cmd_start")
+@router.callback_query(StartCallback.filter())
 @private_chat_only(response_probability=0.5)
 async def cmd_start_callback(
     callback_query: types.CallbackQuery, bot: Bot, state: FSMContext
@@ -126,7 +134,7 @@ async def cmd_start_callback(
     try:
         await callback_query.answer()
         await state.clear()
-        async for session in get_async_session():
+        async with session_scope() as session:
             user = await UserRepository.get_user_by_telegram_id(
                 session, callback_query.from_user.id
             )
@@ -180,9 +188,9 @@ async def process_birth_date(message: types.Message, state: FSMContext):
     try:
         date_str = message.text.strip()
         birth_date = pendulum.from_format(
-            date_str, "DD.MM.YYYY", tz="Europe/Moscow"
+            date_str, "DD.MM.YYYY", tz=settings.timezone
         ).date()
-        today = pendulum.now("Europe/Moscow").date()
+        today = pendulum.now(settings.timezone).date()
         age = (
             today.year
             - birth_date.year
@@ -201,7 +209,7 @@ async def process_birth_date(message: types.Message, state: FSMContext):
             )
             return
         user_data = await state.get_data()
-        async for session in get_async_session():
+        async with session_scope() as session:
             user_create = UserCreate(
                 telegram_id=message.from_user.id,
                 username=message.from_user.username,
@@ -213,11 +221,10 @@ async def process_birth_date(message: types.Message, state: FSMContext):
             # Проверяем, есть ли group_chat_id в состоянии
             chat_id = user_data.get("group_chat_id")
             if chat_id:
-                group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
-                if group:
-                    is_new_candidate = await GroupUserRepository.register_candidate(
-                        session, message.from_user.id, chat_id, user.name, user.username
-                    )
+                is_new_candidate = await GroupUserRepository.register_candidate(
+                    session, chat_id, user.id
+                )
+                if is_new_candidate is not None:
                     if is_new_candidate:
                         await message.bot.send_message(
                             chat_id=message.chat.id,
@@ -1,9 +1,12 @@
 from typing import List, Optional, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete, and_
+from sqlalchemy import select, insert, func, delete, and_, union_all, cast, BigInteger
 from sqlalchemy.orm import selectinload
-from bot.core.models import BeerChoice, Event
+from bot.core.database import replica_read
+from bot.core.models import BeerChoice, BeerChoiceMonthly, Event
+from bot.core.read_models import ChoiceRow
 from bot.core.schemas import BeerChoiceCreate
+from bot.repositories.statements import USER_HAS_CHOSEN
 from bot.utils.logger import setup_logger
 import pendulum
 from datetime import datetime, timedelta
@@ -11,16 +14,36 @@ from datetime import datetime, timedelta
 logger = setup_logger(__name__)
 
 
+def _choice_counts(user_id: Optional[int] = None):
+    """Число выборов по сортам: живые секции вместе со свёрнутыми месяцами."""
+    live = select(
+        BeerChoice.beer_choice.label("beer"), func.count(BeerChoice.id).label("count")
+    ).group_by(BeerChoice.beer_choice)
+    rolled_up = select(
+        BeerChoiceMonthly.beer, func.sum(BeerChoiceMonthly.count).label("count")
+    ).group_by(BeerChoiceMonthly.beer)
+    if user_id is not None:
+        live = live.where(BeerChoice.user_id == user_id)
+        rolled_up = rolled_up.where(BeerChoiceMonthly.user_id == user_id)
+    counts = union_all(live, rolled_up).subquery()
+    return select(
+        counts.c.beer, cast(func.sum(counts.c.count), BigInteger).label("count")
+    ).group_by(counts.c.beer)
+
+
 class BeerRepository:
     @staticmethod
     async def create_choice(
         session: AsyncSession, choice_data: BeerChoiceCreate
     ) -> BeerChoice:
         try:
-            choice = BeerChoice(**choice_data.model_dump())
-            session.add(choice)
+            stmt = (
+                insert(BeerChoice)
+                .values(**choice_data.model_dump())
+                .returning(BeerChoice)
+            )
+            choice = (await session.execute(stmt)).scalar_one()
             await session.commit()
-            await session.refresh(choice)
             return choice
         except Exception as e:
             logger.error(f"Error creating beer choice: {e}")
@@ -69,19 +92,10 @@ class BeerRepository:
         session: AsyncSession, user_id: int, event: Event
     ) -> bool:
         try:
-            stmt = (
-                select(BeerChoice)
-                .where(
-                    and_(
-                        BeerChoice.user_id == user_id,
-                        BeerChoice.event_id == event.id,
-                    )
-                )
-                .limit(1)
+            result = await session.execute(
+                USER_HAS_CHOSEN, {"user_id": user_id, "event_id": event.id}
             )
-            result = await session.execute(stmt)
-            choice = result.scalar_one_or_none()
-            return choice is not None
+            return result.scalar_one_or_none() is not None
         except Exception as e:
             logger.error(
                 f"Error checking user choice for event {event.id}, user_id {user_id}: {e}"
@@ -94,9 +108,9 @@ class BeerRepository:
         event: Event,
         window_start: datetime,
         window_end: datetime,
-    ) -> List[BeerChoice]:
+    ) -> List[ChoiceRow]:
         try:
-            stmt = select(BeerChoice).where(
+            stmt = select(BeerChoice.user_id, BeerChoice.beer_choice).where(
                 and_(
                     BeerChoice.event_id == event.id,
                     BeerChoice.selected_at >= window_start,
@@ -104,37 +118,30 @@ class BeerRepository:
                 )
             )
             result = await session.execute(stmt)
-            choices = result.scalars().all()
-            return list(choices)
+            return [ChoiceRow(*row) for row in result.all()]
         except Exception as e:
             logger.error(f"Error getting choices for event {event.id}: {e}")
             raise
 
     @staticmethod
+    @replica_read
     async def get_beer_stats(session: AsyncSession) -> Dict[str, int]:
         try:
-            stmt = select(
-                BeerChoice.beer_choice, func.count(BeerChoice.id).label("count")
-            ).group_by(BeerChoice.beer_choice)
-            result = await session.execute(stmt)
-            stats = {row.beer_choice: row.count for row in result}
+            result = await session.execute(_choice_counts())
+            stats = {row.beer: row.count for row in result}
             return stats
         except Exception as e:
             logger.error(f"Error getting beer stats: {e}")
             raise
 
     @staticmethod
+    @replica_read
     async def get_user_beer_stats(
         session: AsyncSession, user_id: int
     ) -> Dict[str, int]:
         try:
-            stmt = (
-                select(BeerChoice.beer_choice, func.count(BeerChoice.id).label("count"))
-                .where(BeerChoice.user_id == user_id)
-                .group_by(BeerChoice.beer_choice)
-            )
-            result = await session.execute(stmt)
-            stats = {row.beer_choice: row.count for row in result}
+            result = await session.execute(_choice_counts(user_id))
+            stats = {row.beer: row.count for row in result}
             return stats
         except Exception as e:
             logger.error(f"Error getting beer stats for user_id {user_id}: {e}")
@@ -164,6 +171,9 @@ class BeerRepository:
         try:
             stmt = delete(BeerChoice).where(BeerChoice.user_id == user_id)
             result = await session.execute(stmt)
+            await session.execute(
+                delete(BeerChoiceMonthly).where(BeerChoiceMonthly.user_id == user_id)
+            )
             await session.commit()
             deleted_count = result.rowcount
             return deleted_count if deleted_count is not None else 0
@@ -1,10 +1,16 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func
-from bot.core.models import Event
+from sqlalchemy import select, insert, delete, func
+from bot.core.database import replica_read
+from bot.core.models import Event, ScheduledJob
+from bot.core.read_models import EventSlot
 from bot.core.schemas import EventCreate
+from bot.repositories.statements import EVENT_BY_ID
+from bot.utils.geo import Venue, invalidate_venue_index
+from bot.utils.keyboards import invalidate_event_keyboards
+from bot.core.config import settings
 from bot.utils.logger import setup_logger
-from datetime import date
+from datetime import date, datetime
 import pendulum
 
 logger = setup_logger(__name__)
@@ -12,12 +18,32 @@ logger = setup_logger(__name__)
 
 class EventRepository:
     @staticmethod
-    async def create_event(session: AsyncSession, event_data: EventCreate) -> Event:
+    async def create_event(
+        session: AsyncSession,
+        event_data: EventCreate,
+        notify_task: Optional[str] = None,
+        notify_at: Optional[datetime] = None,
+    ) -> Event:
+        """Создаёт событие одним INSERT ... RETURNING.
+
+        С notify_task в той же транзакции планирует задание на notify_at
+        с id события в аргументах: событие и задание сохраняются вместе.
+        """
         try:
-            event = Event(**event_data.model_dump())
-            session.add(event)
+            stmt = insert(Event).values(**event_data.model_dump()).returning(Event)
+            event = (await session.execute(stmt)).scalar_one()
+            if notify_task:
+                await session.execute(
+                    insert(ScheduledJob).values(
+                        task_name=notify_task,
+                        args=[event.id],
+                        event_id=event.id,
+                        run_at=notify_at,
+                    )
+                )
             await session.commit()
-            await session.refresh(event)
+            invalidate_venue_index()
+            invalidate_event_keyboards(event.id)
             return event
         except Exception as e:
             logger.error(f"Error creating event: {e}")
@@ -27,8 +53,7 @@ class EventRepository:
     @staticmethod
     async def get_event_by_id(session: AsyncSession, event_id: int) -> Optional[Event]:
         try:
-            stmt = select(Event).where(Event.id == event_id)
-            result = await session.execute(stmt)
+            result = await session.execute(EVENT_BY_ID, {"event_id": event_id})
             event = result.scalar_one_or_none()
             return event
         except Exception as e:
@@ -36,6 +61,7 @@ class EventRepository:
             raise
 
     @staticmethod
+    @replica_read
     async def get_all_events(
         session: AsyncSession,
         offset: int = 0,
@@ -60,11 +86,12 @@ class EventRepository:
             raise
 
     @staticmethod
+    @replica_read
     async def get_upcoming_events(
         session: AsyncSession, offset: int = 0, limit: int = 100
     ) -> List[Event]:
         try:
-            today = pendulum.now("Europe/Moscow").date()
+            today = pendulum.now(settings.timezone).date()
             stmt = (
                 select(Event)
                 .where(Event.event_date >= today)
@@ -82,27 +109,48 @@ class EventRepository:
     @staticmethod
     async def get_upcoming_events_by_date(
         session: AsyncSession, date: date, limit: int = 100
-    ) -> List[Event]:
+    ) -> List[EventSlot]:
         try:
             stmt = (
-                select(Event)
+                select(Event.id, Event.name, Event.event_date, Event.event_time)
                 .where(Event.event_date == date)
                 .order_by(Event.event_time.asc())
                 .limit(limit)
             )
             result = await session.execute(stmt)
-            events = result.scalars().all()
-            return list(events)
+            return [EventSlot(*row) for row in result.all()]
         except Exception as e:
             logger.error(f"Error getting events for date {date}: {e}")
             raise
 
+    @staticmethod
+    async def get_venues_by_date(session: AsyncSession, date: date) -> List[Venue]:
+        try:
+            stmt = select(
+                Event.id,
+                Event.latitude,
+                Event.longitude,
+                Event.event_date,
+                Event.event_time,
+            ).where(
+                Event.event_date == date,
+                Event.latitude.is_not(None),
+                Event.longitude.is_not(None),
+            )
+            result = await session.execute(stmt)
+            return [Venue(*row) for row in result.all()]
+        except Exception as e:
+            logger.error(f"Error getting venues for date {date}: {e}")
+            raise
+
     @staticmethod
     async def delete_event(session: AsyncSession, event_id: int) -> bool:
         try:
             stmt = delete(Event).where(Event.id == event_id)
             result = await session.execute(stmt)
             await session.commit()
+            invalidate_venue_index()
+            invalidate_event_keyboards(event_id)
             return result.rowcount is not None and result.rowcount > 0
         except Exception as e:
             logger.error(f"Error deleting event {event_id}: {e}")
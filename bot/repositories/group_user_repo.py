@@ -1,8 +1,33 @@
 import logging
-from typing import List, Optional, Dict
-from sqlalchemy import select, insert, delete, func, and_
+from datetime import time
+from typing import List, Optional, Dict, Tuple
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    func,
+    and_,
+    or_,
+    any_,
+    bindparam,
+    literal,
+    Integer,
+    BigInteger,
+    String,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from bot.core.models import Group, GroupUser, User, HeroSelection
+from bot.core.database import replica_read
+from bot.core.models import Group, GroupUser, User, HeroSelection, HeroCount
+from bot.core.read_models import GroupMember, UserContact
+from bot.utils.daily_schedule import GroupSchedule
+from bot.repositories.statements import (
+    GROUP_BY_CHAT_ID,
+    USER_BY_ID,
+    USER_BY_TELEGRAM_ID,
+)
 from bot.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -13,11 +38,16 @@ class GroupUserRepository:
     async def get_group_by_chat_id(
         session: AsyncSession, chat_id: int
     ) -> Optional[Group]:
-        stmt = select(Group).where(Group.chat_id == chat_id)
-        result = await session.execute(stmt)
+        result = await session.execute(GROUP_BY_CHAT_ID, {"chat_id": chat_id})
         group = result.scalar_one_or_none()
         return group
 
+    @staticmethod
+    async def get_group_schedules(session: AsyncSession) -> List[GroupSchedule]:
+        stmt = select(Group.id, Group.hero_time, Group.timezone)
+        result = await session.execute(stmt)
+        return [GroupSchedule(*row) for row in result.all()]
+
     @staticmethod
     async def add_group(session: AsyncSession, chat_id: int, name: str) -> Group:
         stmt = insert(Group).values(chat_id=chat_id, name=name).returning(Group)
@@ -26,47 +56,133 @@ class GroupUserRepository:
         await session.commit()
         return group
 
+    @staticmethod
+    async def update_group_schedule(
+        session: AsyncSession,
+        chat_id: int,
+        hero_time: Optional[time],
+        timezone: Optional[str],
+    ) -> bool:
+        """Задаёт группе время выбора героя и часовой пояс (None — по умолчанию)."""
+        stmt = (
+            update(Group)
+            .where(Group.chat_id == chat_id)
+            .values(hero_time=hero_time, timezone=timezone)
+        )
+        try:
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error updating schedule of group {chat_id}: {e}")
+            await session.rollback()
+            raise
+
     @staticmethod
     async def get_user_by_telegram_id(
         session: AsyncSession, telegram_id: int
     ) -> Optional[User]:
-        stmt = select(User).where(User.telegram_id == telegram_id)
-        result = await session.execute(stmt)
+        result = await session.execute(
+            USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        )
         user = result.scalar_one_or_none()
         return user
 
     @staticmethod
     async def get_user_by_id(session: AsyncSession, user_id: int) -> Optional[User]:
-        stmt = select(User).where(User.id == user_id)
-        result = await session.execute(stmt)
+        result = await session.execute(USER_BY_ID, {"user_id": user_id})
         user = result.scalar_one_or_none()
         return user
 
     @staticmethod
     async def register_candidate(
-        session: AsyncSession,
-        chat_id: int,
-        user_id: int,
-        telegram_id: int,
-        username: str,
-        name: str,
-    ) -> bool:
-        group = await GroupUserRepository.get_group_by_chat_id(session, chat_id)
-        if not group:
-            group = await GroupUserRepository.add_group(session, chat_id, name)
-        user = await GroupUserRepository.get_user_by_telegram_id(session, telegram_id)
-        if not user:
-            return False
-        stmt = select(GroupUser).where(
-            and_(GroupUser.group_id == group.id, GroupUser.user_id == user.id)
+        session: AsyncSession, chat_id: int, user_id: int
+    ) -> Optional[bool]:
+        """Регистрирует пользователя кандидатом в группе одним запросом.
+
+        Возвращает True, если пользователь добавлен впервые, False, если он
+        уже кандидат, и None, если группа не зарегистрирована.
+        """
+        group_cte = (
+            select(Group.id).where(Group.chat_id == chat_id).cte("candidate_group")
+        )
+        added_cte = (
+            pg_insert(GroupUser)
+            .from_select(
+                ["group_id", "user_id"],
+                select(group_cte.c.id, literal(user_id, Integer)),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[GroupUser.group_id, GroupUser.user_id]
+            )
+            .returning(GroupUser.id)
+            .cte("added_candidate")
+        )
+        stmt = select(
+            select(group_cte.c.id).scalar_subquery().label("group_id"),
+            select(added_cte.c.id).scalar_subquery().label("candidate_id"),
+        )
+        try:
+            result = await session.execute(stmt)
+            group_id, candidate_id = result.one()
+            await session.commit()
+            if group_id is None:
+                return None
+            return candidate_id is not None
+        except Exception as e:
+            logger.error(
+                f"Error registering candidate {user_id} in group {chat_id}: {e}"
+            )
+            await session.rollback()
+            raise
+
+    @staticmethod
+    async def get_users_by_identifiers(
+        session: AsyncSession, telegram_ids: List[int], usernames: List[str]
+    ) -> List[User]:
+        """Находит пользователей по списку telegram_id и username одним запросом."""
+        stmt = select(User).where(
+            or_(
+                User.telegram_id
+                == any_(bindparam("telegram_ids", telegram_ids, ARRAY(BigInteger))),
+                func.lower(User.username)
+                == any_(
+                    bindparam(
+                        "usernames", [u.lower() for u in usernames], ARRAY(String)
+                    )
+                ),
+            )
         )
         result = await session.execute(stmt)
-        if not result.scalar_one_or_none():
-            stmt = insert(GroupUser).values(group_id=group.id, user_id=user.id)
-            await session.execute(stmt)
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def add_candidates(
+        session: AsyncSession, group_id: int, user_ids: List[int]
+    ) -> int:
+        """Добавляет кандидатов в группу одним запросом, возвращает число новых."""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return 0
+        stmt = (
+            pg_insert(GroupUser)
+            .values(
+                [{"group_id": group_id, "user_id": user_id} for user_id in user_ids]
+            )
+            .on_conflict_do_nothing(
+                index_elements=[GroupUser.group_id, GroupUser.user_id]
+            )
+            .returning(GroupUser.id)
+        )
+        try:
+            result = await session.execute(stmt)
+            added = len(result.all())
             await session.commit()
-            return True
-        return False
+            return added
+        except Exception as e:
+            logger.error(f"Error adding candidates to group {group_id}: {e}")
+            await session.rollback()
+            raise
 
     @staticmethod
     async def get_hero_of_the_day(
@@ -81,6 +197,20 @@ class GroupUserRepository:
         hero = result.scalar_one_or_none()
         return hero
 
+    @staticmethod
+    async def get_hero_of_the_day_with_user(
+        session: AsyncSession, chat_id: int, date
+    ) -> Optional[Tuple[HeroSelection, User]]:
+        stmt = (
+            select(HeroSelection, User)
+            .join(Group, Group.id == HeroSelection.group_id)
+            .join(User, User.id == HeroSelection.user_id)
+            .where(and_(Group.chat_id == chat_id, HeroSelection.selection_date == date))
+        )
+        result = await session.execute(stmt)
+        row = result.first()
+        return (row.HeroSelection, row.User) if row else None
+
     @staticmethod
     async def select_hero_of_the_day(session: AsyncSession, group_id: int, today):
         group_users = await GroupUserRepository.get_users_in_group(session, group_id)
@@ -109,34 +239,72 @@ class GroupUserRepository:
         import random
 
         selected_user = random.choices(group_users, weights=weights, k=1)[0]
-        hero_selection = HeroSelection(
-            group_id=group_id, user_id=selected_user.user_id, selection_date=today
+        stmt = (
+            insert(HeroSelection)
+            .values(
+                group_id=group_id, user_id=selected_user.user_id, selection_date=today
+            )
+            .returning(HeroSelection)
+        )
+        hero_selection = (await session.execute(stmt)).scalar_one()
+        # Счётчик рейтинга обновляется в той же транзакции, что и выбор героя
+        stmt = (
+            pg_insert(HeroCount)
+            .values(group_id=group_id, user_id=selected_user.user_id, count=1)
+            .on_conflict_do_update(
+                index_elements=[HeroCount.group_id, HeroCount.user_id],
+                set_={"count": HeroCount.count + 1},
+            )
         )
-        session.add(hero_selection)
+        await session.execute(stmt)
         await session.commit()
         return hero_selection
 
+    @staticmethod
+    async def get_birthday_members(
+        session: AsyncSession,
+        day: int,
+        month: int,
+        group_ids: Optional[List[int]] = None,
+    ) -> List[Tuple[int, UserContact]]:
+        """Именинники дня в группах group_ids (по умолчанию во всех).
+
+        Возвращает пары (chat_id группы, пользователь) одним запросом,
+        поэтому запуск для корзины групп просматривает только их участников.
+        """
+        stmt = (
+            select(Group.chat_id, User.id, User.username, User.name)
+            .join(GroupUser, Group.id == GroupUser.group_id)
+            .join(User, User.id == GroupUser.user_id)
+            .where(
+                func.extract("day", User.birth_date) == day,
+                func.extract("month", User.birth_date) == month,
+            )
+        )
+        if group_ids is not None:
+            stmt = stmt.where(Group.id.in_(group_ids))
+        result = await session.execute(stmt)
+        return [(row[0], UserContact(*row[1:])) for row in result.all()]
+
     @staticmethod
     async def get_users_in_group(
         session: AsyncSession, group_id: int
-    ) -> List[GroupUser]:
-        stmt = select(GroupUser).where(GroupUser.group_id == group_id)
+    ) -> List[GroupMember]:
+        stmt = select(GroupUser.group_id, GroupUser.user_id).where(
+            GroupUser.group_id == group_id
+        )
         result = await session.execute(stmt)
-        group_users = result.scalars().all()
-        return group_users
+        return [GroupMember(*row) for row in result.all()]
 
     @staticmethod
+    @replica_read
     async def get_hero_top(session: AsyncSession, group_id: int) -> List[Dict]:
         stmt = (
-            select(
-                User.username,
-                User.name,
-                func.count(HeroSelection.id).label("hero_count"),
-            )
-            .join(HeroSelection, HeroSelection.user_id == User.id)
-            .where(HeroSelection.group_id == group_id)
-            .group_by(User.id, User.username, User.name)
-            .order_by(func.count(HeroSelection.id).desc())
+            select(User.username, User.name, HeroCount.count.label("hero_count"))
+            .select_from(HeroCount)
+            .join(User, User.id == HeroCount.user_id)
+            .where(HeroCount.group_id == group_id)
+            .order_by(HeroCount.count.desc())
             .limit(10)
         )
         result = await session.execute(stmt)
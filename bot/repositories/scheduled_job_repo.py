@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete
+from bot.core.models import ScheduledJob
+from bot.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ScheduledJobRepository:
+    @staticmethod
+    async def schedule(
+        session: AsyncSession,
+        task_name: str,
+        run_at: datetime,
+        args: Sequence = (),
+        event_id: Optional[int] = None,
+    ) -> int:
+        try:
+            stmt = (
+                insert(ScheduledJob)
+                .values(
+                    task_name=task_name,
+                    args=list(args),
+                    event_id=event_id,
+                    run_at=run_at,
+                )
+                .returning(ScheduledJob.id)
+            )
+            result = await session.execute(stmt)
+            job_id = result.scalar_one()
+            await session.commit()
+            return job_id
+        except Exception as e:
+            logger.error(f"Error scheduling {task_name} at {run_at}: {e}")
+            await session.rollback()
+            raise
+
+    @staticmethod
+    async def replace_pending_jobs(
+        session: AsyncSession,
+        task_names: Sequence[str],
+        after: datetime,
+        jobs: List[Dict[str, Any]],
+    ) -> None:
+        """Заменяет ещё не наступившие задания task_names новым планом.
+
+        Наступившие, но не отправленные диспетчером задания не трогаются.
+        """
+        try:
+            await session.execute(
+                delete(ScheduledJob).where(
+                    ScheduledJob.task_name.in_(task_names),
+                    ScheduledJob.run_at > after,
+                )
+            )
+            if jobs:
+                await session.execute(insert(ScheduledJob), jobs)
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Error replacing pending jobs {list(task_names)}: {e}")
+            await session.rollback()
+            raise
+
+    @staticmethod
+    async def cancel_event_jobs(session: AsyncSession, event_id: int) -> int:
+        try:
+            stmt = delete(ScheduledJob).where(ScheduledJob.event_id == event_id)
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount or 0
+        except Exception as e:
+            logger.error(f"Error cancelling jobs for event {event_id}: {e}")
+            await session.rollback()
+            raise
+
+    @staticmethod
+    async def claim_due_jobs(
+        session: AsyncSession, now: datetime, limit: int
+    ) -> List[ScheduledJob]:
+        """Удаляет и возвращает до limit наступивших заданий.
+
+        Строки выбираются с FOR UPDATE SKIP LOCKED, поэтому параллельные
+        диспетчеры не получают одно задание дважды. Транзакцию фиксирует
+        вызывающий код после постановки заданий в очередь: при ошибке
+        откат возвращает задания в таблицу.
+        """
+        try:
+            due = (
+                select(ScheduledJob.id)
+                .where(ScheduledJob.run_at <= now)
+                .order_by(ScheduledJob.run_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            stmt = (
+                delete(ScheduledJob)
+                .where(ScheduledJob.id.in_(due))
+                .returning(ScheduledJob)
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error claiming due jobs: {e}")
+            raise
@@ -0,0 +1,24 @@
+"""
+Заранее построенные выражения для самых частых запросов.
+
+Выражение строится один раз при импорте, а значения передаются
+параметрами при выполнении. Ключ кэша такого выражения запоминается,
+поэтому SQLAlchemy сразу находит скомпилированную форму и не собирает
+select(...) заново на каждый вызов.
+"""
+
+from sqlalchemy import bindparam, select
+from bot.core.models import BeerChoice, Event, Group, User
+
+USER_BY_TELEGRAM_ID = select(User).where(User.telegram_id == bindparam("telegram_id"))
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+EVENT_BY_ID = select(Event).where(Event.id == bindparam("event_id"))
+GROUP_BY_CHAT_ID = select(Group).where(Group.chat_id == bindparam("chat_id"))
+USER_HAS_CHOSEN = (
+    select(BeerChoice.id)
+    .where(
+        BeerChoice.user_id == bindparam("user_id"),
+        BeerChoice.event_id == bindparam("event_id"),
+    )
+    .limit(1)
+)
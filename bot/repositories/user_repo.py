@@ -1,9 +1,12 @@
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, insert, update, delete, func
 from sqlalchemy.orm import selectinload
+from bot.core.database import replica_read
 from bot.core.models import User
+from bot.core.read_models import UserContact
 from bot.core.schemas import UserCreate, UserUpdate
+from bot.repositories.statements import USER_BY_ID, USER_BY_TELEGRAM_ID
 from bot.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -13,10 +16,9 @@ class UserRepository:
     @staticmethod
     async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
         try:
-            user = User(**user_data.model_dump())
-            session.add(user)
+            stmt = insert(User).values(**user_data.model_dump()).returning(User)
+            user = (await session.execute(stmt)).scalar_one()
             await session.commit()
-            await session.refresh(user)
             return user
         except Exception as e:
             logger.error(f"Error creating user: {e}")
@@ -28,8 +30,9 @@ class UserRepository:
         session: AsyncSession, telegram_id: int
     ) -> Optional[User]:
         try:
-            stmt = select(User).where(User.telegram_id == telegram_id)
-            result = await session.execute(stmt)
+            result = await session.execute(
+                USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+            )
             user = result.scalar_one_or_none()
             return user
         except Exception as e:
@@ -39,8 +42,7 @@ class UserRepository:
     @staticmethod
     async def get_user_by_id(session: AsyncSession, user_id: int) -> Optional[User]:
         try:
-            stmt = select(User).where(User.id == user_id)
-            result = await session.execute(stmt)
+            result = await session.execute(USER_BY_ID, {"user_id": user_id})
             user = result.scalar_one_or_none()
             return user
         except Exception as e:
@@ -80,9 +82,9 @@ class UserRepository:
                 .values(**update_values)
                 .returning(User)
             )
-            result = await session.execute(stmt)
+            user = (await session.execute(stmt)).scalar_one_or_none()
             await session.commit()
-            return await UserRepository.get_user_by_telegram_id(session, telegram_id)
+            return user
         except Exception as e:
             logger.error(f"Error updating user {telegram_id}: {e}")
             await session.rollback()
@@ -130,18 +132,18 @@ class UserRepository:
             raise
 
     @staticmethod
+    @replica_read
     async def get_users_by_birthday(
         session: AsyncSession, day: int, month: int
-    ) -> List[User]:
+    ) -> List[UserContact]:
         """Возвращает пользователей, у которых день рождения совпадает с указанным днём и месяцем."""
         try:
-            stmt = select(User).where(
+            stmt = select(User.id, User.username, User.name).where(
                 func.extract("day", User.birth_date) == day,
                 func.extract("month", User.birth_date) == month,
             )
             result = await session.execute(stmt)
-            users = result.scalars().all()
-            return list(users)
+            return [UserContact(*row) for row in result.all()]
         except Exception as e:
             logger.error(
                 f"Error getting users by birthday day={day}, month={month}: {e}"
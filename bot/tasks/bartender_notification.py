@@ -1,22 +1,20 @@
 from celery import shared_task
 from sqlalchemy.ext.asyncio import AsyncSession
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.event_repo import EventRepository
 from bot.repositories.beer_repo import BeerRepository
 from bot.repositories.event_participant_repo import EventParticipantRepository
 from bot.utils.logger import setup_logger
+from bot.utils.rendering import render_bartender_orders
+from bot.utils.metrics import TelegramMetricsMiddleware
 from aiogram import Bot
 from bot.core.models import Event
 from datetime import date
 import pendulum
-import os
 import asyncio
-from dotenv import load_dotenv
 
-load_dotenv()
 logger = setup_logger(__name__)
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-ADMIN_TELEGRAM_ID = int(os.getenv("ADMIN_TELEGRAM_ID", "267863612"))
 
 
 async def count_beer_choices(
@@ -29,7 +27,7 @@ async def count_beer_choices(
             day=today.day,
             hour=event.event_time.hour,
             minute=event.event_time.minute,
-            tz="Europe/Moscow",
+            tz=settings.timezone,
         )
         window_start = event_start.subtract(minutes=30)
         logger.debug(
@@ -63,17 +61,8 @@ async def send_bartender_notification(
     bot: Bot, event: Event, participant_count: int, beer_counts: dict[str, int]
 ):
     try:
-        message_text = (
-            f"🍺 Заказы на событие '{event.name}' "
-            f"({event.event_date.strftime('%d.%m.%Y')} @ {event.event_time.strftime('%H:%M')}):\n"
-        )
-        message_text += f"👥 Участников: {participant_count}\n"
-        if participant_count == 0:
-            message_text += "🍻 Нет заказов."
-        else:
-            for beer, count in beer_counts.items():
-                message_text += f"🍻 {beer}: {count}\n"
-        await bot.send_message(chat_id=ADMIN_TELEGRAM_ID, text=message_text)
+        message_text = render_bartender_orders(event, participant_count, beer_counts)
+        await bot.send_message(chat_id=settings.admin_telegram_id, text=message_text)
         logger.info(
             f"Bartender notification sent for event {event.id}: {participant_count} participants"
         )
@@ -85,13 +74,37 @@ async def send_bartender_notification(
         raise
 
 
+async def notify_bartender(bot: Bot, event_id: int):
+    """Подсчитывает заказы на событие и отправляет их бармену один раз."""
+    async with session_scope() as session:
+        event = await EventRepository.get_event_by_id(session, event_id)
+        if not event:
+            logger.warning(f"Event {event_id} not found in database, skipping")
+            return
+        participant_record = await EventParticipantRepository.get_participant_record(
+            session, event_id
+        )
+        if participant_record:
+            logger.debug(f"Event {event_id} already processed, skipping")
+            return
+        participant_count, beer_counts = await count_beer_choices(
+            session, event, event.event_date
+        )
+        await send_bartender_notification(bot, event, participant_count, beer_counts)
+        await EventParticipantRepository.create_participant_record(
+            session, event_id, participant_count
+        )
+        logger.info(f"Processed event {event_id}: {participant_count} participants")
+
+
 @shared_task(bind=True, ignore_result=True)
 def process_event_notification(self, event_id: int):
     logger.info(f"Processing notification task for event {event_id}")
     bot = None
     loop = None
     try:
-        bot = Bot(token=BOT_TOKEN)
+        bot = Bot(token=settings.bot_token)
+        bot.session.middleware(TelegramMetricsMiddleware())
         # Get or create event loop for the current worker process
         try:
             loop = asyncio.get_event_loop()
@@ -102,35 +115,8 @@ def process_event_notification(self, event_id: int):
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
 
-        async def run():
-            async for session in get_async_session():
-                event = await EventRepository.get_event_by_id(session, event_id)
-                if not event:
-                    logger.warning(f"Event {event_id} not found in database, skipping")
-                    return
-                participant_record = (
-                    await EventParticipantRepository.get_participant_record(
-                        session, event_id
-                    )
-                )
-                if participant_record:
-                    logger.debug(f"Event {event_id} already processed, skipping")
-                    return
-                participant_count, beer_counts = await count_beer_choices(
-                    session, event, event.event_date
-                )
-                await send_bartender_notification(
-                    bot, event, participant_count, beer_counts
-                )
-                await EventParticipantRepository.create_participant_record(
-                    session, event_id, participant_count
-                )
-                logger.info(
-                    f"Processed event {event_id}: {participant_count} participants"
-                )
-
         # Run the async function using the managed event loop
-        loop.run_until_complete(run())
+        loop.run_until_complete(notify_bartender(bot, event_id))
     except Exception as e:
         logger.error(
             f"Error processing event notification for event {event_id}: {e}",
@@ -1,18 +1,16 @@
 from celery import Celery
 from celery.schedules import crontab
-import os
-from dotenv import load_dotenv
+from celery.signals import beat_init, worker_init, task_prerun, task_postrun
+from bot.core.config import settings
 from bot.utils.logger import setup_logger
 import pendulum
 
-load_dotenv()
-
 logger = setup_logger(__name__)
-REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+REDIS_URL = settings.redis_url
 
 # Время запуска задач в формате HH:MM
-HERO_SELECTION_TIME = os.getenv("HERO_SELECTION_TIME", "09:01")
-BIRTHDAY_CHECK_TIME = os.getenv("BIRTHDAY_CHECK_TIME", "00:01")
+HERO_SELECTION_TIME = settings.hero_selection_time
+BIRTHDAY_CHECK_TIME = settings.birthday_check_time
 
 
 def parse_time(time_str: str) -> dict:
@@ -35,6 +33,24 @@ BIRTHDAY_CHECK_CRONTAB = parse_time(BIRTHDAY_CHECK_TIME)
 # logger.info(f"Hero selection scheduled at {HERO_SELECTION_TIME}")
 # logger.info(f"Birthday check scheduled at {BIRTHDAY_CHECK_TIME}")
 
+# Все задачи работают по принципу "отправил и забыл": результаты не
+# сохраняются, если задача явно не объявлена с ignore_result=False.
+# Задачи короткие и идемпотентные, поэтому подтверждаются после выполнения
+# и берутся из очереди пачками.
+MESSAGING_PROFILE = {
+    "task_serializer": "msgpack",
+    # json оставлен для сообщений, поставленных в очередь до перехода на msgpack
+    "accept_content": ["msgpack", "json"],
+    "result_serializer": "msgpack",
+    "task_ignore_result": True,
+    "result_expires": 3600,
+    "task_acks_late": True,
+    "task_reject_on_worker_lost": True,
+    "worker_prefetch_multiplier": settings.celery_prefetch_multiplier,
+    "broker_pool_limit": settings.celery_broker_pool_limit,
+    "broker_transport_options": {"socket_keepalive": True},
+}
+
 app = Celery(
     "bot",
     broker=REDIS_URL,
@@ -43,29 +59,72 @@ app = Celery(
         "bot.tasks.bartender_notification",
         "bot.tasks.hero_notification",
         "bot.tasks.birthday_notification",
+        "bot.tasks.scheduler",
+        "bot.tasks.daily_jobs",
+        "bot.tasks.partition_maintenance",
     ],
 )
 
 app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
-    timezone="Europe/Moscow",
+    MESSAGING_PROFILE,
+    timezone=settings.timezone,
     enable_utc=False,
     beat_schedule={
-        "select-hero-every-day": {
-            "task": "bot.tasks.hero_notification.process_hero_selection",
-            "schedule": crontab(**HERO_SELECTION_CRONTAB),
+        # Герой дня и дни рождения запускаются по корзинам групп внутри окна
+        # DAILY_JOB_WINDOW после HERO_SELECTION_TIME и BIRTHDAY_CHECK_TIME.
+        # План на ближайшие сутки пересчитывается каждый час.
+        "plan-daily-jobs": {
+            "task": "bot.tasks.daily_jobs.plan_daily_jobs",
+            "schedule": crontab(minute=0),
         },
-        "check-birthdays-every-day": {
-            "task": "bot.tasks.birthday_notification.check_birthdays",
-            "schedule": crontab(**BIRTHDAY_CHECK_CRONTAB),
+        # Отложенные задачи хранятся в scheduled_jobs и ставятся в очередь
+        # только когда наступает их время
+        "dispatch-scheduled-jobs": {
+            "task": "bot.tasks.scheduler.dispatch_scheduled_jobs",
+            "schedule": settings.scheduler_poll_interval,
+            "options": {"expires": settings.scheduler_poll_interval},
+        },
+        # Месячные секции beer_choices: новые заранее, старые в beer_choice_monthly
+        "maintain-partitions": {
+            "task": "bot.tasks.partition_maintenance.maintain_partitions",
+            "schedule": crontab(hour=3, minute=30),
         },
     },
     beat_dburi=REDIS_URL,
     broker_connection_retry_on_startup=True,
-    result_expires=3600,  # Expire task results after 1 hour
 )
 
+
+@beat_init.connect
+def plan_daily_jobs_on_start(sender=None, **kwargs):
+    # Не ждём ближайшего часа после перезапуска beat
+    app.send_task("bot.tasks.daily_jobs.plan_daily_jobs")
+
+
+@worker_init.connect
+def start_worker_metrics(**kwargs):
+    # Метрики тянут aiogram, который не нужен celery beat
+    from bot.utils.metrics import start_metrics_server
+
+    start_metrics_server()
+
+
+@task_prerun.connect
+def bind_task_metrics(task=None, **kwargs):
+    from bot.utils.metrics import current_handler
+
+    # SQL-запросы внутри задачи учитываются под её именем
+    task.request.metrics_token = current_handler.set(task.name)
+
+
+@task_postrun.connect
+def unbind_task_metrics(task=None, **kwargs):
+    token = getattr(task.request, "metrics_token", None)
+    if token is not None:
+        from bot.utils.metrics import current_handler
+
+        current_handler.reset(token)
+
+
 if __name__ == "__main__":
     app.start()
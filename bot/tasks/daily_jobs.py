@@ -0,0 +1,77 @@
+from celery import shared_task
+from datetime import time
+from typing import Any, Dict, Iterable, List
+from pendulum import DateTime
+from bot.core.config import settings
+from bot.core.database import session_scope
+from bot.repositories.group_user_repo import GroupUserRepository
+from bot.repositories.scheduled_job_repo import ScheduledJobRepository
+from bot.tasks.celery_app import BIRTHDAY_CHECK_CRONTAB, HERO_SELECTION_CRONTAB
+from bot.utils.daily_schedule import GroupSchedule, plan_runs
+from bot.utils.logger import setup_logger
+import pendulum
+import asyncio
+
+logger = setup_logger(__name__)
+
+HERO_SELECTION_TASK = "bot.tasks.hero_notification.process_hero_selection"
+BIRTHDAY_CHECK_TASK = "bot.tasks.birthday_notification.check_birthdays"
+
+# Задача, базовое время и учитывается ли своё время группы
+DAILY_JOBS = (
+    (HERO_SELECTION_TASK, time(**HERO_SELECTION_CRONTAB), True),
+    (BIRTHDAY_CHECK_TASK, time(**BIRTHDAY_CHECK_CRONTAB), False),
+)
+
+
+def build_daily_jobs(
+    groups: Iterable[GroupSchedule], now: DateTime
+) -> List[Dict[str, Any]]:
+    """Задания ежедневных задач на ближайшие 24 часа."""
+    jobs = []
+    for task_name, base_time, use_group_time in DAILY_JOBS:
+        runs = plan_runs(
+            groups,
+            now,
+            base_time,
+            settings.timezone,
+            settings.daily_job_buckets,
+            settings.daily_job_window,
+            use_group_time,
+        )
+        jobs.extend(
+            {
+                "task_name": task_name,
+                "args": [day.isoformat(), group_ids],
+                "run_at": run_at,
+            }
+            for (run_at, day), group_ids in runs.items()
+        )
+    return jobs
+
+
+async def plan_daily_jobs_for_groups() -> int:
+    """Планирует ежедневные задачи групп на ближайшие 24 часа.
+
+    Повторный запуск заменяет ещё не наступившие задания, поэтому каждая
+    группа получает не больше одного запуска каждой задачи в сутки.
+    """
+    now = pendulum.now("UTC")
+    async with session_scope() as session:
+        groups = await GroupUserRepository.get_group_schedules(session)
+        jobs = build_daily_jobs(groups, now)
+        await ScheduledJobRepository.replace_pending_jobs(
+            session, [task_name for task_name, _, _ in DAILY_JOBS], now, jobs
+        )
+        logger.info(f"Planned {len(jobs)} daily jobs for {len(groups)} groups")
+        return len(jobs)
+
+
+@shared_task(bind=True, ignore_result=True)
+def plan_daily_jobs(self):
+    try:
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(plan_daily_jobs_for_groups())
+    except Exception as e:
+        logger.error(f"Error planning daily jobs: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=60)
@@ -1,20 +1,28 @@
 from celery import shared_task
 from sqlalchemy.ext.asyncio import AsyncSession
-from bot.core.database import get_async_session
+from bot.core.config import settings
+from bot.core.database import session_scope
 from bot.repositories.group_user_repo import GroupUserRepository
+from bot.utils.cache import (
+    cache_delete,
+    cache_set,
+    seconds_until_midnight,
+    HERO_TODAY_CACHE_KEY,
+    HERO_TOP_CACHE_KEY,
+)
+from bot.utils.daily_schedule import resolve_timezone
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import TelegramMetricsMiddleware
 from aiogram import Bot
 from bot.core.models import Group, HeroSelection, User
 from sqlalchemy import select
 import pendulum
-import os
 import asyncio
-from dotenv import load_dotenv
+from datetime import date
 from random import choice
+from typing import List, Optional
 
-load_dotenv()
 logger = setup_logger(__name__)
-BOT_TOKEN = os.getenv("BOT_TOKEN")
 
 # Текстовые сообщения
 HERO_NOTIFICATION_INTRO_MESSAGES = [
@@ -28,10 +36,15 @@ HERO_NOTIFICATION_SUCCESS_MESSAGE = "🏆 Герой дня в группе: @{u
 HERO_NOTIFICATION_ERROR_MESSAGE = (
     "❌ Ошибка при выборе героя для группы {chat_id}: {error}"
 )
+HERO_SEARCH_DELAY = 1.5
 
 
 async def send_hero_notification(
-    bot: Bot, chat_id: int, hero: "HeroSelection", user: "User"
+    bot: Bot,
+    chat_id: int,
+    hero: "HeroSelection",
+    user: "User",
+    search_delay: float = HERO_SEARCH_DELAY,
 ):
     try:
         # Отправляем случайное предисловие
@@ -40,7 +53,7 @@ async def send_hero_notification(
 
         # Имитация поиска
         await bot.send_message(chat_id=chat_id, text=HERO_NOTIFICATION_SEARCH_MESSAGE)
-        await asyncio.sleep(1.5)  # Задержка для эффекта поиска
+        await asyncio.sleep(search_delay)  # Задержка для эффекта поиска
 
         # Отправляем сообщение с героем
         message_text = HERO_NOTIFICATION_SUCCESS_MESSAGE.format(
@@ -57,55 +70,85 @@ async def send_hero_notification(
         raise
 
 
+async def select_heroes(
+    bot: Bot,
+    search_delay: float = HERO_SEARCH_DELAY,
+    today: Optional[date] = None,
+    group_ids: Optional[List[int]] = None,
+):
+    """Выбирает героя дня в группах group_ids (по умолчанию во всех)."""
+    async with session_scope() as session:
+        try:
+            today = today or pendulum.now(settings.timezone).date()
+            stmt = select(Group)
+            if group_ids is not None:
+                stmt = stmt.where(Group.id.in_(group_ids))
+            result = await session.execute(stmt)
+            groups = result.scalars().all()
+            if not groups:
+                logger.warning("No groups found in the database")
+                return
+
+            for group in groups:
+                logger.debug(f"Processing group {group.chat_id}: {group.name}")
+                hero = await GroupUserRepository.select_hero_of_the_day(
+                    session, group.id, today
+                )
+                if hero:
+                    await cache_delete(HERO_TOP_CACHE_KEY.format(chat_id=group.chat_id))
+                    user = await GroupUserRepository.get_user_by_id(
+                        session, hero.user_id
+                    )
+                    if user:
+                        await cache_set(
+                            HERO_TODAY_CACHE_KEY.format(
+                                chat_id=group.chat_id, date=today
+                            ),
+                            user.username or user.name,
+                            # Запись о герое живёт до полуночи по времени группы
+                            seconds_until_midnight(
+                                resolve_timezone(group.timezone, settings.timezone)
+                            ),
+                        )
+                        await send_hero_notification(
+                            bot, group.chat_id, hero, user, search_delay
+                        )
+                    else:
+                        logger.warning(
+                            f"No user found for hero ID {hero.user_id} in group {group.chat_id}"
+                        )
+                else:
+                    logger.info(
+                        f"No hero selected for group {group.chat_id} on {today}"
+                    )
+        except Exception as e:
+            logger.error(f"Error processing group: {e}", exc_info=True)
+
+
 @shared_task(bind=True, ignore_result=True)
-def process_hero_selection(self):
-    logger.info("Processing daily hero selection task")
+def process_hero_selection(
+    self, day: Optional[str] = None, group_ids: Optional[List[int]] = None
+):
+    """Герой дня для корзины групп, запланированной plan_daily_jobs."""
+    logger.info(f"Processing daily hero selection task for {day or 'today'}")
     bot = None
     try:
-        if not BOT_TOKEN:
+        if not settings.bot_token:
             logger.error("BOT_TOKEN is not set in environment variables")
             raise ValueError("BOT_TOKEN is not set")
 
-        bot = Bot(token=BOT_TOKEN)
-
-        async def run():
-            async for session in get_async_session():
-                try:
-                    today = pendulum.now("Europe/Moscow").date()
-                    result = await session.execute(select(Group))
-                    groups = result.scalars().all()
-                    if not groups:
-                        logger.warning("No groups found in the database")
-                        return
-
-                    for group in groups:
-                        logger.debug(f"Processing group {group.chat_id}: {group.name}")
-                        hero = await GroupUserRepository.select_hero_of_the_day(
-                            session, group.chat_id, today
-                        )
-                        if hero:
-                            user = await GroupUserRepository.get_user_by_id(
-                                session, hero.user_id
-                            )
-                            if user:
-                                await send_hero_notification(
-                                    bot, group.chat_id, hero, user
-                                )
-                            else:
-                                logger.warning(
-                                    f"No user found for hero ID {hero.user_id} in group {group.chat_id}"
-                                )
-                        else:
-                            logger.info(
-                                f"No hero selected for group {group.chat_id} on {today}"
-                            )
-                except Exception as e:
-                    logger.error(f"Error processing group: {e}", exc_info=True)
-                    continue  # Продолжаем с следующей группой
+        bot = Bot(token=settings.bot_token)
+        bot.session.middleware(TelegramMetricsMiddleware())
 
         # Запускаем асинхронную функцию в текущем цикле событий
         loop = asyncio.get_event_loop()
-        loop.run_until_complete(run())
+        loop.run_until_complete(
+            select_heroes(
+                bot,
+                today=date.fromisoformat(day) if day else None,
+                group_ids=group_ids,
+            )
+        )
     except Exception as e:
         logger.error(f"Error processing hero selection: {e}", exc_info=True)
         raise self.retry(exc=e, countdown=60)
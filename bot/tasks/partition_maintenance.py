@@ -0,0 +1,60 @@
+from celery import shared_task
+from typing import List, Optional, Tuple
+from bot.core.config import settings
+from bot.core.database import engine
+from bot.core.partitions import (
+    ensure_partitions,
+    expire_partition,
+    list_partitions,
+    month_start,
+)
+from bot.utils.logger import setup_logger
+from pendulum import DateTime
+import pendulum
+import asyncio
+
+logger = setup_logger(__name__)
+
+
+async def maintain_beer_choice_partitions(
+    now: Optional[DateTime] = None,
+) -> Tuple[List[str], List[str]]:
+    """Создаёт будущие секции beer_choices и сворачивает устаревшие.
+
+    Каждая устаревшая секция обрабатывается в своей транзакции, чтобы
+    блокировка таблицы при отсоединении держалась недолго.
+    """
+    now = now or pendulum.now("UTC")
+    async with engine.begin() as conn:
+        created = await ensure_partitions(
+            conn, now, settings.beer_choices_partitions_ahead
+        )
+    expired = []
+    if settings.beer_choices_retention_months:
+        cutoff = month_start(now).subtract(
+            months=settings.beer_choices_retention_months
+        )
+        async with engine.begin() as conn:
+            partitions = await list_partitions(conn)
+        for partition in partitions:
+            if partition.upper is None or partition.upper > cutoff:
+                break
+            async with engine.begin() as conn:
+                if await expire_partition(
+                    conn, partition, settings.beer_choices_drop_expired
+                ):
+                    expired.append(partition.name)
+    logger.info(
+        f"Partition maintenance: created {len(created)}, expired {len(expired)}"
+    )
+    return created, expired
+
+
+@shared_task(bind=True, ignore_result=True)
+def maintain_partitions(self):
+    try:
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(maintain_beer_choice_partitions())
+    except Exception as e:
+        logger.error(f"Error maintaining beer_choices partitions: {e}", exc_info=True)
+        raise self.retry(exc=e, countdown=300)
@@ -0,0 +1,41 @@
+from celery import Celery, shared_task
+from bot.core.config import settings
+from bot.core.database import session_scope
+from bot.repositories.scheduled_job_repo import ScheduledJobRepository
+from bot.utils.logger import setup_logger
+import pendulum
+import asyncio
+
+logger = setup_logger(__name__)
+
+
+async def dispatch_due_jobs(app: Celery, batch_size: int) -> int:
+    """Ставит в очередь Celery все задания, время которых наступило."""
+    dispatched = 0
+    async with session_scope() as session:
+        while True:
+            jobs = await ScheduledJobRepository.claim_due_jobs(
+                session, pendulum.now("UTC"), batch_size
+            )
+            for job in jobs:
+                app.send_task(job.task_name, args=job.args)
+                logger.info(
+                    f"Dispatched scheduled job {job.id} ({job.task_name}) due at {job.run_at}"
+                )
+            await session.commit()
+            dispatched += len(jobs)
+            if len(jobs) < batch_size:
+                break
+    return dispatched
+
+
+@shared_task(bind=True, ignore_result=True)
+def dispatch_scheduled_jobs(self):
+    try:
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(
+            dispatch_due_jobs(self.app, settings.scheduler_batch_size)
+        )
+    except Exception as e:
+        # Следующий опрос подберёт оставшиеся задания, повторять не нужно
+        logger.error(f"Error dispatching scheduled jobs: {e}", exc_info=True)
@@ -0,0 +1,60 @@
+import asyncio
+import pendulum
+from typing import Optional
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from bot.core.config import settings
+from bot.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Ключи кэша
+HERO_TOP_CACHE_KEY = "hero_top:{chat_id}"
+HERO_TOP_CACHE_TTL = settings.hero_top_cache_ttl
+HERO_TODAY_CACHE_KEY = "hero_today:{chat_id}:{date}"
+
+_client: Optional[Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_redis() -> Redis:
+    """Возвращает клиент Redis, привязанный к текущему циклу событий."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = Redis.from_url(
+            settings.redis_url, decode_responses=True, socket_timeout=2
+        )
+        _client_loop = loop
+    return _client
+
+
+def seconds_until_midnight(tz: str = settings.timezone) -> int:
+    """Количество секунд до ближайшей полуночи в указанном часовом поясе."""
+    now = pendulum.now(tz)
+    return max(1, int((now.add(days=1).start_of("day") - now).total_seconds()))
+
+
+# Кэш не должен ломать обработчики: при недоступности Redis просто идём в БД
+async def cache_get(key: str) -> Optional[str]:
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+
+async def cache_set(key: str, value: str, ttl: int) -> None:
+    try:
+        await get_redis().set(key, value, ex=max(1, int(ttl)))
+    except RedisError as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    if not keys:
+        return
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache delete failed for {keys}: {e}")
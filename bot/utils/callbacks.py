@@ -0,0 +1,261 @@
+import struct
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Type, TypeVar, Union
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+from aiogram.filters import Filter
+from aiogram.filters.callback_data import (
+    MAX_CALLBACK_LENGTH,
+    CallbackData,
+    CallbackQueryFilter,
+)
+from aiogram.types import CallbackQuery, TelegramObject
+
+T = TypeVar("T", bound="PackedCallbackData")
+
+SEPARATOR = ":"
+
+
+class PackedCallbackData(CallbackData, prefix=""):
+    """Callback data в виде prefix:base64(struct.pack(layout, *поля)).
+
+    Поля упаковываются в порядке объявления форматом layout; класс без
+    полей упаковывается в один префикс.
+    """
+
+    layout: ClassVar[str] = "!"
+
+    def pack(self) -> str:
+        values = list(self.model_dump().values())
+        if not values:
+            return self.__prefix__
+        try:
+            raw = struct.pack(self.layout, *values)
+        except struct.error as e:
+            raise ValueError(f"Can not pack {self!r}: {e}") from e
+        payload = urlsafe_b64encode(raw).rstrip(b"=").decode()
+        callback_data = f"{self.__prefix__}{SEPARATOR}{payload}"
+        if len(callback_data.encode()) > MAX_CALLBACK_LENGTH:
+            raise ValueError(f"Callback data {callback_data!r} is too long")
+        return callback_data
+
+    @classmethod
+    def unpack(cls: Type[T], value: str) -> T:
+        prefix, _, payload = value.partition(SEPARATOR)
+        if prefix != cls.__prefix__:
+            raise ValueError(f"Bad prefix ({prefix!r} != {cls.__prefix__!r})")
+        names = list(cls.model_fields)
+        if not names:
+            if payload:
+                raise TypeError(f"Callback data {cls.__name__!r} takes no arguments")
+            return cls()
+        try:
+            raw = urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            values = struct.unpack(cls.layout, raw)
+        except (BinasciiError, struct.error) as e:
+            raise ValueError(f"Bad payload for {cls.__name__!r}: {e}") from e
+        return cls(**dict(zip(names, values)))
+
+
+def callback_prefix(data: Optional[str]) -> Optional[str]:
+    if not data:
+        return None
+    return data.partition(SEPARATOR)[0]
+
+
+# --- Общие кнопки ---
+class StartCallback(PackedCallbackData, prefix="cmd_start"):
+    pass
+
+
+class ProfileCallback(PackedCallbackData, prefix="cmd_profile"):
+    pass
+
+
+class BeerCallback(PackedCallbackData, prefix="cmd_beer"):
+    pass
+
+
+# --- Выбор пива ---
+class SelectEventCallback(PackedCallbackData, prefix="se"):
+    layout: ClassVar[str] = "!I"
+    event_id: int
+
+
+class BeerChoiceCallback(PackedCallbackData, prefix="bc"):
+    """option — индекс варианта в списке допустимых сортов события."""
+
+    layout: ClassVar[str] = "!IB"
+    event_id: int
+    option: int
+
+
+class CancelBeerSelectionCallback(PackedCallbackData, prefix="cancel_beer_selection"):
+    pass
+
+
+# --- Создание и удаление событий ---
+class BeerChoiceModeCallback(PackedCallbackData, prefix="cm"):
+    layout: ClassVar[str] = "!?"
+    has_beer_choice: bool
+
+
+class CancelEventCreationCallback(PackedCallbackData, prefix="cancel_event_creation"):
+    pass
+
+
+class CancelEventDeletionCallback(PackedCallbackData, prefix="cancel_event_deletion"):
+    pass
+
+
+class DeleteEventCallback(PackedCallbackData, prefix="de"):
+    layout: ClassVar[str] = "!I"
+    event_id: int
+
+
+class EventsPageCallback(PackedCallbackData, prefix="ep"):
+    """page — номер страницы, на которую нужно перейти."""
+
+    layout: ClassVar[str] = "!H"
+    page: int
+
+
+class LegacyCallbackFilter(Filter):
+    """Callback data старого формата prefix<поля> для обработчика нового формата.
+
+    Клавиатуры, отправленные до перехода на PackedCallbackData, остаются в
+    чатах: parse разбирает остаток строки после префикса и возвращает
+    аргументы обработчика (callback_data и т.п.) либо бросает ValueError.
+    """
+
+    def __init__(self, prefix: str, parse: Callable[[str], Dict[str, Any]]) -> None:
+        self.prefix = prefix
+        self.parse = parse
+
+    async def __call__(self, query: CallbackQuery) -> Union[bool, Dict[str, Any]]:
+        if not query.data or not query.data.startswith(self.prefix):
+            return False
+        try:
+            return self.parse(query.data[len(self.prefix) :])
+        except ValueError:
+            return False
+
+
+def legacy_event_id(
+    prefix: str, callback_class: Type[CallbackData]
+) -> LegacyCallbackFilter:
+    """Старые <prefix><event_id>: select_event_, delete_event_."""
+    return LegacyCallbackFilter(
+        prefix, lambda rest: {"callback_data": callback_class(event_id=int(rest))}
+    )
+
+
+def _parse_legacy_beer(rest: str) -> Dict[str, Any]:
+    # beer_<event_id>_<сорт>; индекс варианта обработчик находит по названию
+    event_id, _, beer = rest.partition("_")
+    if not beer:
+        raise ValueError(f"No beer in legacy callback {rest!r}")
+    return {
+        "callback_data": BeerChoiceCallback(event_id=int(event_id), option=0),
+        "legacy_beer": beer,
+    }
+
+
+def _legacy_page(step: int) -> Callable[[str], Dict[str, Any]]:
+    # next_page_<n>/prev_page_<n> хранили текущую страницу, а не целевую
+    def parse(rest: str) -> Dict[str, Any]:
+        page = int(rest) + step
+        if page < 0:
+            raise ValueError(f"Bad legacy page {rest!r}")
+        return {"callback_data": EventsPageCallback(page=page)}
+
+    return parse
+
+
+LEGACY_BEER_CHOICE = LegacyCallbackFilter("beer_", _parse_legacy_beer)
+LEGACY_NEXT_PAGE = LegacyCallbackFilter("next_page_", _legacy_page(1))
+LEGACY_PREV_PAGE = LegacyCallbackFilter("prev_page_", _legacy_page(-1))
+
+# Ключ индекса для обработчиков со старыми префиксами: их данные без
+# разделителя, поэтому они проверяются только для неизвестных префиксов
+_LEGACY = object()
+
+
+class PrefixIndexedObserver(TelegramEventObserver):
+    """Наблюдатель callback_query, выбирающий обработчики по префиксу данных.
+
+    Обработчики с фильтром CallbackData индексируются по его префиксу,
+    остальные проверяются для любого апдейта в порядке регистрации.
+    Обработку апдейта ведёт TelegramEventObserver.trigger aiogram на
+    наблюдателе с отобранными обработчиками; переопределён только их выбор.
+    """
+
+    def __init__(self, router: Router, event_name: str) -> None:
+        super().__init__(router=router, event_name=event_name)
+        self._index: Optional[Dict[Optional[str], TelegramEventObserver]] = None
+
+    def register(self, *args: Any, **kwargs: Any) -> Any:
+        self._index = None
+        return super().register(*args, **kwargs)
+
+    @staticmethod
+    def _handler_prefix(handler: HandlerObject) -> Any:
+        for filter_object in handler.filters or ():
+            if isinstance(filter_object.callback, CallbackQueryFilter):
+                return filter_object.callback.callback_data.__prefix__
+            if isinstance(filter_object.callback, LegacyCallbackFilter):
+                return _LEGACY
+        return None
+
+    def _subset(self, handlers: List[HandlerObject]) -> TelegramEventObserver:
+        # Промежуточные middleware aiogram собирает по router.observers,
+        # то есть с этого наблюдателя и роутеров выше
+        observer = TelegramEventObserver(router=self.router, event_name=self.event_name)
+        observer.handlers = handlers
+        return observer
+
+    def _build_index(self) -> Dict[Optional[str], TelegramEventObserver]:
+        prefixes = [self._handler_prefix(handler) for handler in self.handlers]
+        index = {
+            prefix: self._subset(
+                [
+                    handler
+                    for handler, handler_prefix in zip(self.handlers, prefixes)
+                    if handler_prefix in (prefix, None)
+                ]
+            )
+            for prefix in set(prefixes) - {None, _LEGACY}
+        }
+        index[None] = self._subset(
+            [
+                handler
+                for handler, handler_prefix in zip(self.handlers, prefixes)
+                if handler_prefix in (None, _LEGACY)
+            ]
+        )
+        return index
+
+    def _observer_for(self, event: TelegramObject) -> TelegramEventObserver:
+        if self._index is None:
+            self._index = self._build_index()
+        prefix = (
+            callback_prefix(event.data) if isinstance(event, CallbackQuery) else None
+        )
+        return self._index.get(prefix, self._index[None])
+
+    async def trigger(self, event: TelegramObject, **kwargs: Any) -> Any:
+        return await self._observer_for(event).trigger(event, **kwargs)
+
+
+class CallbackRouter(Router):
+    """Router с индексом обработчиков callback_query по префиксу."""
+
+    def __init__(self, *, name: Optional[str] = None) -> None:
+        super().__init__(name=name)
+        self.callback_query = PrefixIndexedObserver(
+            router=self, event_name="callback_query"
+        )
+        self.observers["callback_query"] = self.callback_query
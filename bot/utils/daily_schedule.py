@@ -0,0 +1,73 @@
+from collections import defaultdict
+from datetime import date, time
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pendulum
+from pendulum import DateTime
+from bot.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class GroupSchedule(NamedTuple):
+    id: int
+    hero_time: Optional[time]
+    timezone: Optional[str]
+
+
+def bucket_offset(group_id: int, buckets: int, window_minutes: int) -> int:
+    """Смещение запуска группы в минутах: корзины равномерно делят окно."""
+    return window_minutes * (group_id % buckets) // buckets
+
+
+@lru_cache(maxsize=None)
+def resolve_timezone(name: Optional[str], default: str) -> str:
+    if not name:
+        return default
+    try:
+        pendulum.timezone(name)
+    except Exception:
+        logger.warning(f"Unknown group timezone {name!r}, using {default}")
+        return default
+    return name
+
+
+def next_run(now: DateTime, tz: str, at: time, offset_minutes: int = 0) -> DateTime:
+    """Ближайший после now запуск в время at + offset по часовому поясу tz."""
+    local_now = now.in_timezone(tz)
+    # Смещение может перенести запуск за полночь, поэтому начинаем со вчера
+    run_at = (
+        local_now.subtract(days=1).at(at.hour, at.minute).add(minutes=offset_minutes)
+    )
+    while run_at <= local_now:
+        run_at = run_at.add(days=1)
+    return run_at
+
+
+def plan_runs(
+    groups: Iterable[GroupSchedule],
+    now: DateTime,
+    base_time: time,
+    default_tz: str,
+    buckets: int,
+    window_minutes: int,
+    use_group_time: bool = False,
+) -> Dict[Tuple[DateTime, date], List[int]]:
+    """Раскладывает группы по запускам в ближайшие 24 часа.
+
+    Ключ — момент запуска в UTC и дата группы, к которой он относится;
+    группы с одинаковым ключом обрабатываются одной задачей. Группа со
+    своим временем (при use_group_time) запускается ровно в него,
+    остальные — в base_time со смещением своей корзины.
+    """
+    runs: Dict[Tuple[DateTime, date], List[int]] = defaultdict(list)
+    for group in groups:
+        tz = resolve_timezone(group.timezone, default_tz)
+        if use_group_time and group.hero_time is not None:
+            run_at = next_run(now, tz, group.hero_time)
+        else:
+            offset = bucket_offset(group.id, buckets, window_minutes)
+            run_at = next_run(now, tz, base_time, offset)
+        runs[(run_at.in_timezone("UTC"), run_at.date())].append(group.id)
+    return dict(runs)
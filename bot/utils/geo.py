@@ -0,0 +1,213 @@
+from collections import defaultdict
+from datetime import date, time
+from math import radians, sin, cos, sqrt, atan2, degrees, isfinite, floor, ceil
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+EARTH_RADIUS_M = 6371000
+LOCATION_RADIUS_M = 500
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    if not all(isinstance(x, (int, float)) and -90 <= x <= 90 for x in (lat1, lat2)):
+        raise ValueError("Latitudes must be between -90 and 90 degrees")
+    if not all(isinstance(x, (int, float)) and -180 <= x <= 180 for x in (lon1, lon2)):
+        raise ValueError("Longitudes must be between -180 and 180 degrees")
+    if not all(
+        isinstance(x, (int, float)) and x == x for x in (lat1, lon1, lat2, lon2)
+    ):
+        raise ValueError("Coordinates must be finite numbers")
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    distance = EARTH_RADIUS_M * c
+    return distance
+
+
+def validate_coordinates(latitude: float, longitude: float) -> None:
+    if not (isfinite(latitude) and isfinite(longitude)):
+        raise ValueError("Coordinates must be finite numbers")
+    if not -90 <= latitude <= 90:
+        raise ValueError("Latitudes must be between -90 and 90 degrees")
+    if not -180 <= longitude <= 180:
+        raise ValueError("Longitudes must be between -180 and 180 degrees")
+
+
+def haversine_many(
+    latitude: float,
+    longitude: float,
+    latitudes: "np.ndarray",
+    longitudes: "np.ndarray",
+) -> "np.ndarray":
+    """Расстояния в метрах от точки до массива точек (градусы)."""
+    import numpy as np
+
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes) - np.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bounding_box_mask(
+    latitude: float,
+    longitude: float,
+    latitudes: "np.ndarray",
+    longitudes: "np.ndarray",
+    radius_m: float,
+) -> "np.ndarray":
+    """Грубый отбор точек, попадающих в квадрат вокруг окружности радиуса radius_m."""
+    import numpy as np
+
+    dlat = degrees(radius_m / EARTH_RADIUS_M)
+    dlon = dlat / max(cos(radians(latitude)), 1e-6)
+    # Разница долгот с учётом перехода через 180-й меридиан
+    lon_delta = np.abs((longitudes - longitude + 180) % 360 - 180)
+    return (np.abs(latitudes - latitude) <= dlat) & (lon_delta <= dlon)
+
+
+def nearby_events(
+    latitude: float,
+    longitude: float,
+    events: Sequence[Any],
+    radius_m: float = LOCATION_RADIUS_M,
+) -> List[Tuple[Any, float]]:
+    """Возвращает события в радиусе radius_m, отсортированные по расстоянию.
+
+    События без координат пропускаются.
+    """
+    # NumPy нужен только здесь; импорт откладываем, чтобы не замедлять старт
+    import numpy as np
+
+    validate_coordinates(latitude, longitude)
+    located = [
+        event
+        for event in events
+        if event.latitude is not None and event.longitude is not None
+    ]
+    if not located:
+        return []
+    coordinates = np.array(
+        [(event.latitude, event.longitude) for event in located], dtype=float
+    )
+    candidates = np.flatnonzero(
+        bounding_box_mask(
+            latitude, longitude, coordinates[:, 0], coordinates[:, 1], radius_m
+        )
+    )
+    if not candidates.size:
+        return []
+    distances = haversine_many(
+        latitude, longitude, coordinates[candidates, 0], coordinates[candidates, 1]
+    )
+    within = distances <= radius_m
+    candidates, distances = candidates[within], distances[within]
+    order = np.argsort(distances)
+    return [
+        (located[i], float(distance))
+        for i, distance in zip(candidates[order], distances[order])
+    ]
+
+
+class Venue(NamedTuple):
+    event_id: int
+    latitude: float
+    longitude: float
+    event_date: date
+    event_time: time
+
+
+class VenueIndex:
+    """Сеточный индекс площадок событий за один день.
+
+    Ячейка — квадрат со стороной cell_m по широте; поиск смотрит только
+    ячейки, которые пересекает квадрат вокруг окружности радиуса поиска.
+    """
+
+    def __init__(
+        self, day: date, venues: Iterable[Venue], cell_m: float = LOCATION_RADIUS_M
+    ):
+        self.day = day
+        self.cell_deg = degrees(cell_m / EARTH_RADIUS_M)
+        self.columns = ceil(360 / self.cell_deg)
+        self.cells: Dict[Tuple[int, int], List[Venue]] = defaultdict(list)
+        self.size = 0
+        for venue in venues:
+            if venue.latitude is None or venue.longitude is None:
+                continue
+            self.cells[self._cell(venue.latitude, venue.longitude)].append(venue)
+            self.size += 1
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        column = floor((longitude + 180) / self.cell_deg) % self.columns
+        return floor((latitude + 90) / self.cell_deg), column
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_m: float = LOCATION_RADIUS_M,
+        predicate: Optional[Callable[[Venue], bool]] = None,
+    ) -> Optional[Tuple[Venue, float]]:
+        """Ближайшая площадка в радиусе radius_m, удовлетворяющая predicate."""
+        validate_coordinates(latitude, longitude)
+        dlat = degrees(radius_m / EARTH_RADIUS_M)
+        dlon = min(180.0, dlat / max(cos(radians(latitude)), 1e-6))
+        row, column = self._cell(latitude, longitude)
+        row_span = ceil(dlat / self.cell_deg)
+        column_span = min(ceil(dlon / self.cell_deg), self.columns // 2)
+        candidates = [
+            venue
+            for r in range(row - row_span, row + row_span + 1)
+            for c in range(column - column_span, column + column_span + 1)
+            for venue in self.cells.get((r, c % self.columns), ())
+        ]
+        # Точное расстояние считается векторно только для площадок из ячеек
+        for venue, distance in nearby_events(latitude, longitude, candidates, radius_m):
+            if predicate is None or predicate(venue):
+                return venue, distance
+        return None
+
+
+_venue_index: Optional[VenueIndex] = None
+_venue_index_version = 0
+
+
+def invalidate_venue_index() -> None:
+    """Сбрасывает индекс площадок после создания или удаления события."""
+    global _venue_index, _venue_index_version
+    _venue_index = None
+    _venue_index_version += 1
+
+
+async def get_venue_index(
+    day: date, load_venues: Callable[[], Awaitable[Iterable[Venue]]]
+) -> VenueIndex:
+    """Возвращает индекс площадок на день, перестраивая его при необходимости."""
+    global _venue_index
+    index = _venue_index
+    if index is not None and index.day == day:
+        return index
+    version = _venue_index_version
+    index = VenueIndex(day, await load_venues())
+    # Пока грузили площадки, событие могли создать или удалить
+    if version == _venue_index_version:
+        _venue_index = index
+    return index
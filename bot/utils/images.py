@@ -0,0 +1,79 @@
+from typing import Any, NamedTuple, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
+from bot.core.config import settings
+from bot.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# После стольких подряд ошибок отправки фото рассылка переходит на текст
+IMAGE_FAILURE_LIMIT = settings.image_failure_limit
+
+
+class ImageAsset(NamedTuple):
+    file_id: str
+    file_size: Optional[int]
+
+
+async def validate_image(bot: Bot, file_id: str) -> Optional[ImageAsset]:
+    """Проверяет file_id через getFile; None, если файл недоступен боту."""
+    try:
+        file = await bot.get_file(file_id)
+    except TelegramAPIError as e:
+        logger.warning(f"Image file_id {file_id} failed validation: {e}")
+        return None
+    return ImageAsset(file.file_id, file.file_size)
+
+
+class PhotoBroadcast:
+    """Рассылка сообщения с фото, которая переходит на текст при сбоях.
+
+    После первой успешной отправки используется file_id из ответа Telegram.
+    Получатель, которому не ушло фото, получает текст. Если фото не
+    отправляется IMAGE_FAILURE_LIMIT раз подряд, а текст при этом доходит,
+    остальным сразу отправляется текст без лишних запросов.
+    """
+
+    def __init__(self, file_id: Optional[str], caption: str):
+        self.file_id = file_id
+        self.caption = caption
+        self.failures = 0
+
+    @property
+    def text_only(self) -> bool:
+        return self.file_id is None
+
+    async def send(self, bot: Bot, chat_id: int, reply_markup: Any = None) -> None:
+        photo_error: Optional[TelegramBadRequest] = None
+        if not self.text_only:
+            try:
+                message = await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=self.file_id,
+                    caption=self.caption,
+                    reply_markup=reply_markup,
+                )
+            except TelegramBadRequest as e:
+                photo_error = e
+            else:
+                self.failures = 0
+                if message.photo:
+                    self.file_id = message.photo[-1].file_id
+                return
+        await bot.send_message(
+            chat_id=chat_id, text=self.caption, reply_markup=reply_markup
+        )
+        if photo_error is None:
+            return
+        # Текст дошёл, значит проблема в самом фото, а не в получателе
+        self.failures += 1
+        logger.warning(
+            f"Failed to send photo {self.file_id} to {chat_id} "
+            f"({self.failures}/{IMAGE_FAILURE_LIMIT}): {photo_error}"
+        )
+        if self.failures >= IMAGE_FAILURE_LIMIT:
+            logger.error(
+                f"Photo {self.file_id} keeps failing, switching broadcast to text"
+            )
+            self.file_id = None
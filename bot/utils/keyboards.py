@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Tuple, TypeVar
+
+from bot.core.config import settings
+
+T = TypeVar("T")
+
+EVENT_KEYBOARDS_MAXSIZE = settings.event_keyboards_cache_size
+
+
+def static_keyboard(build: Callable[..., T]) -> Callable[..., T]:
+    """Строит клавиатуру один раз при импорте модуля.
+
+    Аргументы вызова игнорируются: клавиатура не должна от них зависеть.
+    Разметку нельзя изменять после получения — она общая для всех вызовов.
+    """
+    markup = build()
+
+    @wraps(build)
+    def get(*args: Any, **kwargs: Any) -> T:
+        return markup
+
+    return get
+
+
+class KeyboardCache:
+    """LRU-кэш клавиатур по ключу с версией.
+
+    Если версия изменилась (например, у события поменялись сорта пива),
+    клавиатура строится заново.
+    """
+
+    def __init__(self, maxsize: int = EVENT_KEYBOARDS_MAXSIZE):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Tuple[Hashable, Any]]" = OrderedDict()
+
+    def get_or_build(
+        self, key: Hashable, version: Hashable, build: Callable[[], T]
+    ) -> T:
+        item = self._items.get(key)
+        if item is not None and item[0] == version:
+            self._items.move_to_end(key)
+            return item[1]
+        markup = build()
+        self._items[key] = (version, markup)
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return markup
+
+    def invalidate(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+# Клавиатуры одного события (выбор пива) и списков событий
+event_keyboards = KeyboardCache()
+event_list_keyboards = KeyboardCache(maxsize=settings.event_list_keyboards_cache_size)
+
+
+def invalidate_event_keyboards(event_id: int) -> None:
+    """Сбрасывает клавиатуры после создания, изменения или удаления события."""
+    event_keyboards.invalidate(event_id)
+    event_list_keyboards.clear()
@@ -4,6 +4,7 @@ import pendulum
 import traceback
 from typing import Optional
 from logging.handlers import RotatingFileHandler
+from bot.core.config import settings
 
 
 class CustomFormatter(logging.Formatter):
@@ -41,11 +42,9 @@ class CustomFormatter(logging.Formatter):
         return formatter.format(record)
 
 
-def setup_logger(
-    name: str, log_file: str = os.getenv("LOG_FILE", "bot.log")
-) -> logging.Logger:
+def setup_logger(name: str, log_file: str = settings.log_file) -> logging.Logger:
     logger = logging.getLogger(name)
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_level = settings.log_level
     logger.setLevel(getattr(logging, log_level, logging.INFO))
     logger.handlers = []
 
@@ -63,8 +62,7 @@ def setup_logger(
     file_handler.setFormatter(CustomFormatter())
     logger.addHandler(file_handler)
 
-    console_logging = os.getenv("CONSOLE_LOGGING", "true").lower() == "true"
-    if console_logging:
+    if settings.console_logging:
         stream_handler = logging.StreamHandler()
         stream_handler.setLevel(getattr(logging, log_level, logging.INFO))
         stream_handler.setFormatter(CustomFormatter())
@@ -28,6 +28,41 @@ BECOME_HERO_ERROR_MESSAGE = "❌ Ошибка при регистрации. П
 HERO_TOP_MESSAGE = "🏆 Топ-10 героев дня в группе:\n\n{top_list}"
 HERO_TOP_NO_HEROES_MESSAGE = "❌ Пока нет героев дня в этой группе."
 HERO_TOP_ERROR_MESSAGE = "❌ Произошла ошибка. Попробуйте позже."
+ENROLL_HEROES_NOT_ADMIN_MESSAGE = (
+    "❌ Массово добавлять кандидатов могут только администраторы группы."
+)
+ENROLL_HEROES_NOBODY_MESSAGE = (
+    "ℹ️ Некого добавлять. Укажите Telegram ID или @username через пробел "
+    "или выполните команду без аргументов, чтобы добавить администраторов чата."
+)
+ENROLL_HEROES_RESULT_MESSAGE = (
+    "✅ Массовая регистрация кандидатов завершена!\n\n"
+    "📋 Указано: {requested}\n"
+    "➕ Добавлено: {added}\n"
+    "ℹ️ Уже были кандидатами: {existing}\n"
+    "⏳ Не завершили регистрацию: {incomplete}\n"
+    "❓ Не зарегистрированы в боте: {missing}"
+)
+ENROLL_HEROES_INCOMPLETE_MESSAGE = (
+    "\n\nНе завершили регистрацию (нужно пройти /start в личке с ботом): {users}"
+)
+ENROLL_HEROES_UNRESOLVED_MESSAGE = "\n\nНе найдены: {identifiers}"
+ENROLL_HEROES_ERROR_MESSAGE = "❌ Ошибка при массовой регистрации. Попробуйте позже."
+HERO_SCHEDULE_NOT_ADMIN_MESSAGE = (
+    "❌ Время выбора героя могут менять только администраторы группы."
+)
+HERO_SCHEDULE_USAGE_MESSAGE = (
+    "ℹ️ Укажите время и часовой пояс группы, например: "
+    "/hero_schedule 10:00 Europe/Moscow\n"
+    "Вместо времени или пояса можно указать «-», чтобы использовать значение "
+    "по умолчанию."
+)
+HERO_SCHEDULE_UPDATED_MESSAGE = (
+    "✅ Герой дня будет выбираться в {hero_time} ({timezone}). "
+    "Новое расписание вступит в силу в течение часа."
+)
+HERO_SCHEDULE_DEFAULT = "по умолчанию"
+HERO_SCHEDULE_ERROR_MESSAGE = "❌ Ошибка при изменении расписания. Попробуйте позже."
 
 # --- Модуль start ---
 START_WELCOME_MESSAGE = (
@@ -137,26 +172,20 @@ CREATE_EVENT_REQUEST_BEER_OPTIONS_MESSAGE = (
     "🍺 Введите варианты пива через запятую (например, Лагер, IPA):"
 )
 CREATE_EVENT_INVALID_BEER_OPTIONS_MESSAGE = "❌ Введите хотя бы один вариант пива."
-CREATE_EVENT_SUMMARY_MESSAGE = (
-    "🎉 Событие создано!\n\n"
-    "📅 Название: {name}\n"
-    "🗓 Дата: {date}\n"
-    "⏰ Время: {time}\n"
-    "📍 Место: {location}\n"
-    "📝 Описание: {description}\n"
-    "🖼️ Изображение: {image}\n"
-    "🍺 Выбор пива: {beer_choice}\n"
-    "🍺 Варианты пива: {beer_options}\n"
-)
+CREATE_EVENT_SUMMARY_MESSAGE = "🎉 Событие создано!\n\n{card}"
 CREATE_EVENT_NOTIFICATION_MESSAGE = (
     "🎉 Новое событие!\n\n"
-    "📅 Название: {name}\n"
-    "🗓 Дата: {date}\n"
-    "⏰ Время: {time}\n"
-    "📍 Место: {location}\n"
-    "📝 Описание: {description}\n"
-    "🍺 Выбор пива: {beer_choice}\n"
-)
+    "📝 {name}\n"
+    "📅 {date}\n"
+    "🕐 {time}\n"
+    "{location}"
+    "{description}"
+    "{beer}"
+    "\nУвидимся на событии! 🎊"
+)
+CREATE_EVENT_NOTIFICATION_LOCATION = "📍 {location}\n"
+CREATE_EVENT_NOTIFICATION_DESCRIPTION = "📖 {description}\n"
+CREATE_EVENT_NOTIFICATION_BEER_OPTIONS = "🍻 Варианты пива: {options}\n"
 CREATE_EVENT_BUTTON_NOTIFY_TEXT = "🔔 Уведомить всех"
 CREATE_EVENT_BUTTON_NO_NOTIFY_TEXT = "🔕 Без уведомления"
 CREATE_EVENT_BUTTON_CANCEL_TEXT = "❌ Отмена"
@@ -164,10 +193,26 @@ CREATE_EVENT_ERROR_MESSAGE = (
     "❌ Произошла ошибка при создании события. Попробуйте позже."
 )
 
+# --- Карточка события ---
+EVENT_CARD_DETAILS = (
+    "📝 Название: {name}\n"
+    "📅 Дата: {date}\n"
+    "🕐 Время: {time}\n"
+    "📍 Место: {location}\n"
+    "📖 Описание: {description}\n"
+    "🖼️ Изображение: {image}\n"
+    "🍺 Выбор пива: {beer_choice}\n"
+    "{beer}"
+)
+EVENT_CARD_BEER_OPTIONS = "🍻 Варианты: {options}\n"
+EVENT_CARD_LAGER = "🍺 Пиво: Лагер\n"
+EVENT_CARD_NOT_SPECIFIED = "Не указано"
+
 # --- Модуль events_list ---
 EVENTS_LIST_HEADER = (
-    "📅 Список предстоящих событий в группе (страница {page} из {total_pages}):\n\n"
+    "📅 Список предстоящих событий (страница {page} из {total_pages}):\n\n"
 )
+EVENTS_LIST_ITEM = "🆔 ID: {id}\n{card}" + "─" * 30 + "\n"
 EVENTS_LIST_NO_EVENTS_MESSAGE = "❌ Нет предстоящих событий в этой группе."
 EVENTS_LIST_EVENT_INFO = (
     "📅 {name}\n"
@@ -233,9 +278,9 @@ NO_BIRTHDAY_MESSAGE = "Сегодня нет именинников. 😊"
 
 # --- Модуль bartender_notification ---
 BARTENDER_NOTIFICATION_MESSAGE = (
-    "🍺 Событие: {event_name}\n"
-    "⏰ Начало: {event_time}\n"
-    "📍 Место: {location}\n"
+    "🍺 Заказы на событие '{name}' ({date} @ {time}):\n"
     "👥 Участников: {participant_count}\n"
-    "🍺 Выборы пива:\n{beer_counts}\n"
+    "{orders}"
 )
+BARTENDER_ORDER_LINE = "🍻 {beer}: {count}\n"
+BARTENDER_NO_ORDERS_MESSAGE = "🍻 Нет заказов."
@@ -0,0 +1,173 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from bot.core.config import settings
+from bot.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Имя текущего обработчика (или задачи Celery), к которому относятся SQL-запросы
+current_handler: ContextVar[str] = ContextVar("current_handler", default="unknown")
+
+HANDLER_LATENCY = Histogram(
+    "bot_handler_latency_seconds",
+    "Handler execution time",
+    ["router", "handler"],
+)
+HANDLER_ERRORS = Counter(
+    "bot_handler_errors_total",
+    "Handler executions that raised an exception",
+    ["router", "handler"],
+)
+TELEGRAM_API_LATENCY = Histogram(
+    "bot_telegram_api_latency_seconds",
+    "Telegram Bot API call latency",
+    ["method"],
+)
+TELEGRAM_API_ERRORS = Counter(
+    "bot_telegram_api_errors_total",
+    "Telegram Bot API calls that raised an exception",
+    ["method"],
+)
+DB_STATEMENTS = Counter(
+    "bot_db_statements_total",
+    "SQL statements executed",
+    ["handler"],
+)
+DB_STATEMENT_LATENCY = Histogram(
+    "bot_db_statement_latency_seconds",
+    "SQL statement execution time",
+    ["handler"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+DB_CONNECTION_HOLD = Histogram(
+    "bot_db_connection_hold_seconds",
+    "Time a pooled connection stays checked out",
+    ["handler"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_CONNECTIONS_CHECKED_OUT = Gauge(
+    "bot_db_connections_checked_out",
+    "Pooled connections currently checked out",
+)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Замеряет время выполнения обработчиков по роутеру (модулю) и имени функции."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        callback = getattr(handler_object, "callback", None)
+        router_name = getattr(callback, "__module__", "unknown").rsplit(".", 1)[-1]
+        handler_name = getattr(callback, "__name__", "unknown")
+        token = current_handler.set(f"{router_name}.{handler_name}")
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.labels(router_name, handler_name).inc()
+            raise
+        finally:
+            HANDLER_LATENCY.labels(router_name, handler_name).observe(
+                time.perf_counter() - start
+            )
+            current_handler.reset(token)
+
+
+class TelegramMetricsMiddleware(BaseRequestMiddleware):
+    """Замеряет задержку вызовов Telegram Bot API по имени метода."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        method_name = type(method).__name__
+        start = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception:
+            TELEGRAM_API_ERRORS.labels(method_name).inc()
+            raise
+        finally:
+            TELEGRAM_API_LATENCY.labels(method_name).observe(
+                time.perf_counter() - start
+            )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключает к движку метрики SQL-запросов и учёт занятых соединений."""
+    sync_engine = engine.sync_engine
+    hold_warning = settings.db_connection_hold_warning_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        start = conn.info["query_start_time"].pop()
+        handler_name = current_handler.get()
+        DB_STATEMENTS.labels(handler_name).inc()
+        DB_STATEMENT_LATENCY.labels(handler_name).observe(time.perf_counter() - start)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout"] = (
+            time.perf_counter(),
+            current_handler.get(),
+        )
+        DB_CONNECTIONS_CHECKED_OUT.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checkout = connection_record.info.pop("checkout", None)
+        if checkout is None:
+            return
+        started, handler_name = checkout
+        held = time.perf_counter() - started
+        DB_CONNECTIONS_CHECKED_OUT.dec()
+        DB_CONNECTION_HOLD.labels(handler_name).observe(held)
+        if held > hold_warning:
+            logger.warning(
+                f"Connection held for {held * 1000:.0f} ms by {handler_name}"
+            )
+
+
+def start_metrics_server(port: int = settings.metrics_port) -> None:
+    """Запускает HTTP-эндпоинт Prometheus в текстовом формате."""
+    try:
+        start_http_server(port)
+        logger.info(f"Prometheus metrics endpoint started on port {port}")
+    except OSError as e:
+        logger.error(f"Failed to start metrics endpoint on port {port}: {e}")
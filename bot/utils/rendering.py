@@ -0,0 +1,159 @@
+from datetime import date, time
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from bot.core.config import settings
+from bot.utils.messages import (
+    BARTENDER_NO_ORDERS_MESSAGE,
+    BARTENDER_NOTIFICATION_MESSAGE,
+    BARTENDER_ORDER_LINE,
+    CREATE_EVENT_NOTIFICATION_BEER_OPTIONS,
+    CREATE_EVENT_NOTIFICATION_DESCRIPTION,
+    CREATE_EVENT_NOTIFICATION_LOCATION,
+    CREATE_EVENT_NOTIFICATION_MESSAGE,
+    CREATE_EVENT_SUMMARY_MESSAGE,
+    EVENT_CARD_BEER_OPTIONS,
+    EVENT_CARD_DETAILS,
+    EVENT_CARD_LAGER,
+    EVENT_CARD_NOT_SPECIFIED,
+    EVENTS_LIST_HEADER,
+    EVENTS_LIST_ITEM,
+)
+
+EVENT_CARD_CACHE_SIZE = settings.event_card_cache_size
+
+# Варианты карточки события
+SUMMARY = "summary"
+NOTIFICATION = "notification"
+LIST_ITEM = "list_item"
+
+
+class EventSnapshot(NamedTuple):
+    """Поля события, из которых строится его карточка."""
+
+    id: int
+    name: str
+    event_date: date
+    event_time: time
+    location_name: Optional[str]
+    description: Optional[str]
+    has_image: bool
+    has_beer_choice: bool
+    beer_option_1: Optional[str]
+    beer_option_2: Optional[str]
+
+    @classmethod
+    def from_event(cls, event) -> "EventSnapshot":
+        return cls(
+            event.id,
+            event.name,
+            event.event_date,
+            event.event_time,
+            event.location_name,
+            event.description,
+            bool(event.image_file_id),
+            event.has_beer_choice,
+            event.beer_option_1,
+            event.beer_option_2,
+        )
+
+    @property
+    def date_text(self) -> str:
+        return self.event_date.strftime("%d.%m.%Y")
+
+    @property
+    def time_text(self) -> str:
+        return self.event_time.strftime("%H:%M")
+
+
+def _render_details(event: EventSnapshot) -> str:
+    if event.has_beer_choice and event.beer_option_1 and event.beer_option_2:
+        beer = EVENT_CARD_BEER_OPTIONS.format(
+            options=f"{event.beer_option_1}, {event.beer_option_2}"
+        )
+    elif not event.has_beer_choice:
+        beer = EVENT_CARD_LAGER
+    else:
+        beer = ""
+    return EVENT_CARD_DETAILS.format(
+        name=event.name,
+        date=event.date_text,
+        time=event.time_text,
+        location=event.location_name or EVENT_CARD_NOT_SPECIFIED,
+        description=event.description or EVENT_CARD_NOT_SPECIFIED,
+        image="Есть" if event.has_image else "Нет",
+        beer_choice="Да" if event.has_beer_choice else "Нет",
+        beer=beer,
+    )
+
+
+def _render_notification(event: EventSnapshot) -> str:
+    if event.has_beer_choice:
+        beer = CREATE_EVENT_NOTIFICATION_BEER_OPTIONS.format(
+            options=f"{event.beer_option_1}, {event.beer_option_2}"
+        )
+    else:
+        beer = EVENT_CARD_LAGER
+    return CREATE_EVENT_NOTIFICATION_MESSAGE.format(
+        name=event.name,
+        date=event.date_text,
+        time=event.time_text,
+        location=(
+            CREATE_EVENT_NOTIFICATION_LOCATION.format(location=event.location_name)
+            if event.location_name
+            else ""
+        ),
+        description=(
+            CREATE_EVENT_NOTIFICATION_DESCRIPTION.format(description=event.description)
+            if event.description
+            else ""
+        ),
+        beer=beer,
+    )
+
+
+@lru_cache(maxsize=EVENT_CARD_CACHE_SIZE)
+def render_event_card(event: EventSnapshot, variant: str) -> str:
+    """Текст карточки события в нужном варианте.
+
+    Ключ кэша — весь снимок события, поэтому изменённое событие
+    рендерится заново, а рассылка форматирует текст один раз.
+    """
+    if variant == SUMMARY:
+        return CREATE_EVENT_SUMMARY_MESSAGE.format(card=_render_details(event))
+    if variant == NOTIFICATION:
+        return _render_notification(event)
+    if variant == LIST_ITEM:
+        return EVENTS_LIST_ITEM.format(id=event.id, card=_render_details(event))
+    raise ValueError(f"Unknown event card variant: {variant}")
+
+
+def render_event(event, variant: str) -> str:
+    return render_event_card(EventSnapshot.from_event(event), variant)
+
+
+def render_events_page(events: Iterable, page: int, total_pages: int) -> str:
+    """Страница списка событий; page считается с нуля."""
+    return EVENTS_LIST_HEADER.format(page=page + 1, total_pages=total_pages) + "".join(
+        render_event(event, LIST_ITEM) for event in events
+    )
+
+
+def render_bartender_orders(
+    event, participant_count: int, beer_counts: Dict[str, int]
+) -> str:
+    snapshot = EventSnapshot.from_event(event)
+    if participant_count == 0:
+        orders = BARTENDER_NO_ORDERS_MESSAGE
+    else:
+        orders = "".join(
+            BARTENDER_ORDER_LINE.format(beer=beer, count=count)
+            for beer, count in beer_counts.items()
+        )
+    return BARTENDER_NOTIFICATION_MESSAGE.format(
+        name=snapshot.name,
+        date=snapshot.date_text,
+        time=snapshot.time_text,
+        participant_count=participant_count,
+        orders=orders,
+    )
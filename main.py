@@ -1,24 +1,21 @@
 import asyncio
-import os
 import traceback
 from datetime import datetime
 from typing import Optional, Tuple
 from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.dispatcher.middlewares.base import BaseMiddleware
 from aiogram.types import Update, Message, CallbackQuery
-from bot.core.database import init_db, check_db_connection
-from bot.handlers import (
-    start,
-    beer_selection,
-    profile,
-    event_creation,
-    events_list,
-    delete_event,
-    hero_of_the_day,
-)
+from bot.core.config import settings
+from bot.core.database import init_db, check_db_connection, current_actor
+from bot.handlers import load_routers
 from bot.utils.logger import setup_logger
-from dotenv import load_dotenv
+from bot.utils.metrics import (
+    HandlerMetricsMiddleware,
+    TelegramMetricsMiddleware,
+    start_metrics_server,
+)
 
 logger = setup_logger(__name__)
 
@@ -85,9 +82,14 @@ class ErrorInfo:
 
 
 class ErrorNotificationMiddleware(BaseMiddleware):
-    def __init__(self, bot_token: str, group_chat_id: str):
+    def __init__(
+        self,
+        bot_token: str,
+        group_chat_id: str,
+        session: Optional[BaseSession] = None,
+    ):
         super().__init__()
-        self.bot = Bot(token=bot_token)
+        self.bot = Bot(token=bot_token, session=session)
         self.group_chat_id = group_chat_id
 
     async def __call__(self, handler, event, data):
@@ -155,35 +157,60 @@ class ErrorNotificationMiddleware(BaseMiddleware):
             raise  # Перебрасываем исключение для дальнейшей обработки aiogram
 
 
+class DatabaseActorMiddleware(BaseMiddleware):
+    """Запоминает пользователя апдейта для маршрутизации чтений с реплики."""
+
+    async def __call__(self, handler, event, data):
+        user = data.get("event_from_user")
+        token = current_actor.set(user.id if user else None)
+        try:
+            return await handler(event, data)
+        finally:
+            current_actor.reset(token)
+
+
+def build_dispatcher(
+    bot_token: str, group_chat_id: str, session: Optional[BaseSession] = None
+) -> Dispatcher:
+    """Собирает Dispatcher со всеми роутерами и middleware бота."""
+    dp = Dispatcher(storage=MemoryStorage())
+    dp.update.middleware(
+        ErrorNotificationMiddleware(bot_token, group_chat_id, session=session)
+    )
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
+    dp.message.middleware(DatabaseActorMiddleware())
+    dp.callback_query.middleware(DatabaseActorMiddleware())
+    # Модули обработчиков импортируются только при сборке Dispatcher
+    dp.include_routers(*load_routers())
+    return dp
+
+
 async def main():
     try:
-        load_dotenv()
-        bot_token = os.getenv("BOT_TOKEN")
-        group_chat_id = os.getenv("FOR_LOGS")
+        bot_token = settings.bot_token
+        group_chat_id = settings.for_logs
         if not bot_token:
             logger.error("BOT_TOKEN not found in environment variables. Exiting...")
             return
         if not group_chat_id:
             logger.error("FOR_LOGS not found in environment variables. Exiting...")
             return
+        if not settings.admin_telegram_id:
+            logger.error(
+                "ADMIN_TELEGRAM_ID not found in environment variables. Exiting..."
+            )
+            return
         if not await check_db_connection():
             logger.error(
                 "Failed to connect to the database during initial check. Exiting..."
             )
             return
         await init_db()
+        start_metrics_server()
         bot = Bot(token=bot_token)
-        dp = Dispatcher(storage=MemoryStorage())
-        dp.update.middleware(ErrorNotificationMiddleware(bot_token, group_chat_id))
-        dp.include_routers(
-            start.router,
-            beer_selection.router,
-            profile.router,
-            event_creation.router,
-            events_list.router,
-            delete_event.router,
-            hero_of_the_day.router,
-        )
+        bot.session.middleware(TelegramMetricsMiddleware())
+        dp = build_dispatcher(bot_token, group_chat_id)
         logger.info("Bot successfully initialized and starting polling...")
         await bot.delete_webhook(drop_pending_updates=True)
         await dp.start_polling(bot)
@@ -0,0 +1,150 @@
+"""Общие заглушки для тестов и бенчмарков: Bot API без сети, апдейты
+Telegram и асинхронный интерфейс сессии поверх синхронной."""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+from itertools import count
+from typing import Any, AsyncGenerator, Dict, List, Optional, get_args
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import Chat, Message, Update, User
+from sqlalchemy.orm import Session
+
+FAKE_BOT_TOKEN = "123456:fake-token"
+
+_update_ids = count(1)
+_message_ids = count(1)
+
+
+class FakeTelegramSession(BaseSession):
+    """Сессия Bot API без сети: записывает вызовы и возвращает правдоподобные ответы."""
+
+    def __init__(self, latency: float = 0.0, record: bool = False):
+        super().__init__()
+        self.latency = latency
+        self.record = record
+        self.calls: Counter = Counter()
+        self.requests: List[TelegramMethod[Any]] = []
+        self._message_ids = count(1)
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        self.calls[type(method).__name__] += 1
+        if self.record:
+            self.requests.append(method)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        returning = method.__returning__
+        if returning is Message or Message in get_args(returning):
+            return self._message(method)
+        if returning is User:
+            return User(id=1, is_bot=True, first_name="Test", username="test_bot")
+        return True
+
+    def _message(self, method: TelegramMethod[Any]) -> Message:
+        chat_id = getattr(method, "chat_id", None) or 0
+        return Message(
+            message_id=getattr(method, "message_id", None) or next(self._message_ids),
+            date=datetime.now(),
+            chat=Chat(id=int(chat_id), type="private" if int(chat_id) > 0 else "group"),
+            text=getattr(method, "text", None),
+        )
+
+    @property
+    def messages_sent(self) -> int:
+        return sum(
+            n for name, n in self.calls.items() if name.startswith(("Send", "Edit"))
+        )
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.requests.clear()
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+
+def make_fake_bot(latency: float = 0.0, record: bool = False) -> Bot:
+    return Bot(token=FAKE_BOT_TOKEN, session=FakeTelegramSession(latency, record))
+
+
+class SyncSessionAdapter:
+    """Асинхронный интерфейс AsyncSession поверх синхронной сессии."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, *args: Any, **kwargs: Any):
+        return self.session.execute(*args, **kwargs)
+
+    async def commit(self) -> None:
+        self.session.commit()
+
+    async def rollback(self) -> None:
+        self.session.rollback()
+
+
+def _user(telegram_id: int) -> Dict[str, Any]:
+    return {"id": telegram_id, "is_bot": False, "first_name": f"Test{telegram_id}"}
+
+
+def _chat(chat_id: int) -> Dict[str, Any]:
+    if chat_id > 0:
+        return {"id": chat_id, "type": "private"}
+    return {"id": chat_id, "type": "supergroup", "title": f"Test {chat_id}"}
+
+
+def message_update(bot: Bot, telegram_id: int, chat_id: int, **fields) -> Update:
+    message = {
+        "message_id": next(_message_ids),
+        "date": int(time.time()),
+        "chat": _chat(chat_id),
+        "from": _user(telegram_id),
+        **fields,
+    }
+    return Update.model_validate(
+        {"update_id": next(_update_ids), "message": message}, context={"bot": bot}
+    )
+
+
+def command_update(bot: Bot, telegram_id: int, chat_id: int, text: str) -> Update:
+    entities = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+    return message_update(bot, telegram_id, chat_id, text=text, entities=entities)
+
+
+def callback_update(bot: Bot, telegram_id: int, data: str) -> Update:
+    callback = {
+        "id": str(next(_update_ids)),
+        "from": _user(telegram_id),
+        "chat_instance": "test",
+        "data": data,
+        "message": {
+            "message_id": next(_message_ids),
+            "date": int(time.time()),
+            "chat": _chat(telegram_id),
+            "text": "test",
+        },
+    }
+    return Update.model_validate(
+        {"update_id": next(_update_ids), "callback_query": callback},
+        context={"bot": bot},
+    )
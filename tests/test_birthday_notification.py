@@ -0,0 +1,90 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from tests.support import make_fake_bot
+from bot.core.models import Group, GroupUser, User
+from bot.repositories.group_user_repo import GroupUserRepository
+from bot.tasks import birthday_notification
+from bot.tasks.birthday_notification import send_birthday_greetings
+
+TODAY = date(2025, 6, 1)
+
+
+@pytest.fixture
+def members(session):
+    """Две группы; в каждой один именинник, во второй ещё и не именинник."""
+    session.session.execute(
+        insert(Group),
+        [
+            {"id": 1, "chat_id": -101, "name": "one"},
+            {"id": 2, "chat_id": -102, "name": "two"},
+        ],
+    )
+    session.session.execute(
+        insert(User),
+        [
+            {
+                "id": 1,
+                "telegram_id": 1001,
+                "name": "Аня",
+                "username": "anya",
+                "birth_date": date(1990, 6, 1),
+            },
+            {
+                "id": 2,
+                "telegram_id": 1002,
+                "name": "Боря",
+                "username": None,
+                "birth_date": date(1991, 6, 1),
+            },
+            {
+                "id": 3,
+                "telegram_id": 1003,
+                "name": "Вера",
+                "username": "vera",
+                "birth_date": date(1992, 7, 1),
+            },
+        ],
+    )
+    session.session.execute(
+        insert(GroupUser),
+        [
+            {"group_id": 1, "user_id": 1},
+            {"group_id": 2, "user_id": 2},
+            {"group_id": 2, "user_id": 3},
+        ],
+    )
+    session.session.commit()
+    return session
+
+
+def test_birthday_members_limited_to_groups(members):
+    found = asyncio.run(GroupUserRepository.get_birthday_members(members, 1, 6, [2]))
+
+    assert [(chat_id, user.name) for chat_id, user in found] == [(-102, "Боря")]
+
+
+def test_birthday_members_in_all_groups(members):
+    found = asyncio.run(GroupUserRepository.get_birthday_members(members, 1, 6))
+
+    assert sorted(chat_id for chat_id, _ in found) == [-102, -101]
+
+
+def test_greetings_sent_only_to_bucket_groups(members, monkeypatch):
+    @asynccontextmanager
+    async def session_scope():
+        yield members
+
+    monkeypatch.setattr(birthday_notification, "session_scope", session_scope)
+    bot = make_fake_bot(record=True)
+
+    asyncio.run(send_birthday_greetings(bot, TODAY, group_ids=[1]))
+
+    sent = bot.session.requests
+    assert [(m.chat_id, m.text) for m in sent] == [
+        (-101, birthday_notification.BIRTHDAY_MESSAGE.format(mentions="@anya"))
+    ]
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from aiogram import Dispatcher
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.utils.callbacks import (
+    LEGACY_BEER_CHOICE,
+    LEGACY_NEXT_PAGE,
+    LEGACY_PREV_PAGE,
+    BeerChoiceCallback,
+    CallbackRouter,
+    DeleteEventCallback,
+    EventsPageCallback,
+    SelectEventCallback,
+    StartCallback,
+    legacy_event_id,
+)
+from tests.support import callback_update, make_fake_bot
+
+TELEGRAM_ID = 1001
+
+
+def build_dispatcher():
+    """Роутер с обработчиками, записывающими полученный callback_data."""
+    router = CallbackRouter()
+    calls = []
+    middleware_calls = []
+
+    def record(name):
+        async def handler(callback_query, callback_data=None, legacy_beer=None):
+            calls.append((name, callback_data, legacy_beer))
+
+        return handler
+
+    @router.callback_query.middleware()
+    async def count(handler, event, data):
+        middleware_calls.append(event.data)
+        return await handler(event, data)
+
+    router.callback_query(StartCallback.filter())(record("start"))
+    # Один обработчик под двумя фильтрами, как в модулях обработчиков
+    select = record("select")
+    router.callback_query(SelectEventCallback.filter())(select)
+    router.callback_query(legacy_event_id("select_event_", SelectEventCallback))(select)
+    beer = record("beer")
+    router.callback_query(BeerChoiceCallback.filter())(beer)
+    router.callback_query(LEGACY_BEER_CHOICE)(beer)
+    delete = record("delete")
+    router.callback_query(DeleteEventCallback.filter())(delete)
+    router.callback_query(legacy_event_id("delete_event_", DeleteEventCallback))(delete)
+    page = record("page")
+    router.callback_query(EventsPageCallback.filter())(page)
+    router.callback_query(LEGACY_NEXT_PAGE)(page)
+    router.callback_query(LEGACY_PREV_PAGE)(page)
+
+    dp = Dispatcher(storage=MemoryStorage())
+    dp.include_router(router)
+    return dp, calls, middleware_calls
+
+
+def press(data):
+    dp, calls, middleware_calls = build_dispatcher()
+    bot = make_fake_bot()
+    result = asyncio.run(dp.feed_update(bot, callback_update(bot, TELEGRAM_ID, data)))
+    return result, calls, middleware_calls
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (
+            SelectEventCallback(event_id=7).pack(),
+            ("select", SelectEventCallback(event_id=7), None),
+        ),
+        ("select_event_7", ("select", SelectEventCallback(event_id=7), None)),
+        ("delete_event_7", ("delete", DeleteEventCallback(event_id=7), None)),
+        (
+            "beer_7_Светлое_нефильтрованное",
+            (
+                "beer",
+                BeerChoiceCallback(event_id=7, option=0),
+                "Светлое_нефильтрованное",
+            ),
+        ),
+        ("next_page_2", ("page", EventsPageCallback(page=3), None)),
+        ("prev_page_2", ("page", EventsPageCallback(page=1), None)),
+    ],
+)
+def test_new_and_legacy_data_reach_same_handler(data, expected):
+    _, calls, middleware_calls = press(data)
+
+    assert calls == [expected]
+    assert middleware_calls == [data]
+
+
+@pytest.mark.parametrize(
+    "data", ["select_event_x", "beer_7", "prev_page_0", "se:!!", "unknown"]
+)
+def test_malformed_data_is_unhandled(data):
+    result, calls, _ = press(data)
+
+    assert result is UNHANDLED
+    assert calls == []
+
+
+def test_packed_roundtrip():
+    data = BeerChoiceCallback(event_id=2**32 - 1, option=1).pack()
+
+    assert BeerChoiceCallback.unpack(data) == BeerChoiceCallback(
+        event_id=2**32 - 1, option=1
+    )
+    assert StartCallback().pack() == "cmd_start"
@@ -0,0 +1,45 @@
+from datetime import time
+
+import pendulum
+
+from bot.tasks.daily_jobs import (
+    BIRTHDAY_CHECK_TASK,
+    HERO_SELECTION_TASK,
+    build_daily_jobs,
+)
+from bot.utils.daily_schedule import GroupSchedule
+
+NOW = pendulum.datetime(2025, 6, 1, 3, 0, tz="UTC")
+GROUPS = [
+    GroupSchedule(1, None, None),
+    GroupSchedule(2, None, "Asia/Vladivostok"),
+    GroupSchedule(3, time(20, 0), "Europe/Kaliningrad"),
+    GroupSchedule(4, None, "America/New_York"),
+    GroupSchedule(5, None, None),
+]
+
+
+def jobs_of(task_name, jobs):
+    return [job for job in jobs if job["task_name"] == task_name]
+
+
+def test_birthday_check_spread_by_bucket():
+    birthdays = jobs_of(BIRTHDAY_CHECK_TASK, build_daily_jobs(GROUPS, NOW))
+
+    planned = sorted(g for job in birthdays for g in job["args"][1])
+    assert planned == [group.id for group in GROUPS]
+    assert len(birthdays) > 1
+    for job in birthdays:
+        assert NOW < job["run_at"] <= NOW.add(days=1)
+
+
+def test_hero_selection_covers_every_group_once():
+    heroes = jobs_of(HERO_SELECTION_TASK, build_daily_jobs(GROUPS, NOW))
+
+    planned = sorted(g for job in heroes for g in job["args"][1])
+    assert planned == [group.id for group in GROUPS]
+    assert len(heroes) > 1
+
+
+def test_no_groups_no_jobs():
+    assert build_daily_jobs([], NOW) == []
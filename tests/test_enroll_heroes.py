@@ -0,0 +1,82 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from bot.core.models import User
+from bot.handlers.hero_of_the_day import (
+    is_registration_complete,
+    parse_enroll_arguments,
+    unresolved_identifiers,
+)
+from bot.repositories.group_user_repo import GroupUserRepository
+
+
+class InsertedRows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class CompilingSession:
+    """Компилирует выражение для Postgres и возвращает по строке на кандидата."""
+
+    def __init__(self):
+        self.params = []
+
+    async def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.params.append(compiled.params)
+        user_ids = [v for k, v in compiled.params.items() if k.startswith("user_id")]
+        return InsertedRows([(i,) for i in user_ids])
+
+    async def commit(self):
+        pass
+
+
+def test_parse_enroll_arguments_drops_repeats():
+    telegram_ids, usernames = parse_enroll_arguments(
+        "101, 102 101 @Alice alice @bob,@ @ALICE"
+    )
+
+    assert telegram_ids == [101, 102]
+    assert usernames == ["Alice", "bob"]
+
+
+def test_unresolved_identifiers_lists_only_unknown():
+    users = [
+        User(id=1, telegram_id=101, username="Alice"),
+        User(id=2, telegram_id=102, username=None),
+    ]
+
+    unresolved = unresolved_identifiers([101, 102, 103], ["alice", "bob"], users)
+
+    assert unresolved == ["103", "@bob"]
+
+
+def test_registration_complete_requires_name_and_birth_date():
+    assert is_registration_complete(
+        User(id=1, telegram_id=101, name="Аня", birth_date=date(1990, 1, 1))
+    )
+    assert not is_registration_complete(User(id=2, telegram_id=102, name="Боря"))
+    assert not is_registration_complete(
+        User(id=3, telegram_id=103, name="", birth_date=date(1990, 1, 1))
+    )
+
+
+def test_add_candidates_counts_each_user_once():
+    session = CompilingSession()
+
+    added = asyncio.run(GroupUserRepository.add_candidates(session, 1, [5, 6, 5, 5]))
+
+    assert added == 2
+    assert sorted(v for k, v in session.params[0].items() if "user_id" in k) == [5, 6]
+
+
+def test_add_candidates_without_users_skips_query():
+    session = CompilingSession()
+
+    assert asyncio.run(GroupUserRepository.add_candidates(session, 1, [])) == 0
+    assert session.params == []
@@ -0,0 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, time
+from types import SimpleNamespace
+
+from tests.support import make_fake_bot
+from bot.core.config import settings
+from bot.core.models import Event
+from bot.handlers import event_creation
+from bot.repositories.user_repo import UserRepository
+
+USERS = [SimpleNamespace(telegram_id=1000 + i) for i in range(3)]
+
+
+def test_broadcast_paced_after_session_released(monkeypatch):
+    log = []
+
+    @asynccontextmanager
+    async def session_scope():
+        log.append("open")
+        yield None
+        log.append("close")
+
+    async def get_all_users(session, limit=None):
+        return USERS
+
+    async def sleep(delay):
+        log.append(("sleep", delay))
+
+    monkeypatch.setattr(event_creation, "session_scope", session_scope)
+    monkeypatch.setattr(UserRepository, "get_all_users", staticmethod(get_all_users))
+    monkeypatch.setattr(event_creation.asyncio, "sleep", sleep)
+    monkeypatch.setattr(settings, "broadcast_rate_limit", 20.0)
+    bot = make_fake_bot(record=True)
+    event = Event(
+        id=1,
+        name="event",
+        event_date=date(2025, 6, 1),
+        event_time=time(19, 0),
+        image_file_id=None,
+    )
+
+    asyncio.run(event_creation.send_event_notifications(bot, event))
+
+    assert [m.chat_id for m in bot.session.requests] == [1000, 1001, 1002]
+    assert log == ["open", "close"] + [("sleep", 1 / 20)] * len(USERS)
@@ -0,0 +1,158 @@
+import asyncio
+from datetime import date, time, timedelta
+
+import pytest
+
+from bot.core.schemas import EventCreate
+from bot.repositories.event_repo import EventRepository
+from bot.utils import geo
+from bot.utils.geo import (
+    LOCATION_RADIUS_M,
+    Venue,
+    VenueIndex,
+    get_venue_index,
+    haversine_distance,
+    invalidate_venue_index,
+    nearby_events,
+)
+
+DAY = date(2025, 6, 1)
+CENTER = (55.7558, 37.6173)
+# Около 111 м на тысячную градуса широты
+NEAR = Venue(1, 55.7568, 37.6173, DAY, time(19, 0))
+FAR = Venue(2, 55.7588, 37.6173, DAY, time(19, 0))
+OUTSIDE = Venue(3, 55.7658, 37.6173, DAY, time(19, 0))
+
+
+@pytest.fixture(autouse=True)
+def reset_venue_index():
+    invalidate_venue_index()
+    yield
+    invalidate_venue_index()
+
+
+def test_nearby_events_sorted_within_radius():
+    venues = [FAR, Venue(6, None, None, DAY, time(19, 0)), OUTSIDE, NEAR]
+
+    found = nearby_events(*CENTER, venues)
+
+    assert [venue for venue, _ in found] == [NEAR, FAR]
+    for venue, distance in found:
+        assert distance == pytest.approx(
+            haversine_distance(*CENTER, venue.latitude, venue.longitude)
+        )
+
+
+def test_nearby_events_without_candidates():
+    assert nearby_events(*CENTER, []) == []
+    assert nearby_events(*CENTER, [OUTSIDE]) == []
+
+
+def test_nearest_picks_closest_venue():
+    index = VenueIndex(DAY, [FAR, OUTSIDE, NEAR])
+
+    venue, distance = index.nearest(*CENTER)
+
+    assert venue == NEAR
+    assert distance == pytest.approx(haversine_distance(*CENTER, 55.7568, 37.6173))
+
+
+def test_nearest_skips_venues_rejected_by_predicate():
+    index = VenueIndex(DAY, [NEAR, FAR])
+
+    venue, _ = index.nearest(*CENTER, predicate=lambda v: v.event_id != NEAR.event_id)
+
+    assert venue == FAR
+
+
+def test_nearest_respects_radius():
+    index = VenueIndex(DAY, [OUTSIDE])
+
+    assert haversine_distance(*CENTER, OUTSIDE.latitude, OUTSIDE.longitude) > (
+        LOCATION_RADIUS_M
+    )
+    assert index.nearest(*CENTER) is None
+    assert index.nearest(*CENTER, radius_m=2000)[0] == OUTSIDE
+
+
+def test_nearest_across_antimeridian():
+    west = Venue(4, 0.0, -179.9995, DAY, time(19, 0))
+    index = VenueIndex(DAY, [west])
+
+    venue, distance = index.nearest(0.0, 179.9995)
+
+    assert venue == west
+    assert distance < LOCATION_RADIUS_M
+
+
+def test_empty_index():
+    index = VenueIndex(DAY, [Venue(5, None, None, DAY, time(19, 0))])
+
+    assert index.size == 0
+    assert index.nearest(*CENTER) is None
+
+
+def test_nearest_rejects_invalid_coordinates():
+    with pytest.raises(ValueError):
+        VenueIndex(DAY, [NEAR]).nearest(91.0, 0.0)
+
+
+def test_index_is_cached_per_day():
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [NEAR]
+
+    async def scenario():
+        first = await get_venue_index(DAY, load)
+        assert await get_venue_index(DAY, load) is first
+        await get_venue_index(DAY + timedelta(days=1), load)
+
+    asyncio.run(scenario())
+    assert len(loads) == 2
+
+
+def test_index_built_from_stale_load_is_not_cached():
+    async def load():
+        # Событие создали, пока площадки загружались
+        invalidate_venue_index()
+        return [NEAR]
+
+    index = asyncio.run(get_venue_index(DAY, load))
+
+    assert index.size == 1
+    assert geo._venue_index is None
+
+
+def test_index_rebuilt_after_event_create_and_delete(session):
+    tomorrow = date.today() + timedelta(days=1)
+
+    def lookup():
+        index = asyncio.run(
+            get_venue_index(
+                tomorrow,
+                lambda: EventRepository.get_venues_by_date(session, tomorrow),
+            )
+        )
+        return index.nearest(*CENTER)
+
+    assert lookup() is None
+
+    event = asyncio.run(
+        EventRepository.create_event(
+            session,
+            EventCreate(
+                name="event",
+                event_date=tomorrow,
+                event_time=time(19, 0),
+                latitude=NEAR.latitude,
+                longitude=NEAR.longitude,
+                created_by=1,
+            ),
+        )
+    )
+    assert lookup()[0].event_id == event.id
+
+    asyncio.run(EventRepository.delete_event(session, event.id))
+    assert lookup() is None
@@ -0,0 +1,47 @@
+import asyncio
+from datetime import time
+
+import pytest
+from sqlalchemy import insert, select
+
+from bot.core.models import Group
+from bot.handlers.hero_of_the_day import parse_hero_schedule
+from bot.repositories.group_user_repo import GroupUserRepository
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("10:30 Asia/Vladivostok", (time(10, 30), "Asia/Vladivostok")),
+        ("09:00", (time(9, 0), None)),
+        ("- Europe/Kaliningrad", (None, "Europe/Kaliningrad")),
+        ("09:00 -", (time(9, 0), None)),
+        ("-", (None, None)),
+    ],
+)
+def test_parse_hero_schedule(text, expected):
+    assert parse_hero_schedule(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "25:00", "10:00 Mars/Olympus", "1 2 3"])
+def test_parse_hero_schedule_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_hero_schedule(text)
+
+
+def test_update_group_schedule(session):
+    session.session.execute(insert(Group).values(id=1, chat_id=-101, name="group"))
+    session.session.commit()
+
+    updated = asyncio.run(
+        GroupUserRepository.update_group_schedule(
+            session, -101, time(20, 0), "Asia/Vladivostok"
+        )
+    )
+    missing = asyncio.run(
+        GroupUserRepository.update_group_schedule(session, -102, None, None)
+    )
+
+    assert updated and not missing
+    row = session.session.execute(select(Group.hero_time, Group.timezone)).one()
+    assert tuple(row) == (time(20, 0), "Asia/Vladivostok")
@@ -0,0 +1,75 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from aiogram import Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.handlers import beer_selection, load_routers
+from bot.handlers.event_creation import EventCreationStates
+from tests.support import callback_update, make_fake_bot, message_update
+
+TELEGRAM_ID = 1001
+LOCATION = {"latitude": 55.7558, "longitude": 37.6173}
+
+
+@pytest.fixture(scope="module")
+def dispatcher():
+    # Роутеры — синглтоны модулей и подключаются к одному Dispatcher
+    dp = Dispatcher(storage=MemoryStorage())
+    dp.include_routers(*load_routers())
+    return dp
+
+
+@pytest.fixture
+def location_lookups(monkeypatch):
+    """Считает обращения к базе обработчика геопозиции из beer_selection."""
+    calls = []
+
+    @asynccontextmanager
+    async def session_scope():
+        calls.append(1)
+        raise RuntimeError("database is not available in tests")
+        yield
+
+    monkeypatch.setattr(beer_selection, "session_scope", session_scope)
+    return calls
+
+
+def send_location(dp, state=None):
+    bot = make_fake_bot()
+
+    async def scenario():
+        context = dp.fsm.get_context(bot, TELEGRAM_ID, TELEGRAM_ID)
+        await context.set_state(state)
+        await dp.feed_update(
+            bot, message_update(bot, TELEGRAM_ID, TELEGRAM_ID, location=LOCATION)
+        )
+
+    asyncio.run(scenario())
+    return bot.session
+
+
+def test_location_without_state_looks_up_nearest_event(dispatcher, location_lookups):
+    telegram = send_location(dispatcher)
+
+    assert location_lookups == [1]
+    assert telegram.messages_sent == 1
+
+
+def test_location_during_event_creation_is_left_to_event_creation(
+    dispatcher, location_lookups
+):
+    telegram = send_location(dispatcher, EventCreationStates.waiting_for_location)
+
+    assert location_lookups == []
+    assert telegram.messages_sent == 1
+
+
+@pytest.mark.parametrize("data", ["select_event_5", "beer_5_Лагер"])
+def test_legacy_beer_buttons_reach_beer_selection(dispatcher, location_lookups, data):
+    bot = make_fake_bot()
+
+    asyncio.run(dispatcher.feed_update(bot, callback_update(bot, TELEGRAM_ID, data)))
+
+    assert location_lookups == [1]
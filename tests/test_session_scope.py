@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from bot.core import database
+from bot.core.database import session_scope
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Пул SQLite в памяти вместо пула asyncpg у async_session_maker."""
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+
+    class SQLiteSession(Session):
+        def get_bind(self, *args, **kwargs):
+            return engine
+
+    monkeypatch.setattr(
+        database,
+        "async_session_maker",
+        async_sessionmaker(
+            class_=AsyncSession,
+            expire_on_commit=False,
+            sync_session_class=SQLiteSession,
+        ),
+    )
+    yield engine.pool
+    engine.dispose()
+
+
+async def query(session: AsyncSession, pool: QueuePool) -> None:
+    await session.execute(text("SELECT 1"))
+    assert pool.checkedout() == 1
+
+
+def test_connection_released_on_exit(pool):
+    async def handler():
+        async with session_scope() as session:
+            await query(session, pool)
+        assert pool.checkedout() == 0
+
+    asyncio.run(handler())
+    assert pool.checkedout() == 0
+
+
+def test_connection_released_on_early_return(pool):
+    async def handler(registered: bool):
+        async with session_scope() as session:
+            await query(session, pool)
+            if not registered:
+                return "not registered"
+            return "ok"
+
+    async def scenario():
+        assert await handler(registered=False) == "not registered"
+        assert pool.checkedout() == 0
+
+    asyncio.run(scenario())
+
+
+def test_connection_released_on_exception(pool):
+    async def handler():
+        async with session_scope() as session:
+            await query(session, pool)
+            raise ValueError("handler failed")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await handler()
+        assert pool.checkedout() == 0
+
+    asyncio.run(scenario())
+
+
+def test_connection_released_after_failed_statement(pool):
+    async def handler():
+        async with session_scope() as session:
+            await query(session, pool)
+            await session.execute(text("SELECT * FROM missing_table"))
+
+    async def scenario():
+        with pytest.raises(Exception):
+            await handler()
+        assert pool.checkedout() == 0
+
+    asyncio.run(scenario())
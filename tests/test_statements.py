@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from sqlalchemy.sql.cache_key import HasCacheKey
+
+from tests.support import SyncSessionAdapter
+from bot.core.models import Event
+from bot.repositories import statements
+from bot.repositories.beer_repo import BeerRepository
+from bot.repositories.event_repo import EventRepository
+from bot.repositories.group_user_repo import GroupUserRepository
+from bot.repositories.user_repo import UserRepository
+
+HOT_QUERIES = [
+    (
+        lambda s: UserRepository.get_user_by_telegram_id(s, 1001),
+        statements.USER_BY_TELEGRAM_ID,
+    ),
+    (lambda s: UserRepository.get_user_by_id(s, 1), statements.USER_BY_ID),
+    (
+        lambda s: GroupUserRepository.get_user_by_telegram_id(s, 1001),
+        statements.USER_BY_TELEGRAM_ID,
+    ),
+    (lambda s: GroupUserRepository.get_user_by_id(s, 1), statements.USER_BY_ID),
+    (
+        lambda s: GroupUserRepository.get_group_by_chat_id(s, -1001),
+        statements.GROUP_BY_CHAT_ID,
+    ),
+    (lambda s: EventRepository.get_event_by_id(s, 1), statements.EVENT_BY_ID),
+    (
+        lambda s: BeerRepository.has_user_chosen_for_event(s, 1, Event(id=1)),
+        statements.USER_HAS_CHOSEN,
+    ),
+]
+
+
+class RecordingSession(SyncSessionAdapter):
+    def __init__(self, session):
+        super().__init__(session.session)
+        self.executed = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.executed.append(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+
+@pytest.fixture
+def cache_keys(monkeypatch):
+    """Считает ключи кэша компиляции, вычисленные обходом выражения."""
+    generated = []
+    generate = HasCacheKey._generate_cache_key
+
+    def counted(element):
+        generated.append(element)
+        return generate(element)
+
+    monkeypatch.setattr(HasCacheKey, "_generate_cache_key", counted)
+    return generated
+
+
+@pytest.mark.parametrize("query, statement", HOT_QUERIES)
+def test_hot_query_executes_prebuilt_statement(session, query, statement):
+    recording = RecordingSession(session)
+
+    asyncio.run(query(recording))
+
+    assert len(recording.executed) == 1
+    assert recording.executed[0] is statement
+
+
+@pytest.mark.parametrize("query, statement", HOT_QUERIES)
+def test_hot_query_reuses_cache_key(session, cache_keys, query, statement):
+    asyncio.run(query(session))
+    cache_keys.clear()
+
+    for _ in range(3):
+        asyncio.run(query(session))
+
+    assert cache_keys == []
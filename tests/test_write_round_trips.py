@@ -0,0 +1,242 @@
+import asyncio
+import os
+import uuid
+from collections import Counter
+from datetime import date, time, timedelta
+
+import pendulum
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from bot.core.database import Base
+from bot.core.models import BeerChoice, Event, Group, GroupUser, User
+from bot.core.schemas import BeerChoiceCreate, EventCreate, UserCreate, UserUpdate
+from bot.repositories.beer_repo import BeerRepository
+from bot.repositories.event_participant_repo import EventParticipantRepository
+from bot.repositories.event_repo import EventRepository
+from bot.repositories.group_user_repo import GroupUserRepository
+from bot.repositories.scheduled_job_repo import ScheduledJobRepository
+from bot.repositories.user_repo import UserRepository
+
+TELEGRAM_ID = 1001
+TOMORROW = date.today() + timedelta(days=1)
+EVENT_START = pendulum.tomorrow("UTC").add(hours=19)
+
+
+def new_event() -> EventCreate:
+    return EventCreate(
+        name="event",
+        event_date=TOMORROW,
+        event_time=time(19, 0),
+        created_by=TELEGRAM_ID,
+    )
+
+
+# Запись, число выражений; каждая запись — одна фиксация транзакции
+WRITES = [
+    (
+        "create_user",
+        lambda s: UserRepository.create_user(
+            s,
+            UserCreate(telegram_id=1002, name="user", birth_date=date(1990, 1, 1)),
+        ),
+        1,
+    ),
+    (
+        "update_user",
+        lambda s: UserRepository.update_user(
+            s, TELEGRAM_ID, UserUpdate(name="renamed")
+        ),
+        1,
+    ),
+    ("create_event", lambda s: EventRepository.create_event(s, new_event()), 1),
+    (
+        "create_event+job",
+        lambda s: EventRepository.create_event(
+            s,
+            new_event(),
+            notify_task="bot.tasks.bartender_notification.process_event_notification",
+            notify_at=EVENT_START,
+        ),
+        2,
+    ),
+    (
+        "create_choice",
+        lambda s: BeerRepository.create_choice(
+            s, BeerChoiceCreate(user_id=1, event_id=1, beer_choice="Тёмное")
+        ),
+        1,
+    ),
+    (
+        "create_participant",
+        lambda s: EventParticipantRepository.create_participant_record(s, 1, 1),
+        1,
+    ),
+    ("add_group", lambda s: GroupUserRepository.add_group(s, -1001, "group"), 1),
+    (
+        "schedule",
+        lambda s: ScheduledJobRepository.schedule(s, "noop", EVENT_START),
+        1,
+    ),
+    ("delete_user_choices", lambda s: BeerRepository.delete_user_choices(s, 1), 2),
+    ("delete_event", lambda s: EventRepository.delete_event(s, 1), 1),
+    ("delete_user", lambda s: UserRepository.delete_user(s, TELEGRAM_ID), 1),
+]
+
+
+@pytest.fixture
+def round_trips(engine, session):
+    """Пользователь, событие и выбор пива; затем счётчик обращений к базе."""
+    session.session.execute(
+        insert(User).values(
+            id=1, telegram_id=TELEGRAM_ID, name="user", birth_date=date(1990, 1, 1)
+        )
+    )
+    session.session.execute(
+        insert(Event).values(
+            id=1,
+            name="event",
+            event_date=TOMORROW,
+            event_time=time(19, 0),
+            created_by=TELEGRAM_ID,
+        )
+    )
+    session.session.execute(
+        insert(BeerChoice).values(user_id=1, event_id=1, beer_choice="Лагер")
+    )
+    session.session.commit()
+
+    counts = Counter()
+
+    def count_statement(*args):
+        counts["statements"] += 1
+
+    def count_commit(conn):
+        counts["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    event.listen(engine, "commit", count_commit)
+    yield counts
+    event.remove(engine, "before_cursor_execute", count_statement)
+    event.remove(engine, "commit", count_commit)
+
+
+@pytest.mark.parametrize(
+    "write, statements", [w[1:] for w in WRITES], ids=[w[0] for w in WRITES]
+)
+def test_write_round_trips(session, round_trips, write, statements):
+    # Запись действительно изменила строки, а не прошла вхолостую
+    assert asyncio.run(write(session))
+    assert round_trips["statements"] == statements
+    assert round_trips["commits"] == 1
+
+
+# register_candidate — один INSERT в CTE с ON CONFLICT, которого нет в SQLite
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+async def register_candidate_results(url: str):
+    """Три исхода register_candidate во временной схеме Postgres."""
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_async_engine(url, poolclass=NullPool)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_async_engine(
+        url,
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": schema}},
+    )
+    counts = Counter()
+
+    def count_statement(*args):
+        counts["statements"] += 1
+
+    def count_commit(conn):
+        counts["commits"] += 1
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[User.__table__, Group.__table__, GroupUser.__table__],
+            )
+            await conn.execute(
+                insert(User).values(
+                    id=1,
+                    telegram_id=TELEGRAM_ID,
+                    name="user",
+                    birth_date=date(1990, 1, 1),
+                )
+            )
+            await conn.execute(insert(Group).values(id=1, chat_id=-1001, name="group"))
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        event.listen(engine.sync_engine, "commit", count_commit)
+        results = []
+        for chat_id in (-1002, -1001, -1001):
+            async with AsyncSession(engine) as session:
+                counts.clear()
+                result = await GroupUserRepository.register_candidate(
+                    session, chat_id, 1
+                )
+                results.append((result, counts["statements"], counts["commits"]))
+        return results
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        await admin.dispose()
+
+
+@pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set (needs Postgres)"
+)
+def test_register_candidate_round_trips():
+    results = asyncio.run(register_candidate_results(TEST_DATABASE_URL))
+
+    # Группа не зарегистрирована, новый кандидат, уже кандидат
+    assert results == [(None, 1, 1), (True, 1, 1), (False, 1, 1)]
+
+
+class CandidateResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class CandidateSession:
+    """Возвращает заданную строку (group_id, candidate_id) и считает обращения."""
+
+    def __init__(self, row):
+        self.row = row
+        self.counts = Counter()
+
+    async def execute(self, statement, *args, **kwargs):
+        # Выражение хотя бы собирается для Postgres
+        statement.compile(dialect=postgresql.dialect())
+        self.counts["statements"] += 1
+        return CandidateResult(self.row)
+
+    async def commit(self):
+        self.counts["commits"] += 1
+
+    async def rollback(self):
+        self.counts["rollbacks"] += 1
+
+
+@pytest.mark.parametrize(
+    "row, expected",
+    [((None, None), None), ((1, 10), True), ((1, None), False)],
+    ids=["group_not_registered", "new_candidate", "already_candidate"],
+)
+def test_register_candidate_result(row, expected):
+    session = CandidateSession(row)
+
+    assert asyncio.run(GroupUserRepository.register_candidate(session, -1001, 1)) is (
+        expected
+    )
+    assert session.counts == {"statements": 1, "commits": 1}